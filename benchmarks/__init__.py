@@ -0,0 +1,6 @@
+"""Performance benchmarks for markdocpy.
+
+Run ``python -m benchmarks run --output results.json`` to time each phase on
+generated corpora and ``python -m benchmarks compare baseline.json results.json``
+to check a run against a baseline.
+"""
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+from .compare import compare, format_rows
+from .corpus import PRESETS, Shape
+from .replay import load_cases, replay
+from .run import PHASES, run
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="time each phase on generated corpora")
+    run_parser.add_argument(
+        "--preset",
+        action="append",
+        choices=sorted(PRESETS),
+        help="corpus shape to run (repeatable, default: all)",
+    )
+    run_parser.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        metavar="FIELD=VALUE",
+        help="override a shape field for every preset, e.g. documents=100",
+    )
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="also measure peak and retained memory per phase with tracemalloc",
+    )
+    run_parser.add_argument("--output", "-o", help="write the JSON results to this file")
+
+    replay_parser = commands.add_parser(
+        "replay", help="replay the tests/spec and tests/fixtures corpus for throughput"
+    )
+    replay_parser.add_argument("--repeat", type=int, default=20)
+    replay_parser.add_argument("--output", "-o", help="write the JSON results to this file")
+    replay_parser.add_argument("--baseline", help="compare against an earlier results file")
+    replay_parser.add_argument(
+        "--threshold", type=float, default=0.1, help="allowed slowdown against --baseline"
+    )
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "--threshold",
+        action="append",
+        default=[],
+        metavar="[PHASE=]FRACTION",
+        help="allowed slowdown, overall or for one phase (default 0.1)",
+    )
+    compare_parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.5,
+        help="ignore differences below this many milliseconds",
+    )
+    compare_parser.add_argument(
+        "--min-memory",
+        type=float,
+        default=4,
+        help="ignore peak memory differences below this many KiB",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        overrides = _overrides(args.set)
+        cases = {
+            name: dataclasses.replace(PRESETS[name], **overrides)
+            for name in args.preset or PRESETS
+        }
+        results = run(cases, repeat=args.repeat, memory=args.memory)
+        for name, case in results["cases"].items():
+            timings = ", ".join(
+                f"{phase} {case['phases'][phase]['median'] * 1000:.2f}ms" for phase in PHASES
+            )
+            print(f"{name}: {case['documents']} documents, {case['bytes']} bytes: {timings}")
+            if "memory" in case:
+                peaks = ", ".join(
+                    f"{phase} {memory['peak'] / 1024:.0f}KiB ({memory['peak_per_byte']:.1f}/B)"
+                    for phase, memory in case["memory"]["phases"].items()
+                )
+                print(f"{' ' * len(name)}  peak memory: {peaks}")
+        if args.output:
+            Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+        return 0
+
+    if args.command == "replay":
+        return _replay(args)
+
+    threshold, thresholds = 0.1, {}
+    for value in args.threshold:
+        phase, _, fraction = value.rpartition("=")
+        if phase:
+            thresholds[phase] = float(fraction)
+        else:
+            threshold = float(fraction)
+    rows = compare(
+        json.loads(Path(args.baseline).read_text()),
+        json.loads(Path(args.current).read_text()),
+        threshold=threshold,
+        thresholds=thresholds,
+        min_seconds=args.min_time / 1000,
+        min_bytes=int(args.min_memory * 1024),
+    )
+    print(format_rows(rows))
+    regressions = [row for row in rows if row.status == "regression"]
+    if regressions:
+        print(f"{len(regressions)} regression(s)", file=sys.stderr)
+        return 1
+    return 0
+
+
+def _replay(args: argparse.Namespace) -> int:
+    results = replay(load_cases(), repeat=args.repeat)
+    case = results["cases"]["replay"]
+    if case["mismatches"]:
+        names = ", ".join(case["mismatches"])
+        print(f"output differs from the expected HTML: {names}", file=sys.stderr)
+        return 1
+    print(
+        f"{case['documents']} documents, {case['bytes']} bytes x {args.repeat}: "
+        f"{case['documents_per_second']:.0f} documents/s, {case['mb_per_second']:.2f} MB/s"
+    )
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+    if args.baseline:
+        rows = compare(
+            json.loads(Path(args.baseline).read_text()), results, threshold=args.threshold
+        )
+        print(format_rows(rows))
+        if any(row.status == "regression" for row in rows):
+            return 1
+    return 0
+
+
+def _overrides(values: List[str]) -> Dict[str, object]:
+    types = {field.name: field.type for field in dataclasses.fields(Shape)}
+    overrides: Dict[str, object] = {}
+    for value in values:
+        name, _, raw = value.partition("=")
+        if name not in types:
+            raise SystemExit(f"unknown shape field {name!r}; expected one of {', '.join(types)}")
+        overrides[name] = float(raw) if types[name] == "float" else int(raw)
+    return overrides
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""Compare two benchmark result files phase by phase."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+
+@dataclass(frozen=True)
+class Row:
+    case: str
+    phase: str
+    baseline: float
+    current: float
+    status: str
+    unit: str = "s"
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    *,
+    threshold: float = 0.1,
+    thresholds: Dict[str, float] | None = None,
+    min_seconds: float = 0.0005,
+    min_bytes: int = 4096,
+) -> List[Row]:
+    """Compare the median time of every phase present in both results.
+
+    A phase regresses when it got more than its threshold (a fraction, per phase in
+    `thresholds` or else `threshold`) slower and at least `min_seconds` slower, so
+    phases too fast to time reliably do not fail the comparison. When both results
+    have memory figures, the peak bytes of each phase are compared the same way as
+    phase ``memory:<phase>``, ignoring differences below `min_bytes`.
+    """
+    rows = []
+    for case, result in current.get("cases", {}).items():
+        base_case = baseline.get("cases", {}).get(case)
+        if base_case is None:
+            continue
+        for phase, timing in result["phases"].items():
+            base = base_case["phases"].get(phase)
+            if base is None:
+                continue
+            limit = (thresholds or {}).get(phase, threshold)
+            rows.append(
+                _row(case, phase, base["median"], timing["median"], limit, min_seconds, "s")
+            )
+        base_memory = base_case.get("memory", {}).get("phases", {})
+        for phase, memory in result.get("memory", {}).get("phases", {}).items():
+            base = base_memory.get(phase)
+            if base is None:
+                continue
+            name = f"memory:{phase}"
+            limit = (thresholds or {}).get(name, threshold)
+            rows.append(_row(case, name, base["peak"], memory["peak"], limit, min_bytes, "B"))
+    return rows
+
+
+def _row(
+    case: str, phase: str, before: float, after: float, limit: float, floor: float, unit: str
+) -> Row:
+    if after > before * (1 + limit) and after - before >= floor:
+        status = "regression"
+    elif after < before * (1 - limit) and before - after >= floor:
+        status = "improvement"
+    else:
+        status = "ok"
+    return Row(case, phase, before, after, status, unit)
+
+
+def format_rows(rows: List[Row]) -> str:
+    lines = [f"{'case':<14} {'phase':<16} {'baseline':>10} {'current':>10} {'ratio':>7}  status"]
+    for row in rows:
+        lines.append(
+            f"{row.case:<14} {row.phase:<16} {_format(row.baseline, row.unit)} "
+            f"{_format(row.current, row.unit)} {row.ratio:6.2f}x  {row.status}"
+        )
+    return "\n".join(lines)
+
+
+def _format(value: float, unit: str) -> str:
+    if unit == "B":
+        return f"{value / 1024:7.1f}KiB"
+    return f"{value * 1000:8.2f}ms"
@@ -0,0 +1,178 @@
+"""Synthetic Markdoc corpora of controllable size and shape."""
+
+from __future__ import annotations
+
+import random
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List
+
+
+@dataclass(frozen=True)
+class Shape:
+    """Size and shape of a generated corpus.
+
+    Every document has `sections` headed sections of `paragraphs` paragraphs.
+    `tag_density` is the share of paragraphs wrapped in `callout` tags nested
+    `nesting_depth` deep, `interpolations` the number of variables and function
+    calls per paragraph, and each section ends with a `table_rows` by
+    `table_columns` table when `table_rows` is positive. Every document includes
+    `partial_fanout` of the `partials` partials.
+    """
+
+    documents: int = 20
+    sections: int = 8
+    paragraphs: int = 4
+    tag_density: float = 0.3
+    nesting_depth: int = 2
+    table_rows: int = 4
+    table_columns: int = 3
+    interpolations: int = 2
+    partials: int = 4
+    partial_fanout: int = 2
+    seed: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+PRESETS: Dict[str, Shape] = {
+    "small": Shape(documents=5, sections=4),
+    "medium": Shape(),
+    "large": Shape(documents=50, sections=20),
+    "tags": Shape(tag_density=1.0, nesting_depth=4),
+    "tables": Shape(table_rows=40, table_columns=8),
+    "interpolation": Shape(interpolations=12),
+    "partials": Shape(partials=32, partial_fanout=16),
+}
+
+WORDS = (
+    "markdoc renders structured content with tags variables functions and partials "
+    "while the parser keeps every node with its source lines for validation"
+).split()
+
+
+@dataclass
+class Corpus:
+    """Generated sources with the config they render against."""
+
+    shape: Shape
+    documents: Dict[str, str] = field(default_factory=dict)
+    partials: Dict[str, str] = field(default_factory=dict)
+    variables: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        """Total length of the documents and partials in characters."""
+        return sum(map(len, self.documents.values())) + sum(map(len, self.partials.values()))
+
+    def config(self, parse) -> Dict[str, Any]:
+        """The config for rendering the corpus, with partials parsed by `parse`."""
+        return {
+            "tags": {
+                "callout": {
+                    "render": "aside",
+                    "attributes": {"type": {"type": str}, "title": {"type": str}},
+                }
+            },
+            "variables": self.variables,
+            "partials": {name: parse(source) for name, source in self.partials.items()},
+        }
+
+
+def generate(shape: Shape) -> Corpus:
+    """Generate a corpus; the same shape always yields the same sources."""
+    rng = random.Random(shape.seed)
+    corpus = Corpus(shape, variables=_variables(shape))
+    for index in range(shape.partials):
+        corpus.partials[f"partial-{index}.md"] = _partial(rng, shape, index)
+    for index in range(shape.documents):
+        corpus.documents[f"doc-{index}.md"] = _document(rng, shape, index)
+    return corpus
+
+
+def _variables(shape: Shape) -> Dict[str, Any]:
+    return {
+        "site": {"name": "Bench", "version": "1.0"},
+        "user": {"name": "Ada", "admin": True},
+        "items": [{"name": f"item {index}", "count": index} for index in range(8)],
+        **{f"var{index}": f"value {index}" for index in range(max(shape.interpolations, 1))},
+    }
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def _interpolation(rng: random.Random, shape: Shape, index: int) -> str:
+    choice = index % 4
+    if choice == 0:
+        return f"{{% $var{index % max(shape.interpolations, 1)} %}}"
+    if choice == 1:
+        return f"{{% $items[{rng.randrange(8)}].name %}}"
+    if choice == 2:
+        return '{% default($user.nickname, "anonymous") %}'
+    return "{% $site.name %}"
+
+
+def _paragraph(rng: random.Random, shape: Shape) -> str:
+    words = _words(rng, rng.randint(12, 30)).split()
+    for _ in range(2):
+        position = rng.randrange(len(words))
+        words[position] = rng.choice(("*{}*", "**{}**", "`{}`", "[{}](/link)")).format(
+            words[position]
+        )
+    for index in range(shape.interpolations):
+        words.insert(rng.randrange(len(words) + 1), _interpolation(rng, shape, index))
+    return " ".join(words)
+
+
+def _block(rng: random.Random, shape: Shape) -> str:
+    text = _paragraph(rng, shape)
+    if rng.random() >= shape.tag_density:
+        return text
+    for depth in reversed(range(max(shape.nesting_depth, 1))):
+        kind = rng.choice(("note", "warning", "tip"))
+        text = f'{{% callout type="{kind}" title="Level {depth}" %}}\n{text}\n{{% /callout %}}'
+    return text
+
+
+def _table(rng: random.Random, shape: Shape) -> str:
+    columns = range(shape.table_columns)
+    rows = [
+        "| " + " | ".join(f"Column {column}" for column in columns) + " |",
+        "| " + " | ".join("---" for _ in columns) + " |",
+    ]
+    for _ in range(shape.table_rows):
+        rows.append("| " + " | ".join(_words(rng, 2) for _ in columns) + " |")
+    return "\n".join(rows)
+
+
+def _section(rng: random.Random, shape: Shape, index: int) -> List[str]:
+    blocks = [f"## Section {index} {{% $site.name %}}"]
+    blocks.extend(_block(rng, shape) for _ in range(shape.paragraphs))
+    if index % 3 == 2:
+        blocks.append("\n".join(f"- {_words(rng, 6)}" for _ in range(4)))
+    if index % 4 == 3:
+        blocks.append(
+            "{% if $user.admin %}\nAdmins see this.\n{% else /%}\nOthers see this.\n{% /if %}"
+        )
+    if shape.table_rows > 0 and shape.table_columns > 0:
+        blocks.append(_table(rng, shape))
+    return blocks
+
+
+def _document(rng: random.Random, shape: Shape, index: int) -> str:
+    blocks = [f"# Document {index}"]
+    for section in range(shape.sections):
+        blocks.extend(_section(rng, shape, section))
+    if shape.partials:
+        for _ in range(shape.partial_fanout):
+            name = f"partial-{rng.randrange(shape.partials)}.md"
+            blocks.append(f'{{% partial file="{name}" variables={{title: $site.name}} /%}}')
+    return "\n\n".join(blocks) + "\n"
+
+
+def _partial(rng: random.Random, shape: Shape, index: int) -> str:
+    blocks = [f"### Partial {index} for {{% $title %}}"]
+    blocks.extend(_block(rng, shape) for _ in range(2))
+    return "\n\n".join(blocks) + "\n"
@@ -0,0 +1,69 @@
+"""Compare the fused renderer with transform followed by render.
+
+Run with ``python -m benchmarks.fused_render``.
+"""
+
+from __future__ import annotations
+
+import copy
+import time
+import tracemalloc
+from pathlib import Path
+
+import markdocpy as Markdoc
+
+ROOT = Path(__file__).resolve().parents[1]
+SOURCES = [*(ROOT / "tests" / "fixtures").glob("*.md"), *(ROOT / "tests" / "spec").glob("*.md")]
+REPEAT = 20
+
+
+def two_pass(ast: Markdoc.Node) -> str:
+    return Markdoc.renderers.html(Markdoc.transform(ast))
+
+
+def fused(ast: Markdoc.Node) -> str:
+    return Markdoc.render_html(ast)
+
+
+def measure(render, ast: Markdoc.Node) -> tuple[float, int, int]:
+    """Return (seconds, Tag objects created, peak traced bytes) for one render."""
+    copies = [copy.deepcopy(ast) for _ in range(REPEAT)]
+    start = time.perf_counter()
+    for tree in copies:
+        render(tree)
+    seconds = (time.perf_counter() - start) / REPEAT
+
+    created = 0
+    init = Markdoc.Tag.__init__
+
+    def counting_init(self, *args, **kwargs):
+        nonlocal created
+        created += 1
+        init(self, *args, **kwargs)
+
+    tree = copy.deepcopy(ast)
+    Markdoc.Tag.__init__ = counting_init
+    tracemalloc.start()
+    try:
+        render(tree)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        Markdoc.Tag.__init__ = init
+    return seconds, created, peak
+
+
+def main() -> None:
+    source = "\n\n".join(path.read_text() for path in sorted(SOURCES)) * 10
+    ast = Markdoc.parse(source)
+    assert fused(copy.deepcopy(ast)) == two_pass(copy.deepcopy(ast))
+    results = {"two-pass": measure(two_pass, ast), "fused": measure(fused, ast)}
+    for name, (seconds, tags, peak) in results.items():
+        print(f"{name:<10} {seconds * 1000:8.2f} ms  {tags:8d} tags  {peak / 1024:8.1f} KiB peak")
+    (_, tags, peak), (_, fused_tags, fused_peak) = results["two-pass"], results["fused"]
+    saved = (peak - fused_peak) / 1024
+    print(f"saved {tags - fused_tags} Tag allocations and {saved:.1f} KiB peak memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Replay the spec and fixture corpus in tests/ as a throughput benchmark."""
+
+from __future__ import annotations
+
+import gc
+import json
+import platform
+import statistics
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import markdocpy as Markdoc
+
+from .run import RESULTS_VERSION
+
+TESTS_DIR = Path(__file__).resolve().parent.parent / "tests"
+PHASES = ("parse", "validate", "transform", "render")
+
+
+@dataclass
+class Case:
+    """One corpus document with its config and committed HTML, if any."""
+
+    name: str
+    source: str
+    config: Dict[str, Any]
+    expected: str | None
+    normalize: Callable[[str], str]
+
+    def render(self) -> str:
+        ast = Markdoc.parse(self.source)
+        return Markdoc.renderers.html(Markdoc.transform(ast, self.config))
+
+    def matches(self) -> bool:
+        if self.expected is None:
+            return True
+        return self.normalize(self.render()) == self.normalize(self.expected)
+
+
+def load_cases(tests_dir: Path = TESTS_DIR) -> List[Case]:
+    """The documents of tests/spec and tests/fixtures, with the configs their tests use."""
+    from tests.fixtures.utils import fixture_configs
+    from tests.fixtures.utils import normalize_html as normalize_fixture
+    from tests.test_spec_parity import normalize_html as normalize_spec
+    from tests.test_spec_parity import spec_configs
+
+    cases: List[Case] = []
+    spec = spec_configs()
+    for entry in _manifest(tests_dir / "spec"):
+        config = spec.get(entry["name"])
+        cases.append(_case(tests_dir / "spec", "spec", entry["name"], config, normalize_spec))
+    fixtures = fixture_configs()
+    for entry in _manifest(tests_dir / "fixtures"):
+        config = fixtures.get(entry.get("config"))
+        cases.append(
+            _case(tests_dir / "fixtures", "fixtures", entry["name"], config, normalize_fixture)
+        )
+    return cases
+
+
+def mismatches(cases: List[Case]) -> List[str]:
+    """Names of the cases whose HTML no longer matches the committed expectation."""
+    return [case.name for case in cases if not case.matches()]
+
+
+def replay(cases: List[Case], *, repeat: int = 20) -> Dict[str, Any]:
+    """Run every case through parse, validate, transform and render `repeat` times.
+
+    Returns the results in the JSON layout `compare` reads, as the single case
+    ``replay``, with documents and megabytes per second from the median round and
+    the names of the cases whose output no longer matches the committed HTML.
+    """
+    sources = [case.source for case in cases]
+    size = sum(len(source.encode("utf-8")) for source in sources)
+    samples: Dict[str, List[float]] = {phase: [] for phase in (*PHASES, "total")}
+    failed = mismatches(cases)
+    for _ in range(repeat):
+        gc.collect()
+        elapsed = dict.fromkeys(PHASES, 0.0)
+        for case in cases:
+            start = time.perf_counter()
+            ast = Markdoc.parse(case.source)
+            parsed = time.perf_counter()
+            Markdoc.validate(ast, case.config)
+            validated = time.perf_counter()
+            tree = Markdoc.transform(ast, case.config)
+            transformed = time.perf_counter()
+            Markdoc.renderers.html(tree)
+            elapsed["parse"] += parsed - start
+            elapsed["validate"] += validated - parsed
+            elapsed["transform"] += transformed - validated
+            elapsed["render"] += time.perf_counter() - transformed
+        for phase, seconds in elapsed.items():
+            samples[phase].append(seconds)
+        samples["total"].append(sum(elapsed.values()))
+
+    median = statistics.median(samples["total"])
+    return {
+        "version": RESULTS_VERSION,
+        "markdocpy": Markdoc.__version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "cases": {
+            "replay": {
+                "documents": len(cases),
+                "bytes": size,
+                "documents_per_second": len(cases) / median if median else 0.0,
+                "mb_per_second": size / 1e6 / median if median else 0.0,
+                "mismatches": failed,
+                "phases": {
+                    phase: {"median": statistics.median(runs), "min": min(runs), "runs": runs}
+                    for phase, runs in samples.items()
+                },
+            }
+        },
+    }
+
+
+def _manifest(directory: Path) -> List[Dict[str, Any]]:
+    return json.loads((directory / "manifest.json").read_text())
+
+
+def _case(
+    directory: Path,
+    corpus: str,
+    name: str,
+    config: Dict[str, Any] | None,
+    normalize: Callable[[str], str],
+) -> Case:
+    expected = directory / "expected" / f"{name}.html"
+    return Case(
+        f"{corpus}/{name}",
+        (directory / f"{name}.md").read_text(),
+        config or {},
+        expected.read_text() if expected.exists() else None,
+        normalize,
+    )
@@ -0,0 +1,104 @@
+"""Time each phase of the pipeline separately on generated corpora."""
+
+from __future__ import annotations
+
+import gc
+import platform
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+import markdocpy as Markdoc
+from markdocpy.memory import TYPES, profile_memory
+from markdocpy.parser.parser import parse as parse_tokens
+from markdocpy.transform.transformer import merge_config, transform
+
+from .corpus import Shape, generate
+
+PHASES = ("tokenize", "parse", "validate", "resolve", "transform", "render")
+RESULTS_VERSION = 1
+
+
+def run_case(shape: Shape, *, repeat: int = 5, memory: bool = False) -> Dict[str, Any]:
+    """Time every phase over all documents of the corpus for `shape`, `repeat` times.
+
+    With `memory`, also add the memory each phase uses, from `profile_memory`.
+    """
+    corpus = generate(shape)
+    config = merge_config(corpus.config(Markdoc.parse))
+    sources = list(corpus.documents.values())
+    tokenizer = Markdoc.Tokenizer()
+    samples: Dict[str, List[float]] = {phase: [] for phase in PHASES}
+
+    def timed(phase: str, step: Callable[[Any], Any], inputs: List[Any]) -> List[Any]:
+        gc.collect()
+        start = time.perf_counter()
+        outputs = [step(item) for item in inputs]
+        samples[phase].append(time.perf_counter() - start)
+        return outputs
+
+    for _ in range(repeat):
+        tokens = timed("tokenize", tokenizer.tokenize, sources)
+        asts = timed(
+            "parse",
+            lambda pair: parse_tokens(pair[0], line_count=len(pair[1].splitlines())),
+            list(zip(tokens, sources)),
+        )
+        timed("validate", lambda ast: Markdoc.validate(ast, config), asts)
+        resolved = timed("resolve", lambda ast: ast.resolve(config), asts)
+        # The ASTs are already resolved; Markdoc.transform would resolve them again.
+        trees = timed("transform", lambda ast: transform(ast, config), resolved)
+        timed("render", Markdoc.renderers.html, trees)
+
+    result = {
+        "shape": shape.to_dict(),
+        "documents": len(sources),
+        "bytes": corpus.size,
+        "phases": {phase: _summary(runs) for phase, runs in samples.items()},
+    }
+    if memory:
+        result["memory"] = memory_case(sources, config)
+    return result
+
+
+def memory_case(sources: List[str], config: Dict[str, Any]) -> Dict[str, Any]:
+    """Peak and retained bytes per phase, summed over the documents.
+
+    Memory is deterministic, so each document is profiled once.
+    """
+    source_bytes = 0
+    totals: Dict[str, Dict[str, Any]] = {}
+    for source in sources:
+        profile = profile_memory(source, config)
+        source_bytes += profile.source_bytes
+        for entry in profile.phases:
+            total = totals.setdefault(
+                entry.phase, {"peak": 0, "retained": 0, "objects": dict.fromkeys(TYPES, 0)}
+            )
+            total["peak"] += entry.peak
+            total["retained"] += entry.retained
+            for kind, size in entry.objects.items():
+                total["objects"][kind] += size
+    for total in totals.values():
+        total["peak_per_byte"] = total["peak"] / source_bytes if source_bytes else 0.0
+        total["retained_per_byte"] = total["retained"] / source_bytes if source_bytes else 0.0
+    return {"source_bytes": source_bytes, "phases": totals}
+
+
+def run(cases: Dict[str, Shape], *, repeat: int = 5, memory: bool = False) -> Dict[str, Any]:
+    """Run every case and return the results in the JSON layout `compare` reads."""
+    return {
+        "version": RESULTS_VERSION,
+        "markdocpy": Markdoc.__version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "cases": {
+            name: run_case(shape, repeat=repeat, memory=memory) for name, shape in cases.items()
+        },
+    }
+
+
+def _summary(runs: List[float]) -> Dict[str, Any]:
+    return {"median": statistics.median(runs), "min": min(runs), "runs": runs}
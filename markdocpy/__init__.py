@@ -2,54 +2,190 @@
 
 from __future__ import annotations
 
+import importlib
+import time
+from contextlib import nullcontext
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List
 
 from .ast.function import Function
 from .ast.node import Node
-from .ast.tag import Tag
-from .ast.variable import Variable
+from .ast.tag import FrozenTag, Tag, TagPool
+from .ast.variable import Variable, track_reads
 from .version import __version__
+from .dependencies import Dependencies, dependencies
 from .parser.parser import parse as _parse_tokens
 from .parser.tokenizer import Tokenizer
 from .renderer.html import render as _render_html
 from .schema.nodes import nodes
+from .stats import Stats, collect_stats, count_nodes, count_tags, current_stats
+from .tracing import SpanSummary, Tracer, current_tracer, trace
 from .schema.tags import tags, truthy
-from .transform.transformer import global_attributes, merge_config, transform as _transform
-from .validator.validator import validate_tree
+from .transform.transformer import TransformMemo, global_attributes, merge_config
+from .transform.transformer import transform as _transform
+from .validator.validator import NodeErrors, validate_incremental, validate_nodes, validate_tree
+
+if TYPE_CHECKING:
+    from .cache import DirectoryParseCache, ParseCache, RenderCache, SQLiteParseCache
+    from .memory import MemoryProfile, PhaseMemory, profile_memory
+    from .parser.incremental import reparse
+    from .parser.stream import parse_iter
+    from .partials import DirectoryPartialLoader, PartialCycleError, PartialLoader
+    from .renderer.codegen import compile_renderer
+    from .renderer.fused import render_html
+    from .serialize import dumps, loads
+    from .stream import MarkdocStream
+    from .transform.precompile import (
+        CompiledDocument,
+        iter_variants,
+        precompile,
+        render_variants,
+    )
+
+# Public names imported on first use, so `import markdocpy` stays cheap for code
+# that only needs parse, transform, validate and render. A name that is also a
+# submodule (`dependencies`) must be imported eagerly: importing the submodule
+# would set the package attribute to the module and bypass `__getattr__`.
+_LAZY = {
+    "ParseCache": ".cache",
+    "DirectoryParseCache": ".cache",
+    "SQLiteParseCache": ".cache",
+    "RenderCache": ".cache",
+    "MemoryProfile": ".memory",
+    "PhaseMemory": ".memory",
+    "profile_memory": ".memory",
+    "reparse": ".parser.incremental",
+    "parse_iter": ".parser.stream",
+    "PartialLoader": ".partials",
+    "DirectoryPartialLoader": ".partials",
+    "PartialCycleError": ".partials",
+    "compile_renderer": ".renderer.codegen",
+    "render_html": ".renderer.fused",
+    "dumps": ".serialize",
+    "loads": ".serialize",
+    "MarkdocStream": ".stream",
+    "CompiledDocument": ".transform.precompile",
+    "iter_variants": ".transform.precompile",
+    "precompile": ".transform.precompile",
+    "render_variants": ".transform.precompile",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *_LAZY})
+
+
+def _render(tree: Any) -> str:
+    stats = current_stats()
+    if stats is None:
+        return _render_html(tree)
+    start = time.perf_counter()
+    html = _render_html(tree)
+    stats.add_time("render", time.perf_counter() - start)
+    return html
 
 
 @dataclass
 class _Renderers:
-    html = staticmethod(_render_html)
+    html = staticmethod(_render)
 
 
 renderers = _Renderers()
 
 
 def parse(
-    content: str, *, file: str | None = None, slots: bool = False, location: bool = False
+    content: str,
+    *,
+    file: str | None = None,
+    slots: bool = False,
+    location: bool = False,
+    cache: ParseCache | None = None,
 ) -> Node:
     _ = file, slots, location
+    if cache is not None:
+        key = cache.key(content, slots=slots)
+        cached = cache.load(key)
+        if cached is not None:
+            return cached
     tokenizer = Tokenizer()
-    tokens = tokenizer.tokenize(content)
-    return _parse_tokens(tokens, slots=slots)
+    stats = current_stats()
+    if stats is None:
+        tokens = tokenizer.tokenize(content)
+        ast = _parse_tokens(tokens, slots=slots, line_count=len(content.splitlines()))
+    else:
+        start = time.perf_counter()
+        tokens = tokenizer.tokenize(content)
+        middle = time.perf_counter()
+        ast = _parse_tokens(tokens, slots=slots, line_count=len(content.splitlines()))
+        stats.add_time("tokenize", middle - start)
+        stats.add_time("parse", time.perf_counter() - middle)
+        stats.nodes += count_nodes(ast)
+    if cache is not None:
+        cache.store(key, ast)
+    return ast
 
 
 def resolve(content: Node | List[Node], config: Dict[str, Any]):
+    tracer = current_tracer()
+    if tracer is not None:
+        tracer.index(content)
+    stats = current_stats()
+    if stats is None:
+        return _resolve(content, config)
+    start = time.perf_counter()
+    with track_reads() as reads:
+        resolved = _resolve(content, config)
+    stats.variables += len(reads)
+    stats.add_time("resolve", time.perf_counter() - start)
+    return resolved
+
+
+def _resolve(content: Node | List[Node], config: Dict[str, Any]):
     if isinstance(content, list):
         return [child.resolve(config) for child in content]
     return content.resolve(config)
 
 
-def transform(content: Node | List[Node], config: Dict[str, Any] | None = None):
+def transform(
+    content: Node | List[Node],
+    config: Dict[str, Any] | None = None,
+    *,
+    memo: bool | TransformMemo = False,
+    pool: TagPool | None = None,
+):
     merged = merge_config(config)
     resolved = resolve(content, merged)
-    return _transform(resolved, merged)
+    stats = current_stats()
+    if stats is None:
+        result = _transform(resolved, merged, memo=memo)
+    else:
+        start = time.perf_counter()
+        # Partials are resolved while transforming.
+        with track_reads() as reads:
+            result = _transform(resolved, merged, memo=memo)
+        stats.variables += len(reads)
+        stats.tags += count_tags(result)
+        stats.add_time("transform", time.perf_counter() - start)
+    return pool.intern(result) if pool is not None else result
 
 
 def validate(content: Node | List[Node], config: Dict[str, Any] | None = None):
-    return validate_tree(content, config)
+    stats = current_stats()
+    if stats is None:
+        return validate_tree(content, config)
+    start = time.perf_counter()
+    errors = validate_tree(content, config)
+    stats.add_time("validate", time.perf_counter() - start)
+    return errors
 
 
 def create_element(
@@ -69,43 +205,94 @@ class Markdoc:
     tags = tags
     truthy = truthy
 
-    def __init__(self, config: Dict[str, Any]):
-        """Create a Markdoc wrapper with a fixed config."""
+    def __init__(self, config: Dict[str, Any], *, stats: Stats | bool | None = None):
+        """Create a Markdoc wrapper with a fixed config.
+
+        With `stats` (True or a `Stats` object), every call through the wrapper adds
+        to `self.stats`; see `collect_stats`.
+        """
         self.config = config
+        self.stats: Stats | None = Stats() if stats is True else stats or None
 
     def parse(self, content: str) -> Node:
         """Parse Markdoc content into an AST."""
-        return parse(content)
+        with self._collect():
+            return parse(content)
 
     def resolve(self, content: Node | List[Node]):
         """Resolve variables/functions using the stored config."""
-        return resolve(content, self.config)
+        with self._collect():
+            return resolve(content, self.config)
 
     def transform(self, content: Node | List[Node]):
         """Transform AST nodes into a renderable tree."""
-        return transform(content, self.config)
+        with self._collect():
+            return transform(content, self.config)
 
     def validate(self, content: Node | List[Node]):
         """Validate AST nodes against the schema."""
-        return validate(content, self.config)
+        with self._collect():
+            return validate(content, self.config)
+
+    def render(self, tree: Any) -> str:
+        """Render a transformed tree to HTML."""
+        with self._collect():
+            return renderers.html(tree)
+
+    def _collect(self):
+        return collect_stats(self.stats) if self.stats is not None else nullcontext()
 
 
 __all__ = [
     "Node",
     "Tag",
+    "FrozenTag",
+    "TagPool",
     "Tokenizer",
     "Variable",
     "Function",
     "parse",
+    "reparse",
+    "parse_iter",
     "resolve",
     "transform",
+    "TransformMemo",
     "validate",
+    "dependencies",
+    "Dependencies",
+    "precompile",
+    "CompiledDocument",
+    "render_variants",
+    "iter_variants",
+    "validate_nodes",
+    "validate_incremental",
+    "NodeErrors",
     "create_element",
+    "dumps",
+    "loads",
     "renderers",
+    "compile_renderer",
+    "render_html",
     "nodes",
     "tags",
     "truthy",
     "global_attributes",
     "Markdoc",
+    "ParseCache",
+    "DirectoryParseCache",
+    "SQLiteParseCache",
+    "RenderCache",
+    "Stats",
+    "collect_stats",
+    "Tracer",
+    "SpanSummary",
+    "trace",
+    "profile_memory",
+    "MemoryProfile",
+    "PhaseMemory",
+    "PartialLoader",
+    "DirectoryPartialLoader",
+    "PartialCycleError",
+    "MarkdocStream",
     "__version__",
 ]
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
 import inspect
+from dataclasses import dataclass, field
 from typing import Any, Dict, List
 
+from ..stats import _current as _current_stats
+from ..tracing import _current as _current_tracer
 from .variable import Variable
 
 
@@ -17,6 +19,16 @@ class Function:
 
     def resolve(self, config: Dict[str, Any]) -> Any:
         """Resolve the function with args/kwargs using the config."""
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.functions += 1
+        tracer = _current_tracer.get()
+        if tracer is not None:
+            with tracer.span("function", self.name, tracer.location(self)):
+                return self._call(config)
+        return self._call(config)
+
+    def _call(self, config: Dict[str, Any]) -> Any:
         fn = config.get("functions", {}).get(self.name)
         if fn is None:
             return None
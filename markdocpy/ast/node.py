@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import hashlib
+import weakref
+from dataclasses import dataclass, field, fields
 from typing import Any, Dict, List, Optional
 
+from ..utils import _canonical
 from .function import Function
 from .variable import Variable
 
 
-@dataclass
+@dataclass(init=False)
 class Node:
     """AST node for parsed Markdoc content."""
 
@@ -18,17 +21,90 @@ class Node:
     content: Optional[str] = None
     slots: Dict[str, "Node"] = field(default_factory=dict)
     inline: bool = False
+    lines: List[int] = field(default_factory=list)
+
+    def __init__(
+        self,
+        type: str,
+        children: List["Node"] | None = None,
+        attributes: Dict[str, Any] | None = None,
+        tag: Optional[str] = None,
+        content: Optional[str] = None,
+        slots: Dict[str, "Node"] | None = None,
+        inline: bool = False,
+        lines: List[int] | None = None,
+    ):
+        # Set the fields directly: assigning them through __setattr__ would slow down
+        # parsing, and a new node has no digest to invalidate.
+        self.__dict__.update(
+            type=type,
+            children=[] if children is None else children,
+            attributes={} if attributes is None else attributes,
+            tag=tag,
+            content=content,
+            slots={} if slots is None else slots,
+            inline=inline,
+            lines=[] if lines is None else lines,
+        )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if "_digest" in self.__dict__:
+            _invalidate_up(self)
+
+    def __hash__(self) -> int:
+        return hash(self.digest)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Copies and pickles leave out the cached digest and the weak references to
+        # the parents that include it: a copy has other parents, and weak references
+        # cannot be pickled.
+        state = dict(self.__dict__)
+        state.pop("_digest", None)
+        state.pop("_parents", None)
+        return state
+
+    @property
+    def digest(self) -> str:
+        """Structural hash of the node and its subtree, ignoring source lines.
+
+        Nodes with equal digests are equal. Equal nodes have equal digests unless
+        their values are equal across types, such as ``1``, ``1.0`` and ``True``:
+        the digest tells these apart because they render differently. The digest
+        is cached and recomputed after the node or one of its descendants is
+        modified by assigning a field; after modifying `children`, `attributes` or
+        `slots` in place, call `invalidate()`.
+        """
+        cached = self.__dict__.get("_digest")
+        if cached is not None:
+            return cached
+        return _compute_digests(self)
+
+    def invalidate(self) -> None:
+        """Mark the digests of this subtree and its ancestors as stale, after modifying
+        containers in place anywhere in the subtree."""
+        pending: List[Node] = [self]
+        while pending:
+            node = pending.pop()
+            node.__dict__.pop("_digest", None)
+            pending.extend(child for child in node.children if isinstance(child, Node))
+            pending.extend(node.slots.values())
+        _invalidate_up(self)
 
     def resolve(self, config: Any) -> "Node":
         """Resolve variables/functions in this node and its children."""
-        self.attributes = _resolve_value(self.attributes, config)
+        # Only assign what changed, so resolving a node without variables keeps digests.
+        attributes = _resolve_value(self.attributes, config)
+        if attributes is not self.attributes:
+            self.attributes = attributes
         resolved_children = []
         for child in self.children:
             if isinstance(child, Node):
                 resolved_children.append(child.resolve(config))
             else:
                 resolved_children.append(_resolve_value(child, config))
-        self.children = resolved_children
+        if not _same_items(resolved_children, self.children):
+            self.children = resolved_children
         return self
 
     def transform(self, config: Any) -> Any:
@@ -38,11 +114,142 @@ class Node:
         return transform(self, config)
 
 
+@dataclass
+class StaticNode(Node):
+    """Node whose HTML was rendered ahead of time by `markdocpy.transform.precompile`.
+
+    The original fields are kept so transforms of enclosing tags can still inspect
+    it; transforming it returns `html` and resolving it is a no-op.
+    """
+
+    html: str = ""
+
+    # The generated __eq__ would otherwise set __hash__ to None.
+    __hash__ = Node.__hash__
+
+    def resolve(self, config: Any) -> "Node":
+        return self
+
+
+def copy_tree(node: Node) -> Node:
+    """Copy the nodes of a tree, sharing attribute values and `StaticNode`s.
+
+    Resolving the copy leaves the original unchanged, since `resolve` replaces
+    attribute containers instead of modifying them.
+    """
+    if type(node) is StaticNode:
+        return node
+    return Node(
+        node.type,
+        [copy_tree(child) if isinstance(child, Node) else child for child in node.children],
+        node.attributes,
+        node.tag,
+        node.content,
+        node.slots,
+        node.inline,
+        node.lines,
+    )
+
+
+def _compute_digests(root: Node) -> str:
+    """Compute the digests of `root` and its stale descendants bottom-up.
+
+    Each child records a weak reference to the parents whose digests include its
+    own, so that modifying it invalidates just those ancestors.
+    """
+    pending: List[Any] = [(root, False)]
+    while pending:
+        node, ready = pending.pop()
+        if not ready:
+            if "_digest" in node.__dict__:
+                continue
+            pending.append((node, True))
+            pending.extend((child, False) for child in node.children if isinstance(child, Node))
+            pending.extend((slot, False) for slot in node.slots.values())
+            continue
+        digest = hashlib.blake2b(_shallow_key(node).encode(), digest_size=16)
+        for child in node.children:
+            if isinstance(child, Node):
+                digest.update(child.__dict__["_digest"].encode())
+                _add_parent(child, node)
+            else:
+                digest.update(_canonical(child, set()).encode())
+            digest.update(b"\0")
+        for key in sorted(node.slots):
+            slot = node.slots[key]
+            digest.update(f"{key}\0{slot.__dict__['_digest']}\0".encode())
+            _add_parent(slot, node)
+        node.__dict__["_digest"] = digest.hexdigest()
+    return root.__dict__["_digest"]
+
+
+def _add_parent(child: Node, parent: Node) -> None:
+    # Keyed by id: hashing a node would compute its digest.
+    parents = child.__dict__.get("_parents")
+    if parents is None:
+        parents = child.__dict__["_parents"] = {}
+    ref = parents.get(id(parent))
+    if ref is None or ref() is not parent:
+        parents[id(parent)] = weakref.ref(parent)
+
+
+def _invalidate_up(node: Node) -> None:
+    """Drop the cached digests of `node` and of the ancestors that include it.
+
+    An ancestor without a digest has already had its own ancestors invalidated.
+    """
+    node.__dict__.pop("_digest", None)
+    pending = [node]
+    while pending:
+        parents = pending.pop().__dict__.get("_parents")
+        for ref in (parents or {}).values():
+            parent = ref()
+            if parent is not None and parent.__dict__.pop("_digest", None) is not None:
+                pending.append(parent)
+
+
+def _shallow_key(node: Node) -> str:
+    extra = []
+    if type(node) is not Node:
+        extra = [
+            _canonical(getattr(node, item.name), set())
+            for item in fields(node)
+            if item.name not in _DIGEST_FIELDS
+        ]
+    attributes = node.attributes
+    if all(type(value) in _PLAIN for value in attributes.values()):
+        encoded = repr(sorted(attributes.items()) if len(attributes) > 1 else [*attributes.items()])
+    else:
+        encoded = _canonical(attributes, set())
+    content = node.content
+    return "\0".join(
+        [
+            type(node).__name__,
+            node.type,
+            repr(node.tag),
+            repr(content) if type(content) in _PLAIN else _canonical(content, set()),
+            repr(node.inline),
+            encoded,
+            *extra,
+        ]
+    )
+
+
+_DIGEST_FIELDS = {"type", "children", "attributes", "tag", "content", "slots", "inline", "lines"}
+_PLAIN = {str, int, float, bool, type(None)}
+
+
 def _resolve_value(value: Any, config: Any) -> Any:
     if isinstance(value, Variable) or isinstance(value, Function):
         return value.resolve(config)
     if isinstance(value, list):
-        return [_resolve_value(item, config) for item in value]
+        resolved = [_resolve_value(item, config) for item in value]
+        return value if _same_items(resolved, value) else resolved
     if isinstance(value, dict):
-        return {key: _resolve_value(val, config) for key, val in value.items()}
+        resolved = {key: _resolve_value(val, config) for key, val in value.items()}
+        return value if _same_items(resolved.values(), value.values()) else resolved
     return value
+
+
+def _same_items(items, others) -> bool:
+    return all(item is other for item, other in zip(items, others))
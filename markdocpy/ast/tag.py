@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Iterable, List, Mapping, Optional
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
 
 
 @dataclass
@@ -15,7 +15,138 @@ class Tag:
 
     @staticmethod
     def is_tag(value: Any) -> bool:
-        return isinstance(value, Tag)
+        return isinstance(value, (Tag, FrozenTag))
 
     def with_children(self, children: Iterable[Any]) -> "Tag":
         return Tag(self.name, dict(self.attributes), list(children))
+
+
+class Markup(str):
+    """HTML that is already escaped; the renderer outputs it unchanged."""
+
+    __slots__ = ()
+
+
+class FrozenAttributes(dict):
+    """Read-only, hashable attributes of a `FrozenTag`."""
+
+    __slots__ = ()
+
+    def __hash__(self) -> int:  # type: ignore[override]
+        return hash(frozenset(self.items()))
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError("FrozenTag attributes cannot be modified")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenTag:
+    """Immutable, hashable `Tag`, as produced by `TagPool.intern`.
+
+    Children are a flat tuple: nested lists in a `Tag`'s children are spliced in,
+    which renders the same.
+    """
+
+    name: Optional[str]
+    attributes: FrozenAttributes = field(default_factory=FrozenAttributes)
+    children: Tuple[Any, ...] = ()
+    self_closing: bool = False
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self, "_hash", hash((self.name, self.attributes, self.children, self.self_closing))
+        )
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def thaw(self) -> Tag:
+        """Return a mutable deep copy."""
+        return Tag(
+            self.name,
+            dict(self.attributes),
+            [child.thaw() if isinstance(child, FrozenTag) else child for child in self.children],
+            self.self_closing,
+        )
+
+
+_ATTRIBUTE_VALUES = (str, int, float, bool, type(None))
+
+
+class TagPool:
+    """Interns transformed trees so that identical subtrees are stored once.
+
+    `intern` replaces every `Tag` whose attribute values are plain strings, numbers,
+    booleans or None with a shared `FrozenTag`. Other tags stay mutable `Tag`s but
+    their children are interned. Keep one pool for all trees that should share
+    subtrees, such as the cached output of a whole site.
+    """
+
+    def __init__(self) -> None:
+        self._tags: Dict[Tuple[Any, ...], FrozenTag] = {}
+        self._strings: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._tags)
+
+    def intern(self, value: Any) -> Any:
+        """Return `value` with its tags interned; lists stay lists."""
+        if isinstance(value, list):
+            return [self.intern(item) for item in value]
+        if isinstance(value, Tag):
+            return self._intern_tag(value)
+        if type(value) is str:
+            return self._strings.setdefault(value, value)
+        return value
+
+    def _intern_tag(self, tag: Tag) -> Tag | FrozenTag:
+        children: List[Any] = []
+        self._flatten(tag.children or [], children)
+        attributes = tag.attributes or {}
+        if not all(type(value) in _ATTRIBUTE_VALUES for value in attributes.values()) or any(
+            isinstance(child, Tag) for child in children
+        ):
+            return Tag(tag.name, attributes, children, tag.self_closing)
+        # Keyed on types and attribute order as well as values: True == 1 == 1.0 and
+        # Markup("<b>") == "<b>", but they render differently.
+        key = (
+            tag.name,
+            tuple((name, _intern_key(value)) for name, value in attributes.items()),
+            tuple(_intern_key(child) for child in children),
+            tag.self_closing,
+        )
+        interned = self._tags.get(key)
+        if interned is None:
+            interned = self._tags[key] = FrozenTag(
+                tag.name,
+                FrozenAttributes({name: self.intern(value) for name, value in attributes.items()}),
+                tuple(children),
+                tag.self_closing,
+            )
+        return interned
+
+    def _flatten(self, children: Any, output: List[Any]) -> None:
+        for child in children:
+            if isinstance(child, list):
+                self._flatten(child, output)
+                continue
+            child = self.intern(child)
+            if not isinstance(child, Tag):
+                try:
+                    hash(child)
+                except TypeError:
+                    # Not a tag, string or number, so it renders as "" anyway.
+                    continue
+            output.append(child)
+
+
+def _intern_key(value: Any) -> Tuple[Any, Any]:
+    # Interned children are shared, so they compare by identity; equal FrozenTags
+    # can still differ in the types of their values.
+    if type(value) is FrozenTag:
+        return FrozenTag, id(value)
+    return type(value), value
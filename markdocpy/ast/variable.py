@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, Iterable, List
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+_reads: ContextVar[List[Tuple[Any, ...]] | None] = ContextVar("markdocpy_reads", default=None)
 
 
 @dataclass
@@ -24,6 +28,9 @@ class Variable:
 
     def resolve(self, config: Dict[str, Any]) -> Any:
         """Resolve the variable value from the config."""
+        reads = _reads.get()
+        if reads is not None:
+            reads.append(tuple(self.path))
         variables = config.get("variables", {})
         if callable(variables):
             return variables(self.path)
@@ -43,6 +50,23 @@ class Variable:
         return current
 
 
+@contextmanager
+def track_reads() -> Iterator[List[Tuple[Any, ...]]]:
+    """Record the path of every variable resolved inside the block, in order.
+
+    Reads are also passed on to an enclosing `track_reads` block.
+    """
+    outer = _reads.get()
+    reads: List[Tuple[Any, ...]] = []
+    token = _reads.set(reads)
+    try:
+        yield reads
+    finally:
+        _reads.reset(token)
+        if outer is not None:
+            outer.extend(reads)
+
+
 def _path_to_string(path: List[Any]) -> str:
     parts: List[str] = []
     for segment in path:
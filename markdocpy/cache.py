@@ -0,0 +1,388 @@
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from .ast.node import Node
+from .ast.variable import Variable, track_reads
+from .serialize import FORMAT_VERSION, dumps, loads
+from .stats import current_stats
+from .transform.transformer import merge_config
+from .utils import fingerprint
+from .version import __version__
+
+
+class ParseCache(ABC):
+    """Persistent cache of parsed ASTs, keyed by a hash of the source and parse options.
+
+    Pass an instance to `markdocpy.parse(content, cache=...)`. Subclasses store the
+    serialized ASTs; this class computes keys and counts hits and misses.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(
+        self, content: str, *, slots: bool = False, options: Dict[str, Any] | None = None
+    ) -> str:
+        """Hash the source together with everything else that affects its AST."""
+        digest = hashlib.blake2b(digest_size=20)
+        options = sorted((options or {}).items())
+        digest.update(f"{__version__}\0{FORMAT_VERSION}\0{int(slots)}\0{options!r}".encode())
+        digest.update(b"\0")
+        digest.update(content.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def load(self, key: str) -> Node | None:
+        """Return the cached AST for `key`, or None."""
+        data = self._read(key)
+        node = None
+        if data is not None:
+            try:
+                node = loads(data)
+            except (ValueError, EOFError, TypeError, IndexError, KeyError, AttributeError):
+                # A truncated or corrupt entry; parse again and overwrite it.
+                pass
+        stats = current_stats()
+        if stats is not None:
+            stats.add_lookup("parse_cache", node is not None)
+        if node is not None:
+            self.hits += 1
+            return node
+        self.misses += 1
+        return None
+
+    def store(self, key: str, node: Node) -> None:
+        """Cache the AST for `key`."""
+        self._write(key, dumps(node))
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @abstractmethod
+    def _read(self, key: str) -> bytes | None:
+        """Return the serialized AST stored for `key`, or None."""
+
+    @abstractmethod
+    def _write(self, key: str, data: bytes) -> None:
+        """Store the serialized AST for `key`."""
+
+
+class DirectoryParseCache(ParseCache):
+    """Parse cache storing one file per AST in a directory.
+
+    Files are written to a temporary name and renamed into place, so concurrent
+    builds sharing the directory never read partial entries. Reads refresh the file's
+    modification time and the least recently used files are removed once the
+    directory grows past `max_bytes`.
+    """
+
+    def __init__(self, path: str | os.PathLike, max_bytes: int = 256 * 1024 * 1024):
+        super().__init__(max_bytes)
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._size: int | None = None
+
+    def _file(self, key: str) -> Path:
+        return self.path / f"{key}.mdast"
+
+    def _read(self, key: str) -> bytes | None:
+        file = self._file(key)
+        try:
+            data = file.read_bytes()
+            os.utime(file)
+        except OSError:
+            return None
+        return data
+
+    def _write(self, key: str, data: bytes) -> None:
+        file = self._file(key)
+        try:
+            replaced = file.stat().st_size
+        except OSError:
+            replaced = 0
+        fd, temp = tempfile.mkstemp(dir=self.path, prefix=".tmp-", suffix=".mdast")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(temp, file)
+        except BaseException:
+            try:
+                os.unlink(temp)
+            except OSError:
+                pass
+            raise
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        else:
+            self._size += len(data) - replaced
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _entries(self):
+        for entry in os.scandir(self.path):
+            if entry.name.endswith(".mdast") and not entry.name.startswith(".tmp-"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                yield entry.path, stat.st_size, stat.st_mtime
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        size = sum(entry[1] for entry in entries)
+        for path, entry_size, _ in entries:
+            if size <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            size -= entry_size
+        self._size = size
+
+
+class SQLiteParseCache(ParseCache):
+    """Parse cache storing ASTs in a SQLite database file.
+
+    Every write runs in its own transaction, so several processes can share the
+    file; the least recently used rows are deleted once the stored ASTs exceed
+    `max_bytes`.
+    """
+
+    def __init__(self, path: str | os.PathLike, max_bytes: int = 256 * 1024 * 1024):
+        super().__init__(max_bytes)
+        self.path = Path(path)
+        self._store = _SQLiteStore(self.path, "asts", max_bytes)
+
+    def close(self) -> None:
+        self._store.close()
+
+    def _read(self, key: str) -> bytes | None:
+        return self._store.get(key)
+
+    def _write(self, key: str, data: bytes) -> None:
+        self._store.put(key, data)
+
+
+class RenderCache:
+    """Cache of rendered HTML keyed by the source, the config and the variables it reads.
+
+    The first render of a source records the paths of the variables it resolves.
+    Later renders look up the values at those paths and return the stored HTML when
+    they match, skipping parse, transform and render. Since the same values lead to
+    the same reads, a document whose output branches on a variable simply records
+    one set of paths per branch taken.
+
+    The config is fingerprinted once, so it must not change afterwards, and its
+    functions and transforms must be deterministic and read variables only through
+    `Variable.resolve`. The fingerprint covers their code as well as their names, so
+    pages stored by an earlier version of a function are not served; code they
+    reach other than through globals of their module (imported modules, objects'
+    methods) is not covered, and changes to it need the cache cleared. Rendered
+    pages are kept in an in-memory LRU bounded by `max_bytes`, backed by a SQLite
+    database at `path` when given.
+    """
+
+    max_traces = 8
+
+    def __init__(
+        self,
+        config: Dict[str, Any] | None = None,
+        *,
+        max_bytes: int = 64 * 1024 * 1024,
+        path: str | os.PathLike | None = None,
+        disk_max_bytes: int = 1024 * 1024 * 1024,
+        parse_cache: ParseCache | None = None,
+    ):
+        self.config = merge_config(config)
+        self.fingerprint = fingerprint(
+            [__version__, {key: value for key, value in self.config.items() if key != "variables"}]
+        )
+        self.max_bytes = max_bytes
+        self.parse_cache = parse_cache
+        self.hits = 0
+        self.misses = 0
+        self._pages: OrderedDict[str, str] = OrderedDict()
+        self._size = 0
+        self._traces: Dict[str, List[Tuple[Tuple[Any, ...], ...]]] = {}
+        self._store = _SQLiteStore(Path(path), "pages", disk_max_bytes) if path else None
+
+    def render(self, content: str, variables: Dict[str, Any] | None = None) -> str:
+        """Render `content` to HTML with `variables`, or the config's variables if None."""
+        from . import parse
+        from .renderer.html import render
+        from .transform.transformer import transform
+
+        config = self.config if variables is None else {**self.config, "variables": variables}
+        source = hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=20)
+        source = source.hexdigest()
+        stats = current_stats()
+        for paths in self._load_traces(source):
+            html = self._get(self._key(source, paths, config))
+            if html is not None:
+                self.hits += 1
+                if stats is not None:
+                    stats.add_lookup("render_cache", True)
+                return html
+        self.misses += 1
+        if stats is not None:
+            stats.add_lookup("render_cache", False)
+        with track_reads() as reads:
+            ast = parse(content, cache=self.parse_cache)
+            html = render(transform(ast.resolve(config), config))
+        paths = tuple(dict.fromkeys(reads))
+        self._add_trace(source, paths)
+        self._put(self._key(source, paths, config), html)
+        return html
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def close(self) -> None:
+        if self._store is not None:
+            self._store.close()
+
+    def _key(self, source: str, paths, config: Dict[str, Any]) -> str:
+        values = [Variable(list(path)).resolve(config) for path in paths]
+        return fingerprint([self.fingerprint, source, paths, values])
+
+    def _load_traces(self, source: str):
+        traces = self._traces.get(source)
+        if traces is None:
+            data = self._store.get(f"trace:{source}") if self._store else None
+            traces = self._traces[source] = marshal.loads(data) if data else []
+        return traces
+
+    def _add_trace(self, source: str, paths) -> None:
+        traces = self._load_traces(source)
+        if paths in traces:
+            return
+        traces.append(paths)
+        del traces[: -self.max_traces]
+        if self._store is not None:
+            self._store.put(f"trace:{source}", marshal.dumps(traces))
+
+    def _get(self, key: str) -> str | None:
+        html = self._pages.get(key)
+        if html is not None:
+            self._pages.move_to_end(key)
+            return html
+        if self._store is not None:
+            data = self._store.get(key)
+            if data is not None:
+                html = data.decode("utf-8", "surrogatepass")
+                self._remember(key, html)
+                return html
+        return None
+
+    def _put(self, key: str, html: str) -> None:
+        self._remember(key, html)
+        if self._store is not None:
+            self._store.put(key, html.encode("utf-8", "surrogatepass"))
+
+    def _remember(self, key: str, html: str) -> None:
+        size = sys.getsizeof(html)
+        if size > self.max_bytes:
+            return
+        previous = self._pages.pop(key, None)
+        if previous is not None:
+            self._size -= sys.getsizeof(previous)
+        self._pages[key] = html
+        self._size += size
+        while self._size > self.max_bytes:
+            _, evicted = self._pages.popitem(last=False)
+            self._size -= sys.getsizeof(evicted)
+
+
+class _SQLiteStore:
+    """Bytes stored by key in a SQLite table, evicting least recently used rows.
+
+    The total size of the rows is kept in a one-row table next to them and updated
+    in the same transaction as the rows, so writes never sum the whole table.
+    """
+
+    def __init__(self, path: Path, table: str, max_bytes: int):
+        self.table = table
+        self.max_bytes = max_bytes
+        self._connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        with self._transaction() as connection:
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+                "used REAL NOT NULL)"
+            )
+            connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_used ON {table} (used)")
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table}_size "
+                "(id INTEGER PRIMARY KEY CHECK (id = 0), total INTEGER NOT NULL)"
+            )
+            # Databases written before the total was kept start from the sum once.
+            connection.execute(
+                f"INSERT OR IGNORE INTO {table}_size (id, total) "
+                f"SELECT 0, COALESCE(SUM(size), 0) FROM {table}"
+            )
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def get(self, key: str) -> bytes | None:
+        table = self.table
+        row = self._connection.execute(
+            f"SELECT value FROM {table} WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        self._connection.execute(f"UPDATE {table} SET used = ? WHERE key = ?", (time.time(), key))
+        return row[0]
+
+    def put(self, key: str, data: bytes) -> None:
+        table = self.table
+        with self._transaction() as connection:
+            row = connection.execute(f"SELECT size FROM {table} WHERE key = ?", (key,)).fetchone()
+            connection.execute(
+                f"INSERT OR REPLACE INTO {table} (key, value, size, used) VALUES (?, ?, ?, ?)",
+                (key, data, len(data), time.time()),
+            )
+            connection.execute(
+                f"UPDATE {table}_size SET total = total + ?", (len(data) - (row[0] if row else 0),)
+            )
+            (size,) = connection.execute(f"SELECT total FROM {table}_size").fetchone()
+            if size > self.max_bytes:
+                stale = []
+                for row_key, row_size in connection.execute(
+                    f"SELECT key, size FROM {table} ORDER BY used"
+                ):
+                    if size <= self.max_bytes:
+                        break
+                    stale.append((row_key,))
+                    size -= row_size
+                connection.executemany(f"DELETE FROM {table} WHERE key = ?", stale)
+                connection.execute(f"UPDATE {table}_size SET total = ?", (size,))
+
+    @contextmanager
+    def _transaction(self):
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._connection
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
@@ -0,0 +1,501 @@
+"""Command line interface: ``markdocpy build SRC OUT`` and ``markdocpy watch SRC OUT``."""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import runpy
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, Set, Tuple
+
+from .ast.node import Node
+from .ast.variable import Variable
+from .dependencies import dependencies
+from .parser.parser import parse as _parse_tokens
+from .parser.tokenizer import Tokenizer
+from .renderer.fused import render_html
+from .tracing import trace
+from .transform.transformer import merge_config
+from .utils import fingerprint
+from .version import __version__
+
+MANIFEST = ".markdoc-manifest.json"
+MANIFEST_VERSION = 1
+PHASES = ("read", "parse", "dependencies", "render", "write")
+
+
+@dataclass
+class BuildResult:
+    """Summary of a `build` run."""
+
+    built: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+def load_config(config_path: str | os.PathLike | None, partials_dir: str | os.PathLike | None):
+    """Load the `config` dict defined by a Python file and add the partials in a directory.
+
+    Returns the config and a content hash per partial.
+    """
+    config: Dict[str, Any] = {}
+    if config_path is not None:
+        namespace = runpy.run_path(str(config_path))
+        config = dict(namespace.get("config") or {})
+    partials = dict(config.get("partials") or {})
+    hashes = {name: _partial_hash(partial) for name, partial in partials.items()}
+    if partials_dir is not None:
+        root = Path(partials_dir)
+        for path in sorted(root.rglob("*.md")):
+            name = path.relative_to(root).as_posix()
+            text = path.read_text(encoding="utf-8")
+            partials[name] = _parse(text)
+            hashes[name] = _hash(text.encode("utf-8"))
+    if partials:
+        config["partials"] = partials
+    return config, hashes
+
+
+def build(
+    src: str | os.PathLike,
+    out: str | os.PathLike,
+    *,
+    config_path: str | os.PathLike | None = None,
+    partials_dir: str | os.PathLike | None = None,
+    jobs: int = 1,
+) -> BuildResult:
+    """Render every ``.md`` file under `src` to an ``.html`` file under `out`.
+
+    A manifest in `out` records each document's key: a hash of its source, the
+    config (without variables and partials, and including the code of its functions
+    and transforms), the values of the variables it uses and the contents of the
+    partials it reaches. Documents whose key is unchanged
+    are skipped without being parsed.
+    """
+    config, partial_hashes = load_config(config_path, partials_dir)
+    return _build(
+        src,
+        out,
+        config,
+        partial_hashes,
+        config_path=config_path,
+        partials_dir=partials_dir,
+        jobs=jobs,
+    )
+
+
+def _build(
+    src: str | os.PathLike,
+    out: str | os.PathLike,
+    config: Dict[str, Any],
+    partial_hashes: Dict[str, str],
+    *,
+    config_path: str | os.PathLike | None,
+    partials_dir: str | os.PathLike | None,
+    jobs: int,
+) -> BuildResult:
+    """`build` with the config and partial hashes from `load_config` already loaded."""
+    started = time.perf_counter()
+    result = BuildResult(timings={phase: 0.0 for phase in ("scan", *PHASES)})
+    src, out = Path(src), Path(out)
+    merged = merge_config(config)
+    config_key = _config_key(merged)
+    manifest_path = out / MANIFEST
+    previous = _read_manifest(manifest_path)
+
+    documents: Dict[str, Dict[str, Any]] = {}
+    pending: List[Tuple[str, str]] = []
+    for path in sorted(src.rglob("*.md")):
+        name = path.relative_to(src).as_posix()
+        source_hash = _hash(path.read_bytes())
+        entry = previous.get(name)
+        if (
+            entry is not None
+            and entry["source"] == source_hash
+            and entry["key"]
+            == _document_key(source_hash, entry, merged, config_key, partial_hashes)
+            and (out / entry["output"]).exists()
+        ):
+            documents[name] = entry
+            result.skipped.append(name)
+        else:
+            pending.append((name, source_hash))
+    result.timings["scan"] = time.perf_counter() - started
+
+    jobs_args = [(str(src / name), str(out / _output_name(name))) for name, _ in pending]
+    if jobs > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(config_path, partials_dir),
+        ) as pool:
+            chunksize = max(1, min(64, len(pending) // (jobs * 4)))
+            outcomes = list(pool.map(_build_document, jobs_args, chunksize=chunksize))
+    else:
+        _init_worker(config_path, partials_dir, config)
+        outcomes = [_build_document(args) for args in jobs_args]
+
+    for (name, source_hash), (uses, timings, error) in zip(pending, outcomes):
+        for phase, seconds in timings.items():
+            result.timings[phase] += seconds
+        if error is not None:
+            result.errors[name] = error
+            continue
+        entry = {"source": source_hash, "output": _output_name(name), **uses}
+        entry["key"] = _document_key(source_hash, entry, merged, config_key, partial_hashes)
+        documents[name] = entry
+        result.built.append(name)
+
+    for name, entry in previous.items():
+        if name not in documents and name not in result.errors:
+            (out / entry["output"]).unlink(missing_ok=True)
+            result.removed.append(name)
+
+    _write_manifest(manifest_path, documents)
+    result.timings["total"] = time.perf_counter() - started
+    return result
+
+
+class Watcher:
+    """Keep the output of `build` up to date while the inputs change.
+
+    The config, the parsed partials and a tokenizer stay loaded between polls, along
+    with the partials each document reaches according to the build manifest. A
+    changed document is re-rendered on its own and a changed partial re-renders the
+    documents reaching it. Changes to the config file, or adding or removing a
+    partial, fall back to an incremental `build`.
+    """
+
+    def __init__(
+        self,
+        src: str | os.PathLike,
+        out: str | os.PathLike,
+        *,
+        config_path: str | os.PathLike | None = None,
+        partials_dir: str | os.PathLike | None = None,
+    ):
+        self.src, self.out = Path(src), Path(out)
+        self.config_path = config_path
+        self.partials_dir = partials_dir
+        self._tokenizer = Tokenizer()
+        self._config: Dict[str, Any] = {}
+        self._merged: Dict[str, Any] = {}
+        self._config_key = ""
+        self._partial_hashes: Dict[str, str] = {}
+        self._documents: Dict[str, Dict[str, Any]] = {}
+        self._stamps: Dict[Tuple[str, str], Tuple[int, int]] = {}
+
+    def start(self) -> BuildResult:
+        """Bring the output up to date and load the state later polls compare against."""
+        self._stamps = self._scan()
+        return self._rebuild()
+
+    def poll(self) -> BuildResult:
+        """Rebuild whatever changed since the last poll."""
+        started = time.perf_counter()
+        stamps = self._scan()
+        previous, self._stamps = self._stamps, stamps
+        changed = {
+            key for key in stamps.keys() | previous.keys() if stamps.get(key) != previous.get(key)
+        }
+        if any(
+            key[0] == "config" or (key[0] == "partial" and (key in stamps) != (key in previous))
+            for key in changed
+        ):
+            return self._rebuild()
+
+        result = BuildResult(timings={phase: 0.0 for phase in ("scan", *PHASES)})
+        targets: Set[str] = set()
+        for kind, name in sorted(changed):
+            if kind == "partial":
+                try:
+                    text = (Path(self.partials_dir) / name).read_text(encoding="utf-8")
+                except OSError:
+                    # Removed since the scan; removing a partial needs a full rebuild.
+                    self._stamps.pop((kind, name), None)
+                    return self._rebuild()
+                self._config["partials"][name] = _parse(text, self._tokenizer)
+                self._partial_hashes[name] = _hash(text.encode("utf-8"))
+                targets.update(
+                    document
+                    for document, entry in self._documents.items()
+                    if name in entry.get("partials", ())
+                )
+            elif (kind, name) in stamps:
+                targets.add(name)
+            else:
+                self._remove(name, result)
+        self._merged = merge_config(self._config)
+        result.timings["scan"] = time.perf_counter() - started
+
+        for name in sorted(targets):
+            output = _output_name(name)
+            uses, timings, error = _render_document(
+                str(self.src / name), str(self.out / output), self._merged, self._tokenizer
+            )
+            for phase, seconds in timings.items():
+                result.timings[phase] += seconds
+            try:
+                source_hash = _hash((self.src / name).read_bytes())
+            except OSError:
+                # Removed since the scan.
+                self._remove(name, result)
+                continue
+            if error is not None:
+                result.errors[name] = error
+                self._documents.pop(name, None)
+                continue
+            entry = {"source": source_hash, "output": output, **uses}
+            entry["key"] = _document_key(
+                source_hash, entry, self._merged, self._config_key, self._partial_hashes
+            )
+            self._documents[name] = entry
+            result.built.append(name)
+        if result.built or result.removed or result.errors:
+            _write_manifest(self.out / MANIFEST, self._documents)
+        result.timings["total"] = time.perf_counter() - started
+        return result
+
+    def run(
+        self, interval: float = 0.1, callback: Callable[[BuildResult], None] | None = None
+    ) -> None:
+        """Poll every `interval` seconds until interrupted.
+
+        Results that built, removed or failed something are passed to `callback`.
+        """
+        while True:
+            time.sleep(interval)
+            result = self.poll()
+            if callback is not None and (result.built or result.removed or result.errors):
+                callback(result)
+
+    def _rebuild(self) -> BuildResult:
+        self._config, self._partial_hashes = load_config(self.config_path, self.partials_dir)
+        self._config.setdefault("partials", {})
+        result = _build(
+            self.src,
+            self.out,
+            self._config,
+            self._partial_hashes,
+            config_path=self.config_path,
+            partials_dir=self.partials_dir,
+            jobs=1,
+        )
+        self._merged = merge_config(self._config)
+        self._config_key = _config_key(self._merged)
+        self._documents = _read_manifest(self.out / MANIFEST)
+        return result
+
+    def _remove(self, name: str, result: BuildResult) -> None:
+        self._stamps.pop(("source", name), None)
+        (self.out / _output_name(name)).unlink(missing_ok=True)
+        if self._documents.pop(name, None) is not None:
+            result.removed.append(name)
+
+    def _scan(self) -> Dict[Tuple[str, str], Tuple[int, int]]:
+        stamps: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        roots = [("source", self.src)]
+        if self.partials_dir is not None:
+            roots.append(("partial", Path(self.partials_dir)))
+        for kind, root in roots:
+            for path in root.rglob("*.md"):
+                try:
+                    stamps[(kind, path.relative_to(root).as_posix())] = _stamp(path)
+                except OSError:
+                    continue
+        if self.config_path is not None:
+            stamps[("config", "")] = _stamp(Path(self.config_path))
+        return stamps
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="markdocpy", description="Markdoc command line tools")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    commands = parser.add_subparsers(dest="command", required=True)
+    inputs = argparse.ArgumentParser(add_help=False)
+    inputs.add_argument("src", help="directory with .md sources")
+    inputs.add_argument("out", help="output directory")
+    inputs.add_argument("--config", help="Python file defining a `config` dict")
+    inputs.add_argument("--partials", help="directory of partials, named by relative path")
+    build_parser = commands.add_parser(
+        "build", parents=[inputs], help="render a directory of .md files to HTML"
+    )
+    build_parser.add_argument(
+        "--jobs", "-j", type=int, default=os.cpu_count() or 1, help="worker processes"
+    )
+    build_parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="write a Chrome trace of tag transforms, partials and functions (runs in-process)",
+    )
+    build_parser.add_argument(
+        "--top", type=int, default=10, help="rows in the trace summary table"
+    )
+    watch_parser = commands.add_parser(
+        "watch", parents=[inputs], help="rebuild as sources and partials change"
+    )
+    watch_parser.add_argument(
+        "--interval", type=float, default=0.1, help="seconds between polls for changes"
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "watch":
+        watcher = Watcher(args.src, args.out, config_path=args.config, partials_dir=args.partials)
+        _report(watcher.start())
+        try:
+            watcher.run(args.interval, _report)
+        except KeyboardInterrupt:
+            pass
+        return 0
+    if args.trace is None:
+        return _report(
+            build(
+                args.src,
+                args.out,
+                config_path=args.config,
+                partials_dir=args.partials,
+                jobs=max(args.jobs, 1),
+            )
+        )
+    with trace(args.trace) as tracer:
+        result = build(
+            args.src, args.out, config_path=args.config, partials_dir=args.partials, jobs=1
+        )
+    status = _report(result)
+    print(tracer.format_summary(args.top))
+    return status
+
+
+def _report(result: BuildResult) -> int:
+    for name, error in sorted(result.errors.items()):
+        print(f"error: {name}: {error}", file=sys.stderr)
+    print(
+        f"built {len(result.built)}, skipped {len(result.skipped)}, "
+        f"removed {len(result.removed)}, failed {len(result.errors)}"
+    )
+    print(_format_timings(result.timings))
+    return 1 if result.errors else 0
+
+
+# Worker state, set up once per process by `_init_worker`.
+_worker_config: Dict[str, Any] = {}
+_worker_tokenizer: Tokenizer | None = None
+
+
+def _init_worker(config_path, partials_dir, config: Dict[str, Any] | None = None) -> None:
+    global _worker_config, _worker_tokenizer
+    if config is None:
+        config, _ = load_config(config_path, partials_dir)
+    _worker_config = merge_config(config)
+    _worker_tokenizer = Tokenizer()
+
+
+def _build_document(args: Tuple[str, str]):
+    source_path, output_path = args
+    return _render_document(source_path, output_path, _worker_config, _worker_tokenizer)
+
+
+def _render_document(
+    source_path: str, output_path: str, config: Dict[str, Any], tokenizer: Tokenizer | None
+):
+    timings = {phase: 0.0 for phase in PHASES}
+    try:
+        clock = time.perf_counter()
+        text = Path(source_path).read_text(encoding="utf-8")
+        now = time.perf_counter()
+        timings["read"], clock = now - clock, now
+        ast = _parse(text, tokenizer)
+        now = time.perf_counter()
+        timings["parse"], clock = now - clock, now
+        found = dependencies(ast, config)
+        now = time.perf_counter()
+        timings["dependencies"], clock = now - clock, now
+        html = render_html(ast, config)
+        now = time.perf_counter()
+        timings["render"], clock = now - clock, now
+        output = Path(output_path)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(html, encoding="utf-8")
+        timings["write"] = time.perf_counter() - clock
+    except Exception as error:
+        return None, timings, f"{type(error).__name__}: {error}"
+    uses = {
+        "variables": sorted([list(path) for path in found.variables], key=repr),
+        "partials": sorted(found.partials),
+    }
+    return uses, timings, None
+
+
+def _document_key(
+    source_hash: str,
+    entry: Dict[str, Any],
+    config: Dict[str, Any],
+    config_key: str,
+    partial_hashes: Dict[str, str],
+) -> str:
+    values = [
+        [path, Variable(path).resolve(config)] for path in entry.get("variables", [])
+    ]
+    partials = [[name, partial_hashes.get(name)] for name in entry.get("partials", [])]
+    return fingerprint([source_hash, config_key, values, partials])
+
+
+def _config_key(config: Dict[str, Any]) -> str:
+    return fingerprint(
+        [__version__, {k: v for k, v in config.items() if k not in ("variables", "partials")}]
+    )
+
+
+def _write_manifest(path: Path, documents: Dict[str, Dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    manifest = {"version": MANIFEST_VERSION, "documents": documents}
+    path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+
+
+def _read_manifest(path: Path) -> Dict[str, Dict[str, Any]]:
+    try:
+        manifest = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest.get("documents") or {}
+
+
+def _parse(text: str, tokenizer: Tokenizer | None = None) -> Node:
+    tokens = (tokenizer or Tokenizer()).tokenize(text)
+    return _parse_tokens(tokens, line_count=len(text.splitlines()))
+
+
+def _partial_hash(partial: Any) -> str:
+    if isinstance(partial, Node):
+        return partial.digest
+    if isinstance(partial, list):
+        return fingerprint([_partial_hash(part) for part in partial])
+    return fingerprint(partial)
+
+
+def _hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+def _stamp(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _output_name(name: str) -> str:
+    return Path(name).with_suffix(".html").as_posix()
+
+
+def _format_timings(timings: Dict[str, float]) -> str:
+    parts = [f"{phase} {seconds:.3f}s" for phase, seconds in timings.items() if phase != "total"]
+    return "time: " + ", ".join(parts) + f" (wall {timings.get('total', 0.0):.3f}s)"
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Set, Tuple
+
+from .ast.function import Function
+from .ast.node import Node
+from .ast.variable import Variable
+
+_PARTIAL_FILENAME = "$$partial:filename"
+_CACHE_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class Dependencies:
+    """Variable paths, function names and partial files a document can reach."""
+
+    variables: FrozenSet[Tuple[Any, ...]] = frozenset()
+    functions: FrozenSet[str] = frozenset()
+    partials: FrozenSet[str] = frozenset()
+
+
+@dataclass
+class _Uses:
+    """What a tree uses directly, before following its partials."""
+
+    variables: Set[Tuple[Any, ...]] = field(default_factory=set)
+    functions: Set[str] = field(default_factory=set)
+    # (file or None when it is not a literal, names the partial's variables set or
+    # None when they are not a literal)
+    partials: Set[Tuple[str | None, FrozenSet[str] | None]] = field(default_factory=set)
+
+
+_partial_uses: Dict[Any, _Uses] = {}
+
+
+def dependencies(ast: Node | List[Node], config: Dict[str, Any] | None = None) -> Dependencies:
+    """Return the variables, functions and partials `ast` can use when rendered with `config`.
+
+    Partials are followed through `config["partials"]`, a dict or a `PartialLoader`.
+    Inside a partial, variables named in the partial tag's `variables` attribute come
+    from that attribute (whose own variables are reported) rather than from the
+    config. When a partial's `file` is not a literal, every configured partial counts
+    as reachable. The result covers every branch of `if` tags, so it may include more
+    than one render actually reads.
+
+    Walking the document is linear in its size; what each partial uses is cached by
+    `Node.digest`, so shared partials are only walked once.
+    """
+    from .schema.tags import _load_partial, _partial_names
+
+    config = config or {}
+    names: List[str] | None = None
+    variables: Set[Tuple[Any, ...]] = set()
+    functions: Set[str] = set()
+    files: Set[str] = set()
+    pending = [(_uses(ast), frozenset())]
+    seen: Set[Tuple[str, FrozenSet[str]]] = set()
+    while pending:
+        uses, scope = pending.pop()
+        variables.update(path for path in uses.variables if not path or path[0] not in scope)
+        functions.update(uses.functions)
+        for file, passed in uses.partials:
+            if file is None and names is None:
+                names = _partial_names(config)
+            for target in [file] if file is not None else names:
+                files.add(target)
+                inner = scope | passed if passed is not None else scope
+                if (target, inner) in seen:
+                    continue
+                seen.add((target, inner))
+                partial = _load_partial(config, target)
+                if partial is not None:
+                    pending.append((_cached_uses(partial), inner))
+    return Dependencies(frozenset(variables), frozenset(functions), frozenset(files))
+
+
+def _cached_uses(partial: Node | List[Node]) -> _Uses:
+    if isinstance(partial, list):
+        key: Any = tuple(node.digest for node in partial)
+    else:
+        key = partial.digest
+    uses = _partial_uses.get(key)
+    if uses is None:
+        if len(_partial_uses) >= _CACHE_SIZE:
+            _partial_uses.clear()
+        uses = _partial_uses[key] = _uses(partial)
+    return uses
+
+
+def _uses(ast: Node | List[Node]) -> _Uses:
+    uses = _Uses()
+    pending = list(ast) if isinstance(ast, list) else [ast]
+    while pending:
+        node = pending.pop()
+        if not isinstance(node, Node):
+            _collect(node, uses)
+            continue
+        attributes = node.attributes
+        if attributes:
+            _collect(attributes, uses)
+            if node.type == "tag" and node.tag == "partial":
+                file = attributes.get("file")
+                passed = attributes.get("variables")
+                if passed is None:
+                    names: FrozenSet[str] | None = frozenset()
+                else:
+                    names = frozenset(passed) if isinstance(passed, dict) else None
+                if names is not None:
+                    names |= {_PARTIAL_FILENAME}
+                uses.partials.add((file if isinstance(file, str) else None, names))
+        pending.extend(node.children)
+        pending.extend(node.slots.values())
+    return uses
+
+
+def _collect(value: Any, uses: _Uses) -> None:
+    if isinstance(value, Variable):
+        uses.variables.add(tuple(value.path))
+    elif isinstance(value, Function):
+        uses.functions.add(value.name)
+        _collect(value.args, uses)
+        _collect(value.kwargs, uses)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _collect(item, uses)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _collect(item, uses)
@@ -0,0 +1,189 @@
+"""Memory used by each phase of the pipeline, measured with `tracemalloc`."""
+
+from __future__ import annotations
+
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple
+
+PHASES = ("tokenize", "parse", "validate", "resolve", "transform", "render")
+TYPES = ("Node", "Tag", "Token", "dict", "list", "tuple", "str", "other")
+
+
+@dataclass
+class PhaseMemory:
+    """Memory for one phase.
+
+    `peak` is the most memory allocated at once while the phase ran and `retained`
+    what was still allocated when it returned, both relative to the start of the
+    phase. `objects` splits the size of the phase's output by type; an object's
+    ``__dict__`` counts towards the object, so ``Node`` and ``Tag`` are the cost of
+    the instances themselves and their attribute dicts and child lists show up
+    under ``dict`` and ``list``.
+    """
+
+    phase: str
+    peak: int
+    retained: int
+    objects: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class MemoryProfile:
+    """Result of `profile_memory`."""
+
+    source_bytes: int
+    phases: List[PhaseMemory] = field(default_factory=list)
+
+    def phase(self, name: str) -> PhaseMemory:
+        for entry in self.phases:
+            if entry.phase == name:
+                return entry
+        raise KeyError(name)
+
+    def per_source_byte(self, name: str, metric: str = "peak") -> float:
+        """`metric` (``peak`` or ``retained``) of phase `name` per byte of source."""
+        value = getattr(self.phase(name), metric)
+        return value / self.source_bytes if self.source_bytes else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "source_bytes": self.source_bytes,
+            "phases": {
+                entry.phase: {
+                    "peak": entry.peak,
+                    "retained": entry.retained,
+                    "peak_per_byte": self.per_source_byte(entry.phase, "peak"),
+                    "retained_per_byte": self.per_source_byte(entry.phase, "retained"),
+                    "objects": dict(entry.objects),
+                }
+                for entry in self.phases
+            },
+        }
+
+    def format(self) -> str:
+        """A table of the phases, with sizes in KiB."""
+        lines = [
+            f"{'phase':<10} {'peak KiB':>10} {'retained KiB':>13} {'peak/B':>7} "
+            + " ".join(f"{name:>8}" for name in TYPES)
+        ]
+        for entry in self.phases:
+            lines.append(
+                f"{entry.phase:<10} {entry.peak / 1024:>10.1f} {entry.retained / 1024:>13.1f} "
+                f"{self.per_source_byte(entry.phase):>7.1f} "
+                + " ".join(f"{entry.objects.get(name, 0) / 1024:>8.1f}" for name in TYPES)
+            )
+        return "\n".join(lines)
+
+
+def profile_memory(source: str, config: Dict[str, Any] | None = None) -> MemoryProfile:
+    """Run `source` through every phase and measure the memory each one uses.
+
+    Each phase keeps its output alive until the end, so `retained` is what the
+    output of that phase costs. Any `tracemalloc` tracing already running is
+    interrupted for the duration of the call.
+    """
+    from .parser.parser import parse as parse_tokens
+    from .parser.tokenizer import Tokenizer
+    from .renderer.html import render
+    from .transform.transformer import merge_config, transform
+    from .validator.validator import validate_tree
+
+    merged = merge_config(config)
+    tokenizer = Tokenizer()
+    profile = MemoryProfile(len(source.encode("utf-8")))
+    outputs: List[Any] = []
+
+    def step(phase: str, call: Callable[[], Any]) -> Any:
+        output = _measure(profile, phase, call)
+        outputs.append(output)
+        return output
+
+    was_tracing = tracemalloc.is_tracing()
+    if was_tracing:
+        tracemalloc.stop()
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        tracemalloc.start()
+        tokens = step("tokenize", lambda: tokenizer.tokenize(source))
+        ast = step("parse", lambda: parse_tokens(tokens, line_count=len(source.splitlines())))
+        step("validate", lambda: validate_tree(ast, merged))
+        resolved = step("resolve", lambda: ast.resolve(merged))
+        tree = step("transform", lambda: transform(resolved, merged))
+        step("render", lambda: render(tree))
+    finally:
+        tracemalloc.stop()
+        if gc_enabled:
+            gc.enable()
+        if was_tracing:
+            tracemalloc.start()
+    return profile
+
+
+def _measure(profile: MemoryProfile, phase: str, call: Callable[[], Any]) -> Any:
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    output = call()
+    current, peak = tracemalloc.get_traced_memory()
+    # Sizing the output allocates too; keep it out of the next phase.
+    objects = object_sizes(output)
+    profile.phases.append(PhaseMemory(phase, peak - before, current - before, objects))
+    return output
+
+
+def object_sizes(value: Any) -> Dict[str, int]:
+    """Sizes in bytes of the objects reachable from `value`, by type.
+
+    Each object is counted once however often it is referenced. Only containers
+    and markdocpy and markdown-it objects are followed.
+    """
+    sizes = dict.fromkeys(TYPES, 0)
+    seen = set()
+    pending = [value]
+    while pending:
+        current = pending.pop()
+        if id(current) in seen or current is None or isinstance(current, (bool, int, float)):
+            continue
+        seen.add(id(current))
+        kind, children = _classify(current)
+        size = sys.getsizeof(current)
+        instance_dict = getattr(current, "__dict__", None)
+        if isinstance(instance_dict, dict) and id(instance_dict) not in seen:
+            seen.add(id(instance_dict))
+            size += sys.getsizeof(instance_dict)
+        sizes[kind] += size
+        pending.extend(children)
+    return sizes
+
+
+def _classify(value: Any) -> Tuple[str, List[Any]]:
+    from .ast.node import Node
+    from .ast.tag import FrozenTag, Tag
+
+    if isinstance(value, str):
+        return "str", []
+    if isinstance(value, dict):
+        return "dict", [*value.keys(), *value.values()]
+    if isinstance(value, list):
+        return "list", list(value)
+    if isinstance(value, tuple):
+        return "tuple", list(value)
+    if isinstance(value, Node):
+        return "Node", list(vars(value).values())
+    if isinstance(value, (Tag, FrozenTag)):
+        return "Tag", [value.name, value.attributes, value.children]
+    module = type(value).__module__
+    if module.startswith("markdown_it") and type(value).__name__ == "Token":
+        return "Token", _fields(value)
+    if module.startswith("markdocpy"):
+        return "other", _fields(value)
+    return "other", []
+
+
+def _fields(value: Any) -> List[Any]:
+    if hasattr(value, "__dict__"):
+        return list(vars(value).values())
+    return [getattr(value, name, None) for name in getattr(type(value), "__slots__", ())]
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from typing import List
+
+from ..ast.node import Node
+from ..utils import diff_lines
+from .parser import parse
+from .tokenizer import Tokenizer
+
+_MAX_ATTEMPTS = 4
+
+
+def reparse(
+    previous: Node,
+    old_source: str,
+    new_source: str,
+    *,
+    slots: bool = False,
+    tokenizer: Tokenizer | None = None,
+) -> Node:
+    """Parse `new_source` by re-parsing only the top-level blocks touched by the edit.
+
+    `previous` must be the AST of `old_source`. The blocks around the edited lines are
+    re-parsed together with the first untouched block after them; when that block comes
+    out unchanged the edit did not leak past it and the window is spliced between the
+    untouched blocks of `previous`. Otherwise the window grows, and after a few attempts
+    (or for documents with link reference definitions) the whole source is parsed.
+
+    Untouched blocks before the edit are shared with `previous`; blocks after it are
+    copied with their lines shifted.
+    """
+    tokenizer = tokenizer or Tokenizer()
+    children = previous.children
+    if (
+        "]:" in new_source
+        or previous.slots
+        or not all(child.lines for child in children)
+    ):
+        return parse_lines(tokenizer, new_source.splitlines(), 0, slots)
+
+    new_lines = new_source.splitlines()
+    start, old_end, new_end = diff_lines(old_source, new_source)
+    delta = new_end - old_end
+    first = 0
+    while first < len(children) and children[first].lines[1] < start:
+        first += 1
+    last = len(children)
+    while last > first and children[last - 1].lines[0] > old_end:
+        last -= 1
+    first = max(first - 1, 0)
+    window_start = children[first].lines[0] if first else 0
+
+    for _ in range(_MAX_ATTEMPTS):
+        if last >= len(children):
+            window = parse_lines(tokenizer, new_lines[window_start:], window_start, slots)
+            if window.slots:
+                break
+            return Node("document", children=[*children[:first], *window.children])
+        ahead = children[last]
+        window_end = ahead.lines[1] + delta
+        window = parse_lines(tokenizer, new_lines[window_start:window_end], window_start, slots)
+        nodes = window.children
+        if not window.slots and nodes and _same(nodes[-1], ahead, delta):
+            suffix = children[last + 1 :]
+            if delta:
+                suffix = [_shifted(child, delta) for child in suffix]
+            return Node("document", children=[*children[:first], *nodes, *suffix])
+        last += 1
+
+    return parse_lines(tokenizer, new_lines, 0, slots)
+
+
+def parse_lines(tokenizer: Tokenizer, lines: List[str], offset: int, slots: bool) -> Node:
+    """Parse a run of source lines whose first line is line `offset` of the document."""
+    content = "".join(f"{line}\n" for line in lines)
+    root = parse(tokenizer.tokenize(content), slots=slots, line_count=len(lines))
+    if offset:
+        pending = [*root.children, *root.slots.values()]
+        while pending:
+            node = pending.pop()
+            if node.lines:
+                node.lines = [line + offset for line in node.lines]
+            pending.extend(node.children)
+            pending.extend(node.slots.values())
+    return root
+
+
+def _shifted(node: Node, delta: int) -> Node:
+    return Node(
+        node.type,
+        children=[_shifted(child, delta) for child in node.children],
+        attributes=node.attributes,
+        tag=node.tag,
+        content=node.content,
+        slots={key: _shifted(slot, delta) for key, slot in node.slots.items()},
+        inline=node.inline,
+        lines=[line + delta for line in node.lines],
+    )
+
+
+def _same(node: Node, other: Node, delta: int) -> bool:
+    """Compare a re-parsed node with a previous one whose lines are off by `delta`."""
+    return (
+        node.type == other.type
+        and node.tag == other.tag
+        and node.content == other.content
+        and node.inline == other.inline
+        and node.lines == [line + delta for line in other.lines]
+        and node.attributes == other.attributes
+        and len(node.children) == len(other.children)
+        and all(_same(a, b, delta) for a, b in zip(node.children, other.children))
+        and node.slots.keys() == other.slots.keys()
+        and all(_same(slot, other.slots[key], delta) for key, slot in node.slots.items())
+    )
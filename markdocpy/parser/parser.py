@@ -1,9 +1,7 @@
 from __future__ import annotations
 
 import re
-from typing import Dict, List, Tuple
-
-from markdown_it.token import Token
+from typing import TYPE_CHECKING, Dict, List, Tuple
 
 from ..ast.node import Node
 from ..utils import find_tag_end
@@ -11,21 +9,34 @@ from ..ast.function import Function
 from ..ast.variable import Variable
 from .tag_parser import TagInfo, parse_tag_content
 
+if TYPE_CHECKING:
+    from markdown_it.token import Token
+
+
+def parse(tokens: List[Token], *, slots: bool = False, line_count: int | None = None) -> Node:
+    """Parse markdown-it-py tokens into a Markdoc AST.
 
-def parse(tokens: List[Token], *, slots: bool = False) -> Node:
-    """Parse markdown-it-py tokens into a Markdoc AST."""
+    `line_count` is the number of lines in the source; tags that are never closed
+    extend to it (or to the last token when it is not given).
+    """
     root = Node("document", children=[])
     stack: List[Node] = [root]
     tag_stack: List[Node] = []
 
+    last_line = 0
+
     i = 0
     while i < len(tokens):
         token = tokens[i]
+        lines = list(token.map) if token.map else []
+        if lines:
+            last_line = max(last_line, lines[1])
 
         if token.type == "inline":
             inline_nodes = _parse_inline_tokens(token.children or [], slots=slots, parent=stack[-1])
             if stack[-1].type in ("paragraph", "heading"):
                 inline_nodes = _apply_annotations(stack[-1], inline_nodes)
+            _set_lines([*inline_nodes, *stack[-1].slots.values()], lines)
             stack[-1].children.extend(inline_nodes)
             i += 1
             continue
@@ -35,12 +46,13 @@ def parse(tokens: List[Token], *, slots: bool = False) -> Node:
             inline_text = inline_token.content if inline_token else ""
             if _is_single_tag_line(inline_text):
                 tag_info = _parse_block_tag(inline_text)
-                _apply_block_tag(tag_info, inline_text, stack, tag_stack, slots=slots)
+                _apply_block_tag(tag_info, inline_text, stack, tag_stack, slots=slots, lines=lines)
                 i += 3
                 continue
 
         if token.nesting == 1:
             node = _node_from_open_token(token)
+            node.lines = lines
             stack[-1].children.append(node)
             stack.append(node)
             i += 1
@@ -54,17 +66,34 @@ def parse(tokens: List[Token], *, slots: bool = False) -> Node:
 
         node = _node_from_single_token(token)
         if node is not None:
+            node.lines = lines
             stack[-1].children.append(node)
         i += 1
 
+    for node in tag_stack:
+        if node.lines:
+            node.lines[1] = max(last_line, line_count or 0)
+
     return root
 
 
 def _apply_block_tag(
-    tag_info: TagInfo, text: str, stack: List[Node], tag_stack: List[Node], *, slots: bool
+    tag_info: TagInfo,
+    text: str,
+    stack: List[Node],
+    tag_stack: List[Node],
+    *,
+    slots: bool,
+    lines: List[int],
 ) -> None:
     if tag_info.kind == "open":
-        node = Node("tag", tag=tag_info.name, attributes=tag_info.attributes or {}, children=[])
+        node = Node(
+            "tag",
+            tag=tag_info.name,
+            attributes=tag_info.attributes or {},
+            children=[],
+            lines=list(lines),
+        )
         assigned = _maybe_assign_slot(node, stack[-1], slots)
         if not assigned:
             stack[-1].children.append(node)
@@ -72,27 +101,51 @@ def _apply_block_tag(
         tag_stack.append(node)
         return
     if tag_info.kind == "self":
-        node = Node("tag", tag=tag_info.name, attributes=tag_info.attributes or {}, children=[])
+        node = Node(
+            "tag",
+            tag=tag_info.name,
+            attributes=tag_info.attributes or {},
+            children=[],
+            lines=list(lines),
+        )
         if not _maybe_assign_slot(node, stack[-1], slots):
             stack[-1].children.append(node)
         return
     if tag_info.kind == "close":
         if tag_stack and tag_stack[-1].tag == tag_info.name:
-            tag_stack.pop()
+            opened = tag_stack.pop()
+            if opened.lines and lines:
+                opened.lines[1] = lines[1]
             if stack and stack[-1].type == "tag" and stack[-1].tag == tag_info.name:
                 stack.pop()
         return
     if tag_info.kind == "error":
-        error_node = Node("error", content=text, attributes={"error": tag_info.error})
+        error_node = Node(
+            "error", content=text, attributes={"error": tag_info.error}, lines=list(lines)
+        )
         stack[-1].children.append(error_node)
         return
 
     inline_nodes = _parse_inline_text(text, slots=slots, parent=stack[-1])
-    node = Node("paragraph")
+    node = Node("paragraph", lines=list(lines))
     node.children = _apply_annotations(node, inline_nodes)
+    _set_lines(node.children, lines)
     stack[-1].children.append(node)
 
 
+def _set_lines(nodes: List[Node], lines: List[int]) -> None:
+    """Give inline nodes the source lines of the block that contains them."""
+    if not lines:
+        return
+    pending = list(nodes)
+    while pending:
+        node = pending.pop()
+        if not node.lines:
+            node.lines = list(lines)
+        pending.extend(node.children)
+        pending.extend(node.slots.values())
+
+
 def _node_from_open_token(token: Token) -> Node:
     if token.type == "heading_open":
         level = int(token.tag[1:]) if token.tag.startswith("h") else 1
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import codecs
+import re
+from typing import IO, Iterator, List, Tuple
+
+from ..ast.node import Node
+from .incremental import parse_lines
+from .tag_parser import parse_tag_content
+from .tokenizer import Tokenizer, _is_single_tag_line
+
+_FENCE = re.compile(r" {0,3}(`{3,}|~{3,})(.*)")
+_HTML_BLOCKS = (
+    (
+        re.compile(r" {0,3}<(?:script|pre|style|textarea)(?:\s|>|$)", re.I),
+        re.compile(r"</(?:script|pre|style|textarea)>", re.I),
+    ),
+    (re.compile(r" {0,3}<!--"), re.compile(r"-->")),
+    (re.compile(r" {0,3}<\?"), re.compile(r"\?>")),
+    (re.compile(r" {0,3}<![A-Za-z]"), re.compile(r">")),
+    (re.compile(r" {0,3}<!\[CDATA\["), re.compile(r"\]\]>")),
+)
+# HTML blocks that run until the next blank line: block-level tags, which may
+# interrupt a paragraph, and any other complete tag alone on its line, which may not.
+_HTML_BLOCK_TAG = re.compile(
+    r" {0,3}</?(?:address|article|aside|base|basefont|blockquote|body|caption|center|"
+    r"col|colgroup|dd|details|dialog|dir|div|dl|dt|fieldset|figcaption|figure|footer|"
+    r"form|frame|frameset|h[1-6]|head|header|hr|html|iframe|legend|li|link|main|menu|"
+    r"menuitem|nav|noframes|ol|optgroup|option|p|param|search|section|summary|table|"
+    r"tbody|td|tfoot|th|thead|title|tr|track|ul)(?:\s|/?>|$)",
+    re.I,
+)
+_HTML_OTHER_TAG = re.compile(
+    r" {0,3}(?:<[A-Za-z][A-Za-z0-9-]*"
+    r"(?:\s+[A-Za-z_:][A-Za-z0-9_.:-]*"
+    r"(?:\s*=\s*(?:[^\s\"'=<>`]+|'[^']*'|\"[^\"]*\"))?)*\s*/?>"
+    r"|</[A-Za-z][A-Za-z0-9-]*\s*>)\s*"
+)
+_BLANK = re.compile(r"^\s*$")
+_LIST_ITEM = re.compile(r"(?:[-+*]|\d{1,9}[.)])(?:\s|$)")
+
+
+class BlockSplitter:
+    """Track where a stream of source lines can be cut between top-level blocks.
+
+    A cut is safe before a line that follows a blank line, is not indented and does
+    not start a list item (which could continue a previous list), while no fence, HTML
+    block or block tag is open. Parsing the pieces on either side of a safe cut gives
+    the same top-level nodes as parsing the whole source.
+    """
+
+    def __init__(self) -> None:
+        self.fence: Tuple[str, int] | None = None
+        self.html_end: re.Pattern[str] | None = None
+        self.tags: List[str] = []
+        self.paragraph: List[str] = []
+        self.blank = True
+
+    def can_split(self, line: str) -> bool:
+        """Whether a piece may end right before `line`."""
+        return (
+            self.blank
+            and self.fence is None
+            and self.html_end is None
+            and not self.tags
+            and not self.paragraph
+            and line[:1] not in ("", " ", "\t")
+            and not _LIST_ITEM.match(line)
+        )
+
+    def push(self, line: str) -> None:
+        """Advance the state past `line`."""
+        stripped = line.strip()
+        self.blank = not stripped
+        if self.fence is not None:
+            char, length = self.fence
+            match = _FENCE.fullmatch(line.rstrip())
+            if match and match.group(1)[0] == char and len(match.group(1)) >= length:
+                if not match.group(2).strip():
+                    self.fence = None
+            return
+        if self.html_end is _BLANK and _is_single_tag_line(stripped):
+            # The tokenizer puts block tag lines between blank lines, which end
+            # the HTML block.
+            self.html_end = None
+        if self.html_end is not None:
+            if self.html_end.search(line):
+                self.html_end = None
+            return
+        if not stripped:
+            self._end_paragraph()
+            return
+        match = _FENCE.fullmatch(line)
+        if match and not (match.group(1)[0] == "`" and "`" in match.group(2)):
+            self._end_paragraph()
+            self.fence = (match.group(1)[0], len(match.group(1)))
+            return
+        for start, end in _HTML_BLOCKS:
+            if start.match(line):
+                self._end_paragraph()
+                if not end.search(line):
+                    self.html_end = end
+                return
+        if _HTML_BLOCK_TAG.match(line) or (not self.paragraph and _HTML_OTHER_TAG.fullmatch(line)):
+            self._end_paragraph()
+            self.html_end = _BLANK
+            return
+        if _is_single_tag_line(stripped):
+            self._end_paragraph()
+            self._apply_tag(stripped)
+            return
+        self.paragraph.append(stripped)
+
+    def _end_paragraph(self) -> None:
+        if self.paragraph:
+            text = "\n".join(self.paragraph)
+            self.paragraph = []
+            if _is_single_tag_line(text):
+                self._apply_tag(text)
+
+    def _apply_tag(self, text: str) -> None:
+        tag = parse_tag_content(text[2:-2])
+        if tag.kind == "open":
+            self.tags.append(tag.name or "")
+        elif tag.kind == "close" and self.tags and self.tags[-1] == tag.name:
+            self.tags.pop()
+
+
+def parse_iter(
+    fileobj: IO,
+    *,
+    slots: bool = False,
+    chunk_size: int = 1 << 16,
+    tokenizer: Tokenizer | None = None,
+) -> Iterator[Node]:
+    """Parse a file object piece by piece and yield its top-level nodes.
+
+    The input is read `chunk_size` characters at a time and cut at safe block
+    boundaries (see `BlockSplitter`) once roughly `chunk_size` characters are buffered,
+    so memory use stays bounded by the largest piece rather than the document. The
+    yielded nodes equal the children of `parse()` on the whole input, with the same
+    line numbers. Link reference definitions only apply within their own piece, and
+    slots assigned to the document itself are not yielded.
+    """
+    tokenizer = tokenizer or Tokenizer()
+    splitter = BlockSplitter()
+    buffered: List[str] = []
+    size = 0
+    offset = 0
+    for line in _iter_lines(fileobj, chunk_size):
+        if size >= chunk_size and splitter.can_split(line):
+            # Parse with the next line as lookahead: markdown-it extends some blocks
+            # (lists) over trailing blank lines only when more content follows.
+            root = parse_lines(tokenizer, [*buffered, line], offset, slots)
+            offset += len(buffered)
+            yield from (node for node in root.children if node.lines[0] < offset)
+            buffered = []
+            size = 0
+        splitter.push(line)
+        buffered.append(line)
+        size += len(line) + 1
+    if buffered:
+        yield from parse_lines(tokenizer, buffered, offset, slots).children
+
+
+def split_lines(text: str) -> Tuple[List[str], str]:
+    """Split `text` into complete lines and the unterminated rest.
+
+    Lines are split the way `str.splitlines` would split the whole input; a trailing
+    carriage return stays in the rest since it may be the first half of ``\\r\\n``.
+    """
+    pieces = text.splitlines(keepends=True)
+    rest = ""
+    if pieces:
+        last = pieces[-1]
+        if last.endswith("\r") or last.splitlines()[0] == last:
+            rest = pieces.pop()
+    return [piece.splitlines()[0] for piece in pieces], rest
+
+
+def _iter_lines(fileobj: IO, chunk_size: int) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            break
+        if isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk)
+        lines, pending = split_lines(pending + chunk)
+        yield from lines
+    pending += decoder.decode(b"", final=True)
+    yield from pending.splitlines()
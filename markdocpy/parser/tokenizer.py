@@ -1,37 +1,54 @@
 from __future__ import annotations
 
-from markdown_it import MarkdownIt
-
 from ..utils import find_tag_end
 
 
 class Tokenizer:
     def __init__(self, config: dict | None = None) -> None:
+        # Imported here so that importing markdocpy does not load markdown-it.
+        from markdown_it import MarkdownIt
+
         options = config or {}
         self.parser = MarkdownIt("commonmark", options_update=options) if options else MarkdownIt()
         self.parser.enable("table")
         self.parser.disable(["lheading", "code"])
 
     def tokenize(self, content: str):
-        normalized = _normalize_block_tags(content)
-        return self.parser.parse(normalized, {})
+        normalized, offsets = _normalize_block_tags(content)
+        tokens = self.parser.parse(normalized, {})
+        for token in tokens:
+            if token.map:
+                token.map = [offsets[token.map[0]], offsets[token.map[1]]]
+        return tokens
+
 
+def _normalize_block_tags(content: str) -> tuple[str, list[int]]:
+    """Separate block tag lines from their neighbours with blank lines.
 
-def _normalize_block_tags(content: str) -> str:
+    Returns the normalized content and, for every normalized line boundary, the
+    matching line number in the original content, so token maps can be
+    translated back to source lines.
+    """
     lines = content.splitlines()
     output: list[str] = []
+    offsets: list[int] = []
     for idx, line in enumerate(lines):
         stripped = line.strip()
         is_tag_line = _is_single_tag_line(stripped)
         if is_tag_line:
             if output and output[-1].strip() != "":
                 output.append("")
+                offsets.append(idx)
             output.append(line)
+            offsets.append(idx)
             if idx + 1 < len(lines) and lines[idx + 1].strip() != "":
                 output.append("")
+                offsets.append(idx + 1)
             continue
         output.append(line)
-    return "\n".join(output)
+        offsets.append(idx)
+    offsets.append(len(lines))
+    return "\n".join(output), offsets
 
 
 def _is_single_tag_line(stripped: str) -> bool:
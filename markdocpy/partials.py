@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, List, Protocol, Sequence, Tuple, runtime_checkable
+
+from .ast.node import Node
+from .parser.parser import parse as _parse_tokens
+from .parser.tokenizer import Tokenizer
+from .stats import current_stats
+
+
+@runtime_checkable
+class PartialLoader(Protocol):
+    """Source of partials that can stand in for the `config["partials"]` dict.
+
+    `load` returns the AST of a partial, or None when there is no such partial, and
+    may parse it on demand. `names` lists the partials that exist; it is only used
+    when every partial has to be considered, such as for a `file` that is not a
+    literal.
+    """
+
+    def load(self, name: str) -> Node | List[Node] | None: ...
+
+    def names(self) -> Iterable[str]: ...
+
+
+class PartialCycleError(RecursionError):
+    """A partial includes itself, directly or through other partials."""
+
+    def __init__(self, chain: Sequence[str]):
+        self.chain = tuple(chain)
+        super().__init__("Partial include cycle: " + " -> ".join(self.chain))
+
+
+class DirectoryPartialLoader:
+    """Load partials from the files under a directory, named by relative path.
+
+    Files are parsed on first use and the ASTs kept in an LRU of `max_entries`,
+    keyed by path and modification time so edited files are parsed again. Names
+    that point outside the directory are not found.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        *,
+        max_entries: int = 256,
+        suffix: str = ".md",
+        tokenizer: Tokenizer | None = None,
+    ):
+        self.path = Path(path).resolve()
+        self.max_entries = max_entries
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self._tokenizer = tokenizer
+        self._entries: OrderedDict[Path, Tuple[int, Node]] = OrderedDict()
+
+    def load(self, name: str) -> Node | None:
+        if not isinstance(name, str):
+            return None
+        file = (self.path / name).resolve()
+        if self.path not in file.parents:
+            return None
+        try:
+            mtime = file.stat().st_mtime_ns
+        except OSError:
+            self._entries.pop(file, None)
+            return None
+        entry = self._entries.get(file)
+        hit = entry is not None and entry[0] == mtime
+        stats = current_stats()
+        if stats is not None:
+            stats.add_lookup("partial_loader", hit)
+        if hit:
+            self._entries.move_to_end(file)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        try:
+            content = file.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
+        if self._tokenizer is None:
+            self._tokenizer = Tokenizer()
+        node = _parse_tokens(
+            self._tokenizer.tokenize(content), line_count=len(content.splitlines())
+        )
+        self._entries[file] = (mtime, node)
+        self._entries.move_to_end(file)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return node
+
+    def names(self) -> List[str]:
+        return sorted(
+            file.relative_to(self.path).as_posix() for file in self.path.rglob(f"*{self.suffix}")
+        )
+
+    def clear(self) -> None:
+        self._entries.clear()
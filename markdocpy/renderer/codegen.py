@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from html import escape
+from typing import Any, Callable, Dict, Tuple
+
+from ..ast.tag import FrozenTag, Markup, Tag
+from ..transform.transformer import global_attributes, merge_config
+from .html import _VOID_ELEMENTS
+
+# Tag names the transformer emits without a schema `render` string.
+_BUILTIN_NAMES = ("article", "code", "li", "ol", "pre", "ul", "h1", "h2", "h3", "h4", "h5", "h6")
+
+_PRELUDE = '''
+def render(node):
+    out = []
+    _render(node, out)
+    return "".join(out)
+
+
+def _render(node, out):
+    kind = type(node)
+    if kind is str:
+        out.append(escape(node, True))
+    elif kind is list:
+        for child in node:
+            _render(child, out)
+    elif kind is Tag or kind is FrozenTag:
+        name = node.name
+        if name in _BY_NAME:
+            _BY_NAME[name](node, out)
+        elif name:
+            _tag(node, name, out)
+        elif node.children:
+            _children(node.children, out)
+    elif kind is Markup:
+        out.append(node)
+    elif isinstance(node, (str, int, float)) and not isinstance(node, bool):
+        out.append(escape(str(node), True))
+    elif isinstance(node, list):
+        for child in node:
+            _render(child, out)
+    elif node is not None and Tag.is_tag(node):
+        name = node.name
+        if name in _BY_NAME:
+            _BY_NAME[name](node, out)
+        elif name:
+            _tag(node, name, out)
+        elif node.children:
+            _children(node.children, out)
+
+
+def _children(children, out):
+    if type(children) is list or type(children) is tuple:
+        for child in children:
+            _render(child, out)
+    else:
+        _render(children, out)
+
+
+def _attributes(attributes, out):
+    for key, value in attributes.items():
+        if value is True:
+            out.append(_NAMES.get(key) or " " + key.lower())
+        elif value is not False and value is not None:
+            out.append(_PREFIXES.get(key) or f' {key.lower()}="')
+            out.append(escape(str(value), True))
+            out.append('"')
+
+
+def _tag(node, name, out):
+    out.append(f"<{name}")
+    if node.attributes:
+        _attributes(node.attributes, out)
+    out.append(">")
+    if name in _VOID_ELEMENTS:
+        return
+    if node.children:
+        _children(node.children, out)
+    out.append(f"</{name}>")
+'''
+
+_TAG = '''
+
+def _render_{index}(node, out):
+    attributes = node.attributes
+    if attributes:
+        out.append({open!r})
+        _attributes(attributes, out)
+        out.append(">")
+    else:
+        out.append({empty!r})
+'''
+
+_CHILDREN = '''    children = node.children
+    if type(children) is list or type(children) is tuple:
+        for child in children:
+            _render(child, out)
+    elif children:
+        _render(children, out)
+    out.append({close!r})
+'''
+
+
+def compile_renderer(config: Dict[str, Any] | None = None) -> Callable[[Any], str]:
+    """Generate an HTML renderer specialized for the tag names and attributes of a config.
+
+    The returned function renders exactly like `markdocpy.renderer.html.render`, but
+    every tag name the config can produce gets its own function with the open and
+    close tags precomputed, and the known attribute names have their ` name="`
+    prefixes prepared. Renderers are cached per set of names and attributes.
+    """
+    return _compile(*_plan(merge_config(config)))
+
+
+def _plan(config: Dict[str, Any]) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    names = set(_BUILTIN_NAMES)
+    attributes = set(global_attributes)
+    for schemas in (config.get("nodes", {}), config.get("tags", {})):
+        for schema in schemas.values():
+            if not isinstance(schema, dict):
+                continue
+            render = schema.get("render")
+            if isinstance(render, str) and "{" not in render:
+                names.add(render)
+            for key, attr in [
+                *(schema.get("attributes") or {}).items(),
+                *(schema.get("slots") or {}).items(),
+            ]:
+                render_as = attr.get("render", True) if isinstance(attr, dict) else True
+                if render_as is not False:
+                    attributes.add(render_as if isinstance(render_as, str) else key)
+    return tuple(sorted(names)), tuple(sorted(attributes))
+
+
+@lru_cache(maxsize=32)
+def _compile(names: Tuple[str, ...], attributes: Tuple[str, ...]) -> Callable[[Any], str]:
+    source = [_PRELUDE]
+    for index, name in enumerate(names):
+        source.append(_TAG.format(index=index, open=f"<{name}", empty=f"<{name}>"))
+        if name not in _VOID_ELEMENTS:
+            source.append(_CHILDREN.format(close=f"</{name}>"))
+    source.append(
+        "\n_BY_NAME = {"
+        + ", ".join(f"{name!r}: _render_{index}" for index, name in enumerate(names))
+        + "}\n"
+    )
+    namespace: Dict[str, Any] = {
+        "escape": escape,
+        "Markup": Markup,
+        "Tag": Tag,
+        "FrozenTag": FrozenTag,
+        "_VOID_ELEMENTS": _VOID_ELEMENTS,
+        "_NAMES": {key: f" {key.lower()}" for key in attributes},
+        "_PREFIXES": {key: f' {key.lower()}="' for key in attributes},
+    }
+    exec(compile("".join(source), "<markdocpy.renderer.codegen>", "exec"), namespace)
+    return namespace["render"]
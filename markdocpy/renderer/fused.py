@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import time
+from html import escape
+from typing import Any, Dict, List
+
+from ..ast.node import Node, StaticNode
+from ..ast.variable import track_reads
+from ..schema.tags import _render_conditions, _transform_if, _transform_tag, truthy
+from ..tracing import current_tracer
+from ..transform.transformer import (
+    _call_transform,
+    _find_schema,
+    _render_attributes,
+    merge_config,
+)
+from ..stats import current_stats
+from .html import _VOID_ELEMENTS, _write_attributes, render
+
+
+def render_html(ast: Node | List[Node], config: Dict[str, Any] | None = None) -> str:
+    """Resolve, transform and render `ast` to HTML in a single pass.
+
+    The output is identical to `renderers.html(transform(ast, config))`, but HTML is
+    written while walking the AST instead of building a `Tag` tree first. Only
+    custom `transform` callables produce `Tag` objects, which are rendered as usual.
+    Like `transform`, this resolves the AST in place.
+    """
+    cfg = merge_config(config)
+    tracer = current_tracer()
+    if tracer is not None:
+        tracer.index(ast)
+    stats = current_stats()
+    if stats is None:
+        ast = _resolve(ast, cfg)
+        output: List[str] = []
+        _write(ast, cfg, output)
+        return "".join(output)
+    start = time.perf_counter()
+    with track_reads() as reads:
+        ast = _resolve(ast, cfg)
+        middle = time.perf_counter()
+        output = []
+        _write(ast, cfg, output)
+    stats.variables += len(reads)
+    stats.add_time("resolve", middle - start)
+    stats.add_time("render", time.perf_counter() - middle)
+    return "".join(output)
+
+
+def _resolve(ast: Node | List[Node], config: Dict[str, Any]):
+    if isinstance(ast, list):
+        return [node.resolve(config) for node in ast]
+    return ast.resolve(config)
+
+
+def _write(node: Any, config: Dict[str, Any], output: List[str]) -> None:
+    if isinstance(node, list):
+        for child in node:
+            _write(child, config, output)
+        return
+    node_type = node.type
+    if type(node) is StaticNode:
+        output.append(node.html)
+        return
+    if node_type == "text":
+        output.append(render(node.content or ""))
+        return
+    if node_type == "softbreak":
+        output.append(" ")
+        return
+    if node_type in ("variable", "function"):
+        output.append(render(node.attributes.get("value") if node.attributes else None))
+        return
+    if node_type == "code_inline":
+        output.append(f"<code>{render(node.content or '')}</code>")
+        return
+    if node_type in ("code", "fence"):
+        language = node.attributes.get("language") if node_type == "fence" else None
+        if language:
+            output.append(f'<pre data-language="{escape(str(language), quote=True)}">')
+        else:
+            output.append("<pre>")
+        output.append(render(node.content or ""))
+        output.append("</pre>")
+        return
+
+    schema = _find_schema(node, config)
+    if node_type == "document":
+        if schema and schema.get("render"):
+            attributes = _render_attributes(node, schema, config)
+            _write_tag(schema["render"], attributes, node.children, config, output)
+        else:
+            _write(node.children, config, output)
+        return
+
+    transform = schema.get("transform") if schema else None
+    if transform is _transform_if:
+        for condition in _render_conditions(node):
+            if truthy(condition["condition"]):
+                _write(condition["children"], config, output)
+                break
+        return
+    if transform is _transform_tag:
+        _write_tag(node.tag, node.attributes or {}, node.children, config, output)
+        return
+    if callable(transform):
+        output.append(render(_call_transform(transform, node, config)))
+        return
+
+    if node_type == "list":
+        name = "ol" if node.attributes.get("ordered") else "ul"
+        _write_tag(name, {}, node.children, config, output)
+        return
+    if node_type == "item":
+        children = node.children
+        if children and isinstance(children[0], Node) and children[0].type == "paragraph":
+            children = [*children[0].children, *children[1:]]
+        _write_tag("li", _render_attributes(node, schema, config), children, config, output)
+        return
+
+    if schema is None:
+        if node_type == "tag":
+            _write(node.children, config, output)
+        return
+    name = schema.get("render")
+    if name is False or name is None:
+        _write(node.children, config, output)
+    elif isinstance(name, str):
+        if "{" in name:
+            name = name.format(**node.attributes)
+        attributes = _render_attributes(node, schema, config)
+        _write_tag(name, attributes, node.children, config, output)
+
+
+def _write_tag(
+    name: str | None,
+    attributes: Dict[str, Any],
+    children: List[Any],
+    config: Dict[str, Any],
+    output: List[str],
+) -> None:
+    if not name:
+        _write(children, config, output)
+        return
+    output.append(f"<{name}")
+    if attributes:
+        _write_attributes(attributes, output)
+    output.append(">")
+    if name in _VOID_ELEMENTS:
+        return
+    _write(children, config, output)
+    output.append(f"</{name}>")
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from html import escape
-from typing import Any
+from typing import Any, List
 
-from ..ast.tag import Tag
+from ..ast.tag import Markup, Tag
 
 _VOID_ELEMENTS = {
     "area",
@@ -24,6 +24,8 @@ _VOID_ELEMENTS = {
 
 
 def render(node: Any) -> str:
+    if type(node) is Markup:
+        return node
     if isinstance(node, (str, int, float)) and not isinstance(node, bool):
         return escape(str(node), quote=True)
     if isinstance(node, list):
@@ -36,23 +38,33 @@ def render(node: Any) -> str:
     children = node.children or []
 
     if not name:
-        return render(children)
+        return _render_children(children)
 
     output = [f"<{name}"]
-    for key, value in attributes.items():
-        if value is True:
-            output.append(f" {key.lower()}")
-            continue
-        if value is False or value is None:
-            continue
-        output.append(f' {key.lower()}="{escape(str(value), quote=True)}"')
+    _write_attributes(attributes, output)
     output.append(">")
 
     if name in _VOID_ELEMENTS:
         return "".join(output)
 
     if children:
-        output.append(render(children))
+        output.append(_render_children(children))
     output.append(f"</{name}>")
 
     return "".join(output)
+
+
+def _render_children(children: Any) -> str:
+    if type(children) is tuple:
+        return "".join(render(child) for child in children)
+    return render(children)
+
+
+def _write_attributes(attributes: Any, output: List[str]) -> None:
+    for key, value in attributes.items():
+        if value is True:
+            output.append(f" {key.lower()}")
+            continue
+        if value is False or value is None:
+            continue
+        output.append(f' {key.lower()}="{escape(str(value), quote=True)}"')
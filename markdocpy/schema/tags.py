@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from typing import Any, Dict
 
-from ..ast.node import Node
+from ..ast.node import Node, copy_tree
+from ..tracing import current_tracer
 
 
 def truthy(value: Any) -> bool:
@@ -42,32 +43,67 @@ def _transform_tag(node: Node, config: Dict[str, Any]):
     )
 
 
+_PARTIAL_STACK = "$$partial:stack"
+
+
+def _load_partial(config: Dict[str, Any], file: Any):
+    """Look up `file` in `config["partials"]`, a dict or a `PartialLoader`."""
+    from ..partials import PartialLoader
+
+    partials = config.get("partials")
+    if isinstance(partials, dict):
+        return partials.get(file)
+    if isinstance(partials, PartialLoader) and isinstance(file, str):
+        return partials.load(file)
+    return None
+
+
+def _partial_names(config: Dict[str, Any]):
+    from ..partials import PartialLoader
+
+    partials = config.get("partials")
+    if isinstance(partials, dict):
+        return list(partials)
+    if isinstance(partials, PartialLoader):
+        return list(partials.names())
+    return []
+
+
 class PartialFile:
     def validate(self, value: Any, config: Dict[str, Any], _key: str):
-        partials = config.get("partials", {})
-        if not isinstance(partials, dict) or value not in partials:
+        if _load_partial(config, value) is None:
             return [
                 {
                     "id": "attribute-value-invalid",
                     "level": "error",
-                    "message": f"Partial `{value}` not found. The 'file' attribute must be set in `config.partials`",
+                    "message": (
+                        f"Partial `{value}` not found. "
+                        "The 'file' attribute must be set in `config.partials`"
+                    ),
                 }
             ]
         return []
 
 
 def _transform_partial(node: Node, config: Dict[str, Any]):
+    from ..partials import PartialCycleError
     from ..transform.transformer import transform
 
-    partials = config.get("partials", {})
     file = node.attributes.get("file")
-    partial = partials.get(file) if isinstance(partials, dict) else None
+    partial = _load_partial(config, file)
     if not partial:
         return None
+    stack = config.get(_PARTIAL_STACK, ())
+    if file in stack:
+        raise PartialCycleError([*stack, file])
+    tracer = current_tracer()
+    if tracer is not None:
+        tracer.index(partial, file)
 
     variables = node.attributes.get("variables") or {}
     scoped = {
         **config,
+        _PARTIAL_STACK: (*stack, file),
         "variables": {
             **(config.get("variables") or {}),
             **(variables if isinstance(variables, dict) else {}),
@@ -76,7 +112,7 @@ def _transform_partial(node: Node, config: Dict[str, Any]):
     }
 
     def transform_part(part: Node):
-        resolved = part.resolve(scoped)
+        resolved = copy_tree(part).resolve(scoped)
         if resolved.type == "document":
             return [transform(child, scoped) for child in resolved.children]
         return transform(resolved, scoped)
@@ -99,6 +135,7 @@ tags = {
     "if": {
         "attributes": {"primary": {"render": False}},
         "transform": _transform_if,
+        "pure": True,
     },
     "else": {
         "self_closing": True,
@@ -106,6 +143,7 @@ tags = {
     },
     "table": {
         "transform": _transform_tag,
+        "pure": True,
     },
     "partial": {
         "inline": False,
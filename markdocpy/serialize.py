@@ -0,0 +1,166 @@
+"""Compact binary serialization of Markdoc ASTs.
+
+The payload is a `marshal` dump of nested tuples, one per node, preceded by a short
+header with the format and marshal versions. Strings are interned while encoding so
+repeated node types, tag names and attribute keys are written once and shared again
+after loading; empty fields are stored as None and inline nodes inherit the lines of
+their parent. Variables, Functions and other non-primitive values are stored as small
+tagged tuples.
+"""
+
+from __future__ import annotations
+
+import marshal
+from typing import IO, Any, Dict, List
+
+from .ast.function import Function
+from .ast.node import Node
+from .ast.variable import MISSING, Variable
+
+MAGIC = b"MDAST"
+FORMAT_VERSION = 1
+
+_HEADER = len(MAGIC) + 2
+_PRIMITIVES = (str, int, float, bool, type(None))
+_VARIABLE, _FUNCTION, _TUPLE, _NODE, _MISSING = range(5)
+
+
+def dumps(node: Node) -> bytes:
+    """Serialize an AST to bytes."""
+    strings: Dict[str, str] = {}
+    payload = marshal.dumps(_encode_node(node, strings, None))
+    return MAGIC + bytes([FORMAT_VERSION, marshal.version]) + payload
+
+
+def loads(data: bytes | bytearray | memoryview) -> Node:
+    """Deserialize an AST from bytes produced by `dumps` (or any bytes-like object)."""
+    view = memoryview(data)
+    if bytes(view[: len(MAGIC)]) != MAGIC:
+        raise ValueError("Not a serialized Markdoc AST")
+    version, marshal_version = view[len(MAGIC)], view[len(MAGIC) + 1]
+    if version != FORMAT_VERSION or marshal_version > marshal.version:
+        raise ValueError(
+            f"Unsupported serialized AST version {version}/{marshal_version}; "
+            f"expected {FORMAT_VERSION}/{marshal.version}"
+        )
+    return _decode_node(marshal.loads(view[_HEADER:]), [])
+
+
+def dump(node: Node, fp: IO[bytes]) -> None:
+    """Serialize an AST to a binary file object."""
+    fp.write(dumps(node))
+
+
+def load(fp: IO[bytes]) -> Node:
+    """Deserialize an AST from a binary file object."""
+    return loads(fp.read())
+
+
+def _intern(value: str, strings: Dict[str, str]) -> str:
+    return strings.setdefault(value, value)
+
+
+def _encode_node(node: Node, strings: Dict[str, str], parent_lines: List[int] | None) -> tuple:
+    attributes, plain = _encode_attributes(node.attributes, strings)
+    lines = node.lines
+    return (
+        _intern(node.type, strings),
+        [_encode_node(child, strings, lines) for child in node.children] or None,
+        attributes or None,
+        plain,
+        _intern(node.tag, strings) if node.tag is not None else None,
+        _intern(node.content, strings) if isinstance(node.content, str) else node.content,
+        {
+            _intern(key, strings): _encode_node(slot, strings, lines)
+            for key, slot in node.slots.items()
+        }
+        or None,
+        node.inline,
+        None if lines == parent_lines else lines,
+    )
+
+
+def _encode_attributes(attributes: Dict[str, Any], strings: Dict[str, str]):
+    encoded = {}
+    plain = True
+    for key, value in attributes.items():
+        if type(value) in _PRIMITIVES:
+            encoded[_intern(key, strings)] = (
+                _intern(value, strings) if type(value) is str else value
+            )
+            continue
+        plain = False
+        encoded[_intern(key, strings)] = _encode_value(value, strings)
+    return encoded, plain
+
+
+def _encode_value(value: Any, strings: Dict[str, str]) -> Any:
+    kind = type(value)
+    if kind is str:
+        return _intern(value, strings)
+    if kind in _PRIMITIVES:
+        return value
+    if isinstance(value, list):
+        return [_encode_value(item, strings) for item in value]
+    if isinstance(value, dict):
+        return {
+            _encode_value(key, strings): _encode_value(item, strings)
+            for key, item in value.items()
+        }
+    if isinstance(value, Variable):
+        return (_VARIABLE, _encode_value(value.path, strings))
+    if isinstance(value, Function):
+        return (
+            _FUNCTION,
+            _intern(value.name, strings),
+            _encode_value(value.args, strings),
+            _encode_value(value.kwargs, strings),
+        )
+    if isinstance(value, tuple):
+        return (_TUPLE, [_encode_value(item, strings) for item in value])
+    if isinstance(value, Node):
+        return (_NODE, _encode_node(value, strings, None))
+    if value is MISSING:
+        return (_MISSING,)
+    raise TypeError(f"Cannot serialize value of type {kind.__name__!r} in a Markdoc AST")
+
+
+def _decode_node(record: tuple, parent_lines: List[int]) -> Node:
+    type_, children, attributes, plain, tag, content, slots, inline, lines = record
+    lines = list(parent_lines) if lines is None else lines
+    if attributes is None:
+        attributes = {}
+    elif not plain:
+        attributes = {key: _decode_value(value) for key, value in attributes.items()}
+    return Node(
+        type_,
+        [_decode_node(child, lines) for child in children] if children else [],
+        attributes,
+        tag,
+        content,
+        {key: _decode_node(slot, lines) for key, slot in slots.items()} if slots else {},
+        inline,
+        lines,
+    )
+
+
+def _decode_value(value: Any) -> Any:
+    kind = type(value)
+    if kind in _PRIMITIVES:
+        return value
+    if kind is list:
+        return [_decode_value(item) for item in value]
+    if kind is dict:
+        return {_decode_value(key): _decode_value(item) for key, item in value.items()}
+    tag = value[0]
+    if tag == _VARIABLE:
+        return Variable(_decode_value(value[1]))
+    if tag == _FUNCTION:
+        return Function(value[1], _decode_value(value[2]), _decode_value(value[3]))
+    if tag == _TUPLE:
+        return tuple(_decode_value(item) for item in value[1])
+    if tag == _NODE:
+        return _decode_node(value[1], [])
+    if tag == _MISSING:
+        return MISSING
+    raise ValueError(f"Unknown value tag {tag!r} in serialized AST")
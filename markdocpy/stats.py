@@ -0,0 +1,122 @@
+"""Opt-in instrumentation of parsing, resolution, transforms, validation and rendering."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List
+
+_current: ContextVar["Stats | None"] = ContextVar("markdocpy_stats", default=None)
+
+
+@dataclass
+class Stats:
+    """Timers and counters for the calls made inside a `collect_stats` block.
+
+    `timings` holds the seconds spent per phase and `calls` how often each ran. The
+    phases are ``tokenize``, ``parse``, ``resolve``, ``transform``, ``validate`` and
+    ``render``, plus ``tag:<name>`` for each custom tag transform; time in a tag
+    transform also counts towards ``transform``. `nodes` counts the AST nodes parsed,
+    `tags` the `Tag` objects produced by transforms, `variables` and `functions` the
+    Variables and Functions resolved, and `caches` the ``[hits, misses]`` of each
+    cache used. `callback`, when set, is called with the phase and the seconds each
+    time a phase ends.
+    """
+
+    timings: Dict[str, float] = field(default_factory=dict)
+    calls: Dict[str, int] = field(default_factory=dict)
+    nodes: int = 0
+    tags: int = 0
+    variables: int = 0
+    functions: int = 0
+    caches: Dict[str, List[int]] = field(default_factory=dict)
+    callback: Callable[[str, float], None] | None = field(default=None, repr=False, compare=False)
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+        if self.callback is not None:
+            self.callback(phase, seconds)
+
+    def add_lookup(self, cache: str, hit: bool) -> None:
+        counts = self.caches.get(cache)
+        if counts is None:
+            counts = self.caches[cache] = [0, 0]
+        counts[0 if hit else 1] += 1
+
+    def hit_rate(self, cache: str) -> float:
+        """Share of lookups in `cache` that were hits, or 0.0 if it was not used."""
+        hits, misses = self.caches.get(cache, (0, 0))
+        return hits / (hits + misses) if hits + misses else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "timings": dict(self.timings),
+            "calls": dict(self.calls),
+            "nodes": self.nodes,
+            "tags": self.tags,
+            "variables": self.variables,
+            "functions": self.functions,
+            "caches": {
+                name: {"hits": hits, "misses": misses, "hit_rate": self.hit_rate(name)}
+                for name, (hits, misses) in self.caches.items()
+            },
+        }
+
+
+@contextmanager
+def collect_stats(
+    stats: Stats | None = None, *, callback: Callable[[str, float], None] | None = None
+) -> Iterator[Stats]:
+    """Record `Stats` for the markdocpy calls made inside the block.
+
+    Collection is scoped to the current thread or asyncio task. Pass `stats` to keep
+    adding to an existing object. Outside a block the instrumented functions only
+    check a context variable.
+    """
+    if stats is None:
+        stats = Stats(callback=callback)
+    elif callback is not None:
+        stats.callback = callback
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def current_stats() -> Stats | None:
+    """The `Stats` being collected in this context, if any."""
+    return _current.get()
+
+
+def count_nodes(node: Any) -> int:
+    """Count the AST nodes in `node`, including slots."""
+    from .ast.node import Node
+
+    count = 0
+    pending = list(node) if isinstance(node, list) else [node]
+    while pending:
+        current = pending.pop()
+        if isinstance(current, Node):
+            count += 1
+            pending.extend(current.children)
+            pending.extend(current.slots.values())
+    return count
+
+
+def count_tags(tree: Any) -> int:
+    """Count the `Tag` objects in a transformed tree."""
+    from .ast.tag import Tag
+
+    count = 0
+    pending = [tree]
+    while pending:
+        current = pending.pop()
+        if isinstance(current, (list, tuple)):
+            pending.extend(current)
+        elif Tag.is_tag(current):
+            count += 1
+            pending.extend(current.children or ())
+    return count
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from .ast.node import Node
+from .parser.incremental import parse_lines
+from .parser.stream import BlockSplitter, split_lines
+from .parser.tokenizer import Tokenizer
+from .renderer.html import render
+from .transform.transformer import merge_config, transform
+
+
+class MarkdocStream:
+    """Render Markdoc content that arrives in pieces, such as a streamed response.
+
+    Top-level blocks that later input can no longer change (see
+    `markdocpy.parser.stream.BlockSplitter`) become stable: they are parsed,
+    transformed and rendered once and returned from `feed`. The rest of the input is
+    the unstable tail, which `tail` re-processes on demand, so each call costs time
+    proportional to the tail rather than to everything received so far. The HTML is
+    that of the document's children, without the document's own wrapper element.
+    """
+
+    def __init__(self, config: Dict[str, Any] | None = None, *, slots: bool = False):
+        self.config = merge_config(config)
+        self.slots = slots
+        self.nodes: List[Node] = []
+        """Stable top-level nodes, in document order and resolved against the config."""
+        self._tokenizer = Tokenizer()
+        self._splitter = BlockSplitter()
+        self._lines: List[str] = []
+        self._rest = ""
+        self._offset = 0
+        self._closed = False
+
+    def feed(self, text: str) -> str:
+        """Add input and return the HTML of blocks that became stable."""
+        if self._closed:
+            raise ValueError("Cannot feed a closed MarkdocStream")
+        lines, self._rest = split_lines(self._rest + text)
+        output: List[str] = []
+        for line in lines:
+            if self._lines and self._splitter.can_split(line):
+                root = parse_lines(self._tokenizer, [*self._lines, line], self._offset, self.slots)
+                self._offset += len(self._lines)
+                self._lines = []
+                output.append(self._emit(n for n in root.children if n.lines[0] < self._offset))
+            self._splitter.push(line)
+            self._lines.append(line)
+        return "".join(output)
+
+    def tail(self) -> str:
+        """Render the unstable tail as if the input ended here."""
+        return self._render_nodes(self._parse_tail().children)
+
+    def close(self) -> str:
+        """End the input and return the HTML of everything not yet returned."""
+        if self._closed:
+            return ""
+        self._closed = True
+        root = self._parse_tail()
+        self._lines = []
+        self._rest = ""
+        return self._emit(root.children)
+
+    def _parse_tail(self) -> Node:
+        lines = [*self._lines, *self._rest.splitlines()]
+        return parse_lines(self._tokenizer, lines, self._offset, self.slots)
+
+    def _emit(self, nodes) -> str:
+        nodes = list(nodes)
+        self.nodes.extend(nodes)
+        return self._render_nodes(nodes)
+
+    def _render_nodes(self, nodes: List[Node]) -> str:
+        return "".join(render(transform(node.resolve(self.config), self.config)) for node in nodes)
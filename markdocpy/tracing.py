@@ -0,0 +1,179 @@
+"""Spans for custom tag transforms, partials and config functions, with Chrome trace export."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Tuple
+
+_current: ContextVar["Tracer | None"] = ContextVar("markdocpy_tracer", default=None)
+
+
+@dataclass
+class SpanSummary:
+    """Totals for all spans with the same category and name."""
+
+    category: str
+    name: str
+    count: int
+    total: float
+    self_time: float
+    """Time not spent in nested spans."""
+
+
+class Tracer:
+    """Records a span for every custom tag `transform`, partial expansion and config
+    function called while it is active (see `trace`).
+
+    Spans carry the tag or function name and, where known, the source file and
+    line. `write` saves them in Chrome's trace event format, which chrome://tracing
+    and Perfetto open, and `format_summary` lists the most expensive ones.
+    """
+
+    def __init__(self) -> None:
+        self.events: List[Dict[str, Any]] = []
+        self._origin = time.perf_counter()
+        self._stack: List[List[float]] = []
+        # Keyed by id() since functions are unhashable; each entry keeps its function
+        # alive so the id is not reused by another object while the tracer is.
+        self._locations: Dict[int, Tuple[Any, Dict[str, Any]]] = {}
+        self._self_times: List[float] = []
+
+    @contextmanager
+    def span(self, category: str, name: str, args: Dict[str, Any] | None = None):
+        frame = [time.perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._stack.pop()
+            duration = end - frame[0]
+            if self._stack:
+                self._stack[-1][1] += duration
+            self.events.append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": (frame[0] - self._origin) * 1e6,
+                    "dur": duration * 1e6,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                    "args": args or {},
+                }
+            )
+            self._self_times.append(duration - frame[1])
+
+    def index(self, ast: Any, file: str | None = None) -> None:
+        """Remember where the functions in `ast` appear, for the spans of their calls."""
+        from .ast.function import Function
+        from .ast.node import Node
+
+        pending = list(ast) if isinstance(ast, list) else [ast]
+        while pending:
+            node = pending.pop()
+            if not isinstance(node, Node):
+                continue
+            location = _location(node, file)
+            values: List[Any] = [node.attributes]
+            while values:
+                value = values.pop()
+                if isinstance(value, Function):
+                    self._locations.setdefault(id(value), (value, location))
+                    values.extend(value.args)
+                    values.extend(value.kwargs.values())
+                elif isinstance(value, (list, tuple)):
+                    values.extend(value)
+                elif isinstance(value, dict):
+                    values.extend(value.values())
+            pending.extend(node.children)
+            pending.extend(node.slots.values())
+
+    def location(self, value: Any) -> Dict[str, Any]:
+        entry = self._locations.get(id(value))
+        return entry[1] if entry is not None and entry[0] is value else {}
+
+    def summary(self) -> List[SpanSummary]:
+        """Totals per category and name, most expensive first."""
+        totals: Dict[Tuple[str, str], SpanSummary] = {}
+        for event, self_time in zip(self.events, self._self_times):
+            key = (event["cat"], event["name"])
+            entry = totals.get(key)
+            if entry is None:
+                entry = totals[key] = SpanSummary(event["cat"], event["name"], 0, 0.0, 0.0)
+            entry.count += 1
+            entry.total += event["dur"] / 1e6
+            entry.self_time += self_time
+        return sorted(totals.values(), key=lambda entry: entry.self_time, reverse=True)
+
+    def format_summary(self, top: int = 10) -> str:
+        """A table of the `top` spans by self time."""
+        lines = [f"{'category':<10} {'name':<32} {'calls':>7} {'total ms':>10} {'self ms':>10}"]
+        for entry in self.summary()[:top]:
+            lines.append(
+                f"{entry.category:<10} {entry.name[:32]:<32} {entry.count:>7} "
+                f"{entry.total * 1000:>10.3f} {entry.self_time * 1000:>10.3f}"
+            )
+        return "\n".join(lines)
+
+    def to_chrome(self) -> Dict[str, Any]:
+        return {"traceEvents": self.events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str | os.PathLike) -> None:
+        """Save the spans as a Chrome trace event JSON file."""
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.to_chrome(), handle)
+
+
+@contextmanager
+def trace(
+    path: str | os.PathLike | None = None, *, tracer: Tracer | None = None
+) -> Iterator[Tracer]:
+    """Trace the markdocpy calls made inside the block, writing the trace to `path` if given.
+
+    Tracing is scoped to the current thread or asyncio task.
+    """
+    tracer = tracer or Tracer()
+    token = _current.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _current.reset(token)
+        if path is not None:
+            tracer.write(path)
+
+
+def current_tracer() -> Tracer | None:
+    """The `Tracer` active in this context, if any."""
+    return _current.get()
+
+
+def tag_span(tracer: Tracer, node: Any, config: Dict[str, Any]):
+    """The span for a custom transform of `node`."""
+    name = node.tag or node.type
+    args = {"tag": name, **_location(node, _partial_file(config))}
+    if name == "partial":
+        file = node.attributes.get("file")
+        args["partial"] = file
+        return tracer.span("partial", f"partial {file}", args)
+    return tracer.span("tag", name, args)
+
+
+def _partial_file(config: Dict[str, Any]) -> str | None:
+    variables = config.get("variables")
+    return variables.get("$$partial:filename") if isinstance(variables, dict) else None
+
+
+def _location(node: Any, file: str | None) -> Dict[str, Any]:
+    location: Dict[str, Any] = {}
+    if file is not None:
+        location["file"] = file
+    if node.lines:
+        location["line"] = node.lines[0] + 1
+    return location
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Set
+
+from ..ast.node import Node, StaticNode, copy_tree
+from ..ast.tag import Markup
+from ..renderer.fused import _write
+from ..renderer.html import render
+from .transformer import _find_schema, _is_dynamic_value, merge_config, transform
+
+_HOLE = "\x00markdoc-hole\x00"
+_DYNAMIC_TYPES = ("variable", "function")
+_LEAF_TYPES = ("text", "code_inline", "softbreak", "code", "fence", *_DYNAMIC_TYPES)
+
+
+@dataclass
+class CompiledDocument:
+    """A document split into pre-rendered HTML and the subtrees left to evaluate.
+
+    `segments` holds escaped HTML strings and dynamic nodes (holes). Static parts of
+    a hole are `StaticNode`s carrying their HTML. Compiled documents only contain
+    AST values, so they can be pickled and cached.
+    """
+
+    segments: List[str | Node] = field(default_factory=list)
+
+    def render(self, config: Dict[str, Any] | None = None) -> str:
+        """Render to HTML, evaluating the holes against `config`.
+
+        `config` must match the one given to `precompile` apart from `variables` and
+        `functions`.
+        """
+        return self._render(merge_config(config))
+
+    def _render(self, config: Dict[str, Any]) -> str:
+        output: List[str] = []
+        for segment in self.segments:
+            if isinstance(segment, str):
+                output.append(segment)
+            else:
+                _write(copy_tree(segment).resolve(config), config, output)
+        return "".join(output)
+
+
+def render_variants(
+    ast: Node | CompiledDocument,
+    config: Dict[str, Any] | None,
+    variable_sets: Iterable[Dict[str, Any]],
+) -> List[str]:
+    """Render one document with each set of variables and return the HTML in order.
+
+    See `iter_variants`.
+    """
+    return list(iter_variants(ast, config, variable_sets))
+
+
+def iter_variants(
+    ast: Node | CompiledDocument,
+    config: Dict[str, Any] | None,
+    variable_sets: Iterable[Dict[str, Any]],
+) -> Iterator[str]:
+    """Render one document with each set of variables, yielding the HTML as it is ready.
+
+    The document is precompiled once (unless it already is a `CompiledDocument`
+    for `config`), so schema lookups and the HTML of static subtrees are shared by
+    all variants and only the dynamic holes are evaluated per variant. Each set of
+    variables is merged over `config["variables"]`.
+    """
+    cfg = merge_config(config)
+    compiled = ast if isinstance(ast, CompiledDocument) else precompile(ast, cfg)
+    base = cfg.get("variables")
+    for variables in variable_sets:
+        if isinstance(base, dict) and isinstance(variables, dict):
+            variables = {**base, **variables}
+        yield compiled._render({**cfg, "variables": variables})
+
+
+def precompile(ast: Node, config: Dict[str, Any] | None = None) -> CompiledDocument:
+    """Partially evaluate `ast` against `config`.
+
+    Subtrees without variables, functions or impure tags (those with a `transform`
+    whose schema is not marked `"pure": True`) are transformed and rendered once.
+    Dynamic nodes rendered by the default transform are split around their
+    children, so only the dynamic leaves remain holes.
+    """
+    cfg = merge_config(config)
+    static: Set[int] = set()
+    _find_static(ast, cfg, static)
+    segments: List[str | Node] = []
+    _compile(ast, cfg, static, segments)
+    merged: List[str | Node] = []
+    for segment in segments:
+        if isinstance(segment, str) and merged and isinstance(merged[-1], str):
+            merged[-1] += segment
+        elif segment != "":
+            merged.append(segment)
+    return CompiledDocument(merged)
+
+
+def _compile(
+    node: Any, config: Dict[str, Any], static: Set[int], segments: List[str | Node]
+) -> None:
+    if not isinstance(node, Node) or id(node) in static:
+        segments.append(render(transform(node, config)))
+        return
+    parts = _split(node, config)
+    if parts is None:
+        segments.append(_hole(node, config, static))
+        return
+    children = node.children
+    if node.type == "item" and children and isinstance(children[0], Node):
+        if children[0].type == "paragraph":
+            children = [*children[0].children, *children[1:]]
+    segments.append(parts[0])
+    for child in children:
+        _compile(child, config, static, segments)
+    segments.append(parts[1])
+
+
+def _split(node: Node, config: Dict[str, Any]):
+    """Render the node around a placeholder child and return the HTML before and after."""
+    if _is_dynamic_value(node.attributes) or node.type in _LEAF_TYPES:
+        return None
+    schema = _find_schema(node, config)
+    if schema and callable(schema.get("transform")):
+        return None
+    placeholder = Node(
+        node.type,
+        children=[Node("text", content=_HOLE)],
+        attributes=node.attributes,
+        tag=node.tag,
+        slots=node.slots,
+        inline=node.inline,
+    )
+    parts = render(transform(placeholder, config)).split(_HOLE)
+    return parts if len(parts) == 2 else None
+
+
+def _hole(node: Node, config: Dict[str, Any], static: Set[int]) -> Node:
+    """Copy a dynamic node with its static descendants pre-rendered."""
+    children = []
+    for child in node.children:
+        if not isinstance(child, Node):
+            children.append(child)
+        elif id(child) in static:
+            children.append(
+                StaticNode(
+                    child.type,
+                    children=child.children,
+                    attributes=child.attributes,
+                    tag=child.tag,
+                    content=child.content,
+                    slots=child.slots,
+                    inline=child.inline,
+                    lines=child.lines,
+                    html=Markup(render(transform(child, config))),
+                )
+            )
+        else:
+            children.append(_hole(child, config, static))
+    return _copy(node, children)
+
+
+def _find_static(node: Node, config: Dict[str, Any], static: Set[int]) -> bool:
+    """Add the ids of static nodes under `node` to `static`; return whether `node` is."""
+    result = node.type not in _DYNAMIC_TYPES and not _is_dynamic_value(node.attributes)
+    for child in node.children:
+        if isinstance(child, Node):
+            result = _find_static(child, config, static) and result
+        elif _is_dynamic_value(child):
+            result = False
+    for slot in node.slots.values():
+        result = _find_static(slot, config, static) and result
+    if result:
+        schema = _find_schema(node, config)
+        if schema and callable(schema.get("transform")) and not schema.get("pure"):
+            result = False
+    if result:
+        static.add(id(node))
+    return result
+
+
+def _copy(node: Node, children: List[Any]) -> Node:
+    return Node(
+        node.type,
+        children=children,
+        attributes=node.attributes,
+        tag=node.tag,
+        content=node.content,
+        slots=node.slots,
+        inline=node.inline,
+        lines=node.lines,
+    )
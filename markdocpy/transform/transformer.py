@@ -1,13 +1,20 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Set
 
-from ..ast.node import Node
-from ..ast.tag import Tag
+from ..ast.function import Function
+from ..ast.node import Node, StaticNode
+from ..ast.tag import Markup, Tag
+from ..ast.variable import Variable
 from ..schema.nodes import nodes as default_nodes
 from ..schema.functions import functions as default_functions
 from ..schema.tags import tags as default_tags
 from ..schema_types import ClassType, IdType
+from ..stats import _current as _current_stats
+from ..tracing import _current as _current_tracer
+from ..tracing import tag_span
 
 
 global_attributes = {
@@ -16,23 +23,142 @@ global_attributes = {
 }
 
 
+class _MergedConfig(dict):
+    """Config returned by `merge_config`; merging it again returns it unchanged."""
+
+
+class TransformMemo:
+    """Transformed output of pure subtrees keyed by `Node.digest`.
+
+    Pass one to `transform(..., memo=...)` to share output between transforms of
+    documents that use the same config (variables aside). Entries are evicted least
+    recently used first once there are more than `max_entries`.
+    """
+
+    def __init__(self, max_entries: int | None = 10_000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
 def merge_config(config: Dict[str, Any] | None = None) -> Dict[str, Any]:
     """Merge user config with default nodes/tags."""
+    if type(config) is _MergedConfig:
+        return config
     config = config or {}
-    return {
-        **config,
-        "nodes": {**default_nodes, **config.get("nodes", {})},
-        "tags": {**default_tags, **config.get("tags", {})},
-        "functions": {**default_functions, **config.get("functions", {})},
-        "global_attributes": {**global_attributes, **config.get("global_attributes", {})},
-    }
+    return _MergedConfig(
+        {
+            **config,
+            "nodes": {**default_nodes, **config.get("nodes", {})},
+            "tags": {**default_tags, **config.get("tags", {})},
+            "functions": {**default_functions, **config.get("functions", {})},
+            "global_attributes": {**global_attributes, **config.get("global_attributes", {})},
+        }
+    )
+
 
+def transform(
+    node: Node | List[Node],
+    config: Dict[str, Any] | None = None,
+    *,
+    memo: bool | TransformMemo = False,
+):
+    """Transform AST nodes into a renderable tree.
 
-def transform(node: Node | List[Node], config: Dict[str, Any] | None = None):
-    """Transform AST nodes into a renderable tree."""
+    With `memo`, subtrees without variables, functions or impure custom transforms
+    (a `transform` whose schema is not marked `"pure": True`) are transformed once
+    per distinct structure and the resulting `Tag` objects are shared, so they must
+    not be modified. Pass a `TransformMemo` to share them across calls.
+    """
     cfg = merge_config(config)
+    if memo is True or isinstance(memo, TransformMemo):
+        memo = memo if isinstance(memo, TransformMemo) else TransformMemo(None)
+        cfg = _MergedConfig({**cfg, "$$memo": _MemoState(memo, node)})
     if isinstance(node, list):
         return [transform(child, cfg) for child in node]
+    state = cfg.get("$$memo")
+    if state is not None and node.children:
+        return _transform_memoized(node, cfg, state)
+    return _transform_node(node, cfg)
+
+
+class _MemoState:
+    def __init__(self, memo: TransformMemo, root: Node | List[Node]):
+        self.memo = memo
+        self.root = root
+        self._pure: Set[int] | None = None
+
+    def is_pure(self, node: Node, config: Dict[str, Any]) -> bool:
+        # Purity is only needed on a miss, so it is found lazily for the whole tree.
+        if self._pure is None:
+            self._pure = set()
+            for root in self.root if isinstance(self.root, list) else [self.root]:
+                _find_pure(root, config, self._pure)
+        return id(node) in self._pure
+
+
+def _transform_memoized(node: Node, cfg: Dict[str, Any], state: _MemoState):
+    memo = state.memo
+    entries = memo._entries
+    key = node.digest
+    stats = _current_stats.get()
+    if key in entries:
+        # An entry for the same structure means this subtree is pure as well.
+        memo.hits += 1
+        if stats is not None:
+            stats.add_lookup("transform_memo", True)
+        entries.move_to_end(key)
+        return entries[key]
+    if not state.is_pure(node, cfg):
+        return _transform_node(node, cfg)
+    memo.misses += 1
+    if stats is not None:
+        stats.add_lookup("transform_memo", False)
+    result = entries[key] = _transform_node(node, cfg)
+    if memo.max_entries is not None and len(entries) > memo.max_entries:
+        entries.popitem(last=False)
+    return result
+
+
+def _find_pure(node: Node, config: Dict[str, Any], pure: Set[int]) -> bool:
+    """Add the ids of pure nodes under `node` to `pure`; return whether `node` is."""
+    result = not _is_dynamic_value(node.attributes)
+    for child in node.children:
+        if isinstance(child, Node):
+            result = _find_pure(child, config, pure) and result
+        else:
+            result = result and not _is_dynamic_value(child)
+    for slot in node.slots.values():
+        result = _find_pure(slot, config, pure) and result
+    if result:
+        schema = _find_schema(node, config)
+        if schema and callable(schema.get("transform")) and not schema.get("pure"):
+            result = False
+    if result:
+        pure.add(id(node))
+    return result
+
+
+def _is_dynamic_value(value: Any) -> bool:
+    if isinstance(value, (Variable, Function)):
+        return True
+    if isinstance(value, (list, tuple)):
+        return any(_is_dynamic_value(item) for item in value)
+    if isinstance(value, dict):
+        return any(_is_dynamic_value(item) for item in value.values())
+    return False
+
+
+def _transform_node(node: Node, cfg: Dict[str, Any]):
+    if type(node) is StaticNode:
+        return Markup(node.html)
     if node.type == "document":
         schema = _find_schema(node, cfg)
         if schema and schema.get("render"):
@@ -58,7 +184,7 @@ def transform(node: Node | List[Node], config: Dict[str, Any] | None = None):
 
     schema = _find_schema(node, cfg)
     if schema and callable(schema.get("transform")):
-        return schema["transform"](node, cfg)
+        return _call_transform(schema["transform"], node, cfg)
 
     if node.type == "list":
         name = "ol" if node.attributes.get("ordered") else "ul"
@@ -100,6 +226,23 @@ def transform(node: Node | List[Node], config: Dict[str, Any] | None = None):
     return ""
 
 
+def _call_transform(transform, node: Node, config: Dict[str, Any]):
+    """Call a schema `transform`, timing it for `Stats` and tracing when enabled."""
+    stats = _current_stats.get()
+    tracer = _current_tracer.get()
+    if stats is None and tracer is None:
+        return transform(node, config)
+    start = time.perf_counter()
+    if tracer is None:
+        result = transform(node, config)
+    else:
+        with tag_span(tracer, node, config):
+            result = transform(node, config)
+    if stats is not None:
+        stats.add_time(f"tag:{node.tag or node.type}", time.perf_counter() - start)
+    return result
+
+
 def _transform_children(node: Node, config: Dict[str, Any]) -> List[Any]:
     return [transform(child, config) for child in node.children]
 
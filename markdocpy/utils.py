@@ -1,5 +1,13 @@
 from __future__ import annotations
 
+import dataclasses
+import hashlib
+import types
+from typing import Any, List, Set
+
+# Global values a function reads that are fingerprinted along with its code.
+_DATA = (type(None), bool, int, float, str, bytes, list, tuple, dict, set, frozenset)
+
 
 def find_tag_end(content: str, start: int = 0) -> int | None:
     state = "normal"
@@ -22,3 +30,122 @@ def find_tag_end(content: str, start: int = 0) -> int | None:
                 return pos
         pos += 1
     return None
+
+
+def diff_lines(old: str, new: str) -> tuple[int, int, int]:
+    """Return ``(start, old_end, new_end)`` for the lines that differ between two sources.
+
+    Lines ``start:old_end`` of ``old`` were replaced by lines ``start:new_end`` of ``new``;
+    line numbers are 0-based and match the ``lines`` recorded on parsed nodes.
+    """
+    old_lines = old.splitlines()
+    new_lines = new.splitlines()
+    limit = min(len(old_lines), len(new_lines))
+    start = 0
+    while start < limit and old_lines[start] == new_lines[start]:
+        start += 1
+    old_end = len(old_lines)
+    new_end = len(new_lines)
+    while old_end > start and new_end > start and old_lines[old_end - 1] == new_lines[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+    return start, old_end, new_end
+
+
+def fingerprint(value: Any) -> str:
+    """Return a stable hash of a config or variable value.
+
+    Equal values hash equally across processes: dict and set items are sorted,
+    classes and builtins are identified by their qualified names, and dataclasses
+    and other objects by their type and fields. Python functions outside markdocpy
+    also contribute their code, defaults, closures and the functions and data
+    globals they read, so editing a function changes the fingerprint.
+    """
+    return hashlib.blake2b(_canonical(value, set()).encode(), digest_size=20).hexdigest()
+
+
+def _canonical(value: Any, active: Set[int]) -> str:
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return f"{type(value).__name__}:{value!r}"
+    from .ast.variable import MISSING
+
+    if value is MISSING:
+        return "<missing>"
+    if isinstance(value, types.MethodType):
+        return f"<method {_canonical(value.__func__, active)}>"
+    if isinstance(value, types.FunctionType) and not _is_markdocpy(value):
+        return _function(value, active)
+    if isinstance(value, type) or callable(value) and hasattr(value, "__qualname__"):
+        return f"<{getattr(value, '__module__', '')}.{value.__qualname__}>"
+    if id(value) in active:
+        return "<cycle>"
+    active.add(id(value))
+    try:
+        if isinstance(value, dict):
+            items = sorted(
+                f"{_canonical(key, active)}={_canonical(item, active)}"
+                for key, item in value.items()
+            )
+            return "{" + ",".join(items) + "}"
+        if isinstance(value, (list, tuple)):
+            items = [_canonical(item, active) for item in value]
+            return f"{type(value).__name__}[" + ",".join(items) + "]"
+        if isinstance(value, (set, frozenset)):
+            return "set{" + ",".join(sorted(_canonical(item, active) for item in value)) + "}"
+        name = f"{type(value).__module__}.{type(value).__qualname__}"
+        if dataclasses.is_dataclass(value):
+            fields = {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+            return f"{name}({_canonical(fields, active)})"
+        if hasattr(value, "__dict__"):
+            return f"{name}({_canonical(vars(value), active)})"
+        return f"{name}:{value!r}"
+    finally:
+        active.discard(id(value))
+
+
+def _is_markdocpy(function: types.FunctionType) -> bool:
+    # Covered by the version that callers fingerprint along with the config.
+    return (function.__module__ or "").startswith("markdocpy")
+
+
+def _function(function: types.FunctionType, active: Set[int]) -> str:
+    name = f"<{function.__module__ or ''}.{function.__qualname__}"
+    if id(function) in active:
+        return name + ">"
+    active.add(id(function))
+    try:
+        code = function.__code__
+        parts = [_code(code, active)]
+        parts.append(_canonical([function.__defaults__, function.__kwdefaults__], active))
+        cells = []
+        for cell in function.__closure__ or ():
+            try:
+                cells.append(cell.cell_contents)
+            except ValueError:
+                cells.append(None)
+        parts.append(_canonical(cells, active))
+        names = set()
+        _global_names(code, names)
+        for global_name in sorted(names):
+            value = function.__globals__.get(global_name)
+            if isinstance(value, types.FunctionType) or type(value) in _DATA and value is not None:
+                parts.append(f"{global_name}={_canonical(value, active)}")
+        digest = hashlib.blake2b("|".join(parts).encode(), digest_size=12).hexdigest()
+        return f"{name}:{digest}>"
+    finally:
+        active.discard(id(function))
+
+
+def _code(code: types.CodeType, active: Set[int]) -> str:
+    consts: List[str] = [
+        _code(const, active) if isinstance(const, types.CodeType) else _canonical(const, active)
+        for const in code.co_consts
+    ]
+    return f"{code.co_code.hex()}:{','.join(consts)}:{','.join(code.co_names)}"
+
+
+def _global_names(code: types.CodeType, names: Set[str]) -> None:
+    names.update(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _global_names(const, names)
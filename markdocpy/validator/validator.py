@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from typing import Any, Dict, List
 
 from ..ast.node import Node
@@ -19,6 +20,129 @@ def validate_tree(
     return errors
 
 
+@dataclass
+class NodeErrors:
+    """Validation errors for one node, with one record per child and slot."""
+
+    type: str
+    tag: str | None = None
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    children: List["NodeErrors"] = field(default_factory=list)
+    subtree: List[Dict[str, Any]] = field(default_factory=list)
+    """Errors of this node and all of its descendants, in `validate_tree` order."""
+
+
+def validate_nodes(node: Node | List[Node], config: Dict[str, Any] | None = None) -> NodeErrors:
+    """Validate nodes and keep the errors per node, for use with `validate_incremental`."""
+    cfg = merge_config(config)
+    return _validate_record(node, cfg, [], None, None)
+
+
+def validate_incremental(
+    node: Node | List[Node],
+    previous_node: Node | List[Node],
+    previous: NodeErrors,
+    config: Dict[str, Any] | None = None,
+) -> NodeErrors:
+    """Re-validate only the parts of an AST that an edit changed.
+
+    `node` is the AST of the edited source, `previous_node` the AST before the edit
+    and `previous` the result of validating it, from `validate_nodes` or an earlier
+    call. Children are paired with the previous ones by digest (see `Node.digest`)
+    from both ends; subtrees with an unchanged digest keep their records, and the
+    others and their ancestors are validated again. An edit that opens or closes a
+    fence or a block tag reshapes the nodes after it, which then no longer pair up
+    and are validated in full. Computing the digests of `node` walks it once, which
+    costs far less than validating it. The config must be the one `previous` was
+    computed with, and `validate` callbacks may only look at the types and tags of
+    the ancestors they are given.
+    """
+    cfg = merge_config(config)
+    return _validate_record(node, cfg, [], previous_node, previous)
+
+
+def _validate_record(
+    node: Node | List[Node],
+    config: Dict[str, Any],
+    parents: List[Node],
+    previous_node: Node | List[Node] | None,
+    previous: NodeErrors | None,
+) -> NodeErrors:
+    if isinstance(node, list):
+        record = NodeErrors("")
+        children = node
+    else:
+        updated = {**config, "validation": {**config.get("validation", {}), "parents": parents}}
+        record = NodeErrors(node.type, node.tag)
+        _validate_node(node, updated, record.errors)
+        children = [*node.children, *node.slots.values()]
+        parents.append(node)
+
+    previous_children: List[Node] = []
+    if previous is not None and _same_kind(node, previous_node):
+        if isinstance(previous_node, list):
+            previous_children = previous_node
+        else:
+            previous_children = [*previous_node.children, *previous_node.slots.values()]
+
+    matched = _match_children(children, previous_children)
+    record.subtree.extend(record.errors)
+    for index, child in enumerate(children):
+        child_previous = matched.get(index)
+        if child_previous is None:
+            child_record = _validate_record(child, config, parents, None, None)
+        elif _same_digest(child, previous_children[child_previous]):
+            child_record = previous.children[child_previous]
+        else:
+            child_record = _validate_record(
+                child,
+                config,
+                parents,
+                previous_children[child_previous],
+                previous.children[child_previous],
+            )
+        record.children.append(child_record)
+        record.subtree.extend(child_record.subtree)
+    if not isinstance(node, list):
+        parents.pop()
+    return record
+
+
+def _match_children(children: List[Node], previous: List[Node]) -> Dict[int, int]:
+    """Pair children with the indexes of previous children.
+
+    Children with the same digests as the previous ones are paired counting from the
+    start and from the end. The remaining children are paired one to one only when
+    the edit did not change how many there are.
+    """
+    limit = min(len(children), len(previous))
+    before = 0
+    while before < limit and _same_digest(children[before], previous[before]):
+        before += 1
+    after = 0
+    while after < limit - before and _same_digest(children[-1 - after], previous[-1 - after]):
+        after += 1
+    matched = {index: index for index in range(before)}
+    for offset in range(1, after + 1):
+        matched[len(children) - offset] = len(previous) - offset
+    if len(children) == len(previous):
+        for index in range(before, len(children) - after):
+            matched[index] = index
+    return matched
+
+
+def _same_kind(node: Node | List[Node], previous: Node | List[Node] | None) -> bool:
+    if isinstance(node, list) or isinstance(previous, list):
+        return isinstance(node, list) and isinstance(previous, list)
+    return previous is not None and (previous.type, previous.tag) == (node.type, node.tag)
+
+
+def _same_digest(node: Node, previous: Node) -> bool:
+    if not isinstance(node, Node) or not isinstance(previous, Node):
+        return False
+    return node.digest == previous.digest
+
+
 def _validate_node(node: Node | List[Node], config: Dict[str, Any], errors: List[Dict[str, Any]]):
     """Recursively validate nodes and collect errors."""
     if isinstance(node, list):
@@ -34,7 +158,7 @@ def _validate_node(node: Node | List[Node], config: Dict[str, Any], errors: List
         _validate_slots(node, schema, errors)
         _validate_children(node, schema, errors)
         if callable(schema.get("validate")):
-            errors.extend(schema["validate"](node, config))
+            errors.extend(schema["validate"](node, _callback_config(config)))
 
     if node.type == "function":
         errors.extend(_validate_function(node, config))
@@ -42,6 +166,18 @@ def _validate_node(node: Node | List[Node], config: Dict[str, Any], errors: List
         errors.extend(_validate_variable(node, config))
 
 
+def _callback_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """`config` with a copy of the ancestors list, for user `validate` callbacks.
+
+    The walk shares one ancestors list between all nodes, so a callback that keeps
+    ``config["validation"]["parents"]`` would otherwise see it change under it.
+    """
+    validation = config.get("validation", {})
+    if "parents" not in validation:
+        return config
+    return {**config, "validation": {**validation, "parents": list(validation["parents"])}}
+
+
 def _find_schema(node: Node, config: Dict[str, Any]) -> Dict[str, Any] | None:
     if node.type == "tag":
         return config.get("tags", {}).get(node.tag)
@@ -86,7 +222,11 @@ def _validate_attributes(
             continue
         if isinstance(expected, type) and hasattr(expected, "validate"):
             instance = expected()
-            errors.extend(instance.validate(node.attributes.get(key), config, key))
+            if expected not in (ClassType, IdType):
+                instance_config = _callback_config(config)
+            else:
+                instance_config = config
+            errors.extend(instance.validate(node.attributes.get(key), instance_config, key))
             continue
         if config.get("validation", {}).get("validateFunctions") and _is_function(
             node.attributes.get(key)
@@ -119,7 +259,9 @@ def _validate_attributes(
             )
 
         if callable(definition.get("validate")):
-            errors.extend(definition["validate"](node.attributes.get(key), config, key))
+            errors.extend(
+                definition["validate"](node.attributes.get(key), _callback_config(config), key)
+            )
 
 
 def _validate_slots(node: Node, schema: Dict[str, Any], errors: List[Dict[str, Any]]):
@@ -352,13 +494,22 @@ def _check_matches(value: Any, matches: Any) -> bool:
     return True
 
 
-def _walk_with_parents(node: Node | List[Node], parents: List[Node] | None = None):
-    if parents is None:
-        parents = []
-    if isinstance(node, list):
-        for child in node:
-            yield from _walk_with_parents(child, parents)
-        return
-    yield node, parents
-    for child in [*node.children, *node.slots.values()]:
-        yield from _walk_with_parents(child, [*parents, node])
+def _walk_with_parents(node: Node | List[Node]):
+    """Yield every node in document order with the list of its ancestors.
+
+    The list is shared and updated in place as the walk goes on, so each node costs
+    the same however deep it is nested; it is only valid until the next node. User
+    `validate` callbacks get a copy (see `_callback_config`).
+    """
+    parents: List[Node] = []
+    stack = [(child, 0) for child in reversed(node)] if isinstance(node, list) else [(node, 0)]
+    while stack:
+        current, depth = stack.pop()
+        if isinstance(current, list):
+            stack.extend((child, depth) for child in reversed(current))
+            continue
+        del parents[depth:]
+        yield current, parents
+        parents.append(current)
+        children = [*current.children, *current.slots.values()]
+        stack.extend((child, depth + 1) for child in reversed(children))
@@ -0,0 +1,106 @@
+import dataclasses
+import json
+
+import markdocpy as Markdoc
+from benchmarks.__main__ import main
+from benchmarks.compare import compare
+from benchmarks.corpus import Shape, generate
+from benchmarks.replay import load_cases, mismatches, replay
+from benchmarks.run import PHASES, run_case
+
+TINY = Shape(documents=2, sections=3, paragraphs=2, tag_density=1.0, partial_fanout=3)
+
+
+def test_corpus_is_deterministic_and_valid():
+    corpus = generate(TINY)
+    assert generate(TINY).documents == corpus.documents
+    assert generate(Shape(**{**TINY.to_dict(), "seed": 1})).documents != corpus.documents
+    config = corpus.config(Markdoc.parse)
+    for source in corpus.documents.values():
+        ast = Markdoc.parse(source)
+        assert not [e for e in Markdoc.validate(ast, config) if e["level"] == "error"]
+        html = Markdoc.renderers.html(Markdoc.transform(ast, config))
+        assert "<aside" in html and "<table>" in html and "Partial" in html
+        assert "{%" not in html
+
+
+def test_shape_controls_size():
+    small = generate(TINY)
+    wider = generate(Shape(**{**TINY.to_dict(), "sections": 6, "table_rows": 10}))
+    assert wider.size > 2 * small.size
+    assert len(generate(Shape(documents=3, partials=5)).partials) == 5
+
+
+def test_run_case_times_every_phase():
+    result = run_case(TINY, repeat=2)
+    assert set(result["phases"]) == set(PHASES)
+    assert all(len(timing["runs"]) == 2 for timing in result["phases"].values())
+    assert result["documents"] == 2
+
+
+def _results(**medians):
+    return {"cases": {"small": {"phases": {p: {"median": m} for p, m in medians.items()}}}}
+
+
+def test_compare_applies_thresholds():
+    rows = compare(
+        _results(parse=0.010, render=0.010, tokenize=0.0001),
+        _results(parse=0.012, render=0.0105, tokenize=0.0003),
+        thresholds={"render": 0.01},
+    )
+    status = {row.phase: row.status for row in rows}
+    assert status == {"parse": "regression", "render": "regression", "tokenize": "ok"}
+    rows = compare(_results(parse=0.010), _results(parse=0.008))
+    assert rows[0].status == "improvement"
+
+
+def test_command_line(tmp_path, capsys):
+    output = tmp_path / "results.json"
+    argv = ["run", "--preset", "small", "--set", "documents=1", "--repeat", "1", "-o", str(output)]
+    assert main(argv) == 0
+    results = json.loads(output.read_text())
+    assert results["cases"]["small"]["shape"]["documents"] == 1
+    assert main(["compare", str(output), str(output)]) == 0
+    slower = json.loads(output.read_text())
+    slower["cases"]["small"]["phases"]["parse"]["median"] += 1.0
+    (tmp_path / "slower.json").write_text(json.dumps(slower))
+    compare_argv = ["compare", str(output), str(tmp_path / "slower.json")]
+    assert main(compare_argv) == 1
+    assert main([*compare_argv, "--threshold", "parse=1000"]) == 0
+
+
+def test_memory_mode(tmp_path, capsys):
+    result = run_case(TINY, repeat=1, memory=True)
+    memory = result["memory"]
+    assert set(memory["phases"]) == set(PHASES)
+    assert memory["phases"]["parse"]["objects"]["Node"] > 0
+    baseline = {"cases": {"tiny": result}}
+    current = json.loads(json.dumps(baseline))
+    current["cases"]["tiny"]["memory"]["phases"]["parse"]["peak"] *= 2
+    rows = {row.phase: row for row in compare(baseline, current, min_seconds=1)}
+    assert rows["memory:parse"].status == "regression"
+    assert rows["memory:render"].status == "ok"
+    output = tmp_path / "results.json"
+    argv = ["run", "--preset", "small", "--set", "documents=1", "--repeat", "1", "--memory"]
+    assert main([*argv, "-o", str(output)]) == 0
+    assert "peak memory" in capsys.readouterr().out
+    assert "memory" in json.loads(output.read_text())["cases"]["small"]
+
+
+def test_replay_corpus(tmp_path, capsys):
+    cases = load_cases()
+    assert {"spec/annotations", "fixtures/partial"} <= {case.name for case in cases}
+    assert mismatches(cases) == []
+    result = replay(cases, repeat=2)["cases"]["replay"]
+    assert result["documents"] == len(cases) and result["mismatches"] == []
+    assert result["documents_per_second"] > 0 and result["mb_per_second"] > 0
+    assert all(len(timing["runs"]) == 2 for timing in result["phases"].values())
+    broken = dataclasses.replace(cases[0], expected="<p>changed</p>")
+    assert mismatches([broken, *cases[1:]]) == [cases[0].name]
+
+    output = tmp_path / "baseline.json"
+    assert main(["replay", "--repeat", "2", "-o", str(output)]) == 0
+    assert "documents/s" in capsys.readouterr().out
+    argv = ["replay", "--repeat", "2", "--baseline", str(output), "--threshold", "1000"]
+    assert main(argv) == 0
+    assert "total" in capsys.readouterr().out
@@ -0,0 +1,214 @@
+import os
+import time
+
+import pytest
+
+import markdocpy as Markdoc
+
+SOURCE = """# Title
+
+{% callout type="note" %}
+Hello {% $name %}
+{% /callout %}
+"""
+
+
+@pytest.fixture(params=["directory", "sqlite"])
+def make_cache(request, tmp_path):
+    caches = []
+
+    def make(max_bytes=1 << 20):
+        if request.param == "directory":
+            cache = Markdoc.DirectoryParseCache(tmp_path / "asts", max_bytes)
+        else:
+            cache = Markdoc.SQLiteParseCache(tmp_path / "asts.db", max_bytes)
+            caches.append(cache)
+        return cache
+
+    yield make
+    for cache in caches:
+        cache.close()
+
+
+def test_second_parse_hits_cache(make_cache):
+    cache = make_cache()
+    first = Markdoc.parse(SOURCE, cache=cache)
+    second = Markdoc.parse(SOURCE, cache=cache)
+    assert first == second == Markdoc.parse(SOURCE)
+    assert second is not first
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.hit_rate == 0.5
+
+
+def test_cache_is_shared_between_instances(make_cache):
+    Markdoc.parse(SOURCE, cache=make_cache())
+    other = make_cache()
+    assert Markdoc.parse(SOURCE, cache=other) == Markdoc.parse(SOURCE)
+    assert other.hits == 1
+
+
+def test_key_depends_on_content_and_options(make_cache):
+    cache = make_cache()
+    assert cache.key(SOURCE) == cache.key(SOURCE)
+    assert cache.key(SOURCE) != cache.key(SOURCE + "\n")
+    assert cache.key(SOURCE) != cache.key(SOURCE, slots=True)
+    assert cache.key(SOURCE) != cache.key(SOURCE, options={"typographer": True})
+
+
+def test_least_recently_used_entries_are_evicted(make_cache):
+    size = len(Markdoc.dumps(Markdoc.parse("Document 0\n")))
+    cache = make_cache(max_bytes=size * 3)
+    sources = [f"Document {index}\n" for index in range(5)]
+    for source in sources[:3]:
+        Markdoc.parse(source, cache=cache)
+        time.sleep(0.01)
+    Markdoc.parse(sources[0], cache=cache)
+    time.sleep(0.01)
+    for source in sources[3:]:
+        Markdoc.parse(source, cache=cache)
+        time.sleep(0.01)
+    cached = [cache.load(cache.key(source)) is not None for source in sources]
+    assert cached == [True, False, False, True, True]
+
+
+def test_parse_cache_needs_storage():
+    with pytest.raises(TypeError):
+        Markdoc.ParseCache()
+
+
+def test_corrupt_entries_are_misses(tmp_path):
+    cache = Markdoc.DirectoryParseCache(tmp_path)
+    key = cache.key(SOURCE)
+    (tmp_path / f"{key}.mdast").write_bytes(b"garbage")
+    assert Markdoc.parse(SOURCE, cache=cache) == Markdoc.parse(SOURCE)
+    assert cache.misses == 1
+    assert not any(name.startswith(".tmp-") for name in os.listdir(tmp_path))
+
+
+def test_truncated_entries_are_misses(tmp_path):
+    cache = Markdoc.DirectoryParseCache(tmp_path)
+    key = cache.key(SOURCE)
+    data = Markdoc.dumps(Markdoc.parse(SOURCE))
+    for cut in (1, len(data) // 3, len(data) // 2, len(data) - 1):
+        (tmp_path / f"{key}.mdast").write_bytes(data[:cut])
+        assert cache.load(key) is None
+    assert cache.misses == 4
+
+
+def test_overwriting_an_entry_keeps_the_size(tmp_path):
+    cache = Markdoc.DirectoryParseCache(tmp_path)
+    node = Markdoc.parse(SOURCE)
+    for _ in range(3):
+        cache.store("key", node)
+    assert cache._size == len(Markdoc.dumps(node))
+
+
+def test_sqlite_cache_keeps_the_total_size(tmp_path):
+    size = len(Markdoc.dumps(Markdoc.parse("Document 0\n")))
+    cache = Markdoc.SQLiteParseCache(tmp_path / "asts.db", size * 3)
+    node = Markdoc.parse(SOURCE)
+    for index in range(6):
+        Markdoc.parse(f"Document {index}\n", cache=cache)
+        cache.store("key", node)
+    cache.close()
+    cache = Markdoc.SQLiteParseCache(tmp_path / "asts.db", size * 3)
+    connection = cache._store._connection
+    (total,) = connection.execute("SELECT total FROM asts_size").fetchone()
+    assert total == connection.execute("SELECT SUM(size) FROM asts").fetchone()[0]
+    assert total <= size * 3
+    cache.close()
+
+
+PAGE = """# {% $page.title %}
+
+{% if $user.admin %}
+Welcome back, {% $user.name %}.
+{% else %}
+Please {% $prompt %}.
+{% /if %}
+"""
+
+
+def _render(source, variables):
+    config = {"variables": variables}
+    return Markdoc.renderers.html(Markdoc.transform(Markdoc.parse(source), config))
+
+
+def test_render_cache_keys_on_variables_read():
+    cache = Markdoc.RenderCache()
+    variables = {"page": {"title": "Home"}, "user": {"admin": True, "name": "Ada"}}
+    html = cache.render(PAGE, variables)
+    assert html == _render(PAGE, variables)
+    assert cache.render(PAGE, {**variables, "unused": 1}) == html
+    assert cache.hits == 1
+    changed = {**variables, "user": {"admin": True, "name": "Grace"}}
+    assert cache.render(PAGE, changed) == _render(PAGE, changed)
+    assert cache.misses == 2
+
+
+def test_render_cache_follows_branches():
+    cache = Markdoc.RenderCache({"variables": {"prompt": "log in"}})
+    for admin in (True, False, True, False):
+        variables = {"page": {"title": "Home"}, "user": {"admin": admin}, "prompt": "log in"}
+        assert cache.render(PAGE, variables) == _render(PAGE, variables)
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert cache.render(PAGE) == _render(PAGE, {"prompt": "log in"})
+
+
+def test_render_cache_keys_on_config():
+    variables = {"page": {"title": "Home"}}
+    plain = Markdoc.RenderCache().render("{% $page.title %}", variables)
+    upper = Markdoc.RenderCache(
+        {"functions": {"upper": lambda value: value.upper()}}
+    )
+    assert upper.fingerprint != Markdoc.RenderCache().fingerprint
+    assert upper.render("{% upper($page.title) %}", variables) != plain
+
+
+def test_render_cache_evicts_by_size():
+    cache = Markdoc.RenderCache(max_bytes=4096)
+    for index in range(50):
+        cache.render(f"Page {index} " + "text " * 50)
+    assert cache._size <= 4096
+    assert 0 < len(cache._pages) < 50
+
+
+def test_render_cache_sqlite_tier(tmp_path):
+    variables = {"page": {"title": "Home"}, "user": {"admin": False}, "prompt": "sign up"}
+    first = Markdoc.RenderCache(path=tmp_path / "pages.db")
+    html = first.render(PAGE, variables)
+    first.close()
+    second = Markdoc.RenderCache(path=tmp_path / "pages.db")
+    assert second.render(PAGE, variables) == html
+    assert (second.hits, second.misses) == (1, 0)
+    second.close()
+
+
+def _shout(suffix):
+    namespace = {}
+    exec(f"def shout(value):\n    return value.upper() + {suffix!r}\n", namespace)
+    return {"functions": {"shout": namespace["shout"]}}
+
+
+def test_render_cache_sqlite_tier_keys_on_function_code(tmp_path):
+    path = tmp_path / "pages.db"
+    first = Markdoc.RenderCache(_shout("!"), path=path)
+    assert first.render("{% shout($name) %}", {"name": "ada"}) == "<article><p>ADA!</p></article>"
+    first.close()
+    second = Markdoc.RenderCache(_shout("?"), path=path)
+    assert second.fingerprint != first.fingerprint
+    assert second.render("{% shout($name) %}", {"name": "ada"}) == "<article><p>ADA?</p></article>"
+    second.close()
+
+
+def test_fingerprint_is_canonical():
+    from markdocpy.utils import fingerprint
+
+    assert fingerprint({"a": 1, "b": [1, 2]}) == fingerprint({"b": [1, 2], "a": 1})
+    assert fingerprint({"a": 1}) != fingerprint({"a": "1"})
+    assert fingerprint(Markdoc.parse("Hi")) == fingerprint(Markdoc.parse("Hi"))
+    loop = []
+    loop.append(loop)
+    assert fingerprint(loop)
+    assert fingerprint(_shout("!")) == fingerprint(_shout("!"))
+    assert fingerprint(_shout("!")) != fingerprint(_shout("?"))
@@ -0,0 +1,219 @@
+from pathlib import Path
+
+import pytest
+
+from markdocpy import cli
+
+CONFIG = """
+config = {
+    "variables": {"site": "Docs", "year": 2024},
+    "tags": {"note": {"render": "aside"}},
+}
+"""
+
+
+@pytest.fixture
+def site(tmp_path):
+    src = tmp_path / "src"
+    (src / "guide").mkdir(parents=True)
+    (src / "index.md").write_text("# {% $site %}\n\n{% partial file=\"footer.md\" /%}\n")
+    (src / "about.md").write_text("# About\n\n{% note %}Plain{% /note %}\n")
+    (src / "guide" / "start.md").write_text("Started in {% $year %}.\n")
+    partials = tmp_path / "partials"
+    partials.mkdir()
+    (partials / "footer.md").write_text("Footer for {% $site %}\n")
+    config = tmp_path / "config.py"
+    config.write_text(CONFIG)
+    return tmp_path
+
+
+def _build(site, **kwargs):
+    return cli.build(
+        site / "src",
+        site / "out",
+        config_path=site / "config.py",
+        partials_dir=site / "partials",
+        **kwargs,
+    )
+
+
+def test_build_renders_every_document(site):
+    result = _build(site)
+    assert sorted(result.built) == ["about.md", "guide/start.md", "index.md"]
+    out = site / "out"
+    assert (out / "index.html").read_text() == (
+        "<article><h1>Docs</h1><p>Footer for Docs</p></article>"
+    )
+    assert (out / "about.html").read_text() == (
+        "<article><h1>About</h1><p><aside>Plain</aside></p></article>"
+    )
+    start = (out / "guide" / "start.html").read_text()
+    assert start == "<article><p>Started in 2024.</p></article>"
+    assert set(result.timings) >= {"scan", "parse", "render", "write", "total"}
+
+
+def test_unchanged_inputs_are_skipped(site):
+    _build(site)
+    result = _build(site)
+    assert result.built == []
+    assert len(result.skipped) == 3
+
+
+def test_partial_change_rebuilds_dependents_only(site):
+    _build(site)
+    (site / "partials" / "footer.md").write_text("New footer\n")
+    result = _build(site)
+    assert result.built == ["index.md"]
+    assert "New footer" in (site / "out" / "index.html").read_text()
+
+
+def test_variable_change_rebuilds_readers_only(site):
+    _build(site)
+    (site / "config.py").write_text(CONFIG.replace("2024", "2025"))
+    assert _build(site).built == ["guide/start.md"]
+    (site / "config.py").write_text(CONFIG.replace("aside", "section"))
+    assert len(_build(site).built) == 3
+
+
+TRANSFORM_CONFIG = """
+import markdocpy as Markdoc
+
+
+def note(node, config):
+    children = [Markdoc.transform(child, config) for child in node.children]
+    return Markdoc.Tag("aside", {"class": "plain"}, children)
+
+
+config = {"tags": {"note": {"render": "aside", "transform": note}}}
+"""
+
+
+def test_transform_code_change_rebuilds(site):
+    (site / "config.py").write_text(TRANSFORM_CONFIG)
+    _build(site)
+    assert 'class="plain"' in (site / "out" / "about.html").read_text()
+    (site / "config.py").write_text(TRANSFORM_CONFIG.replace('"plain"', '"fancy"'))
+    assert len(_build(site).built) == 3
+    assert 'class="fancy"' in (site / "out" / "about.html").read_text()
+
+
+def test_source_changes_and_removals(site):
+    _build(site)
+    (site / "src" / "about.md").write_text("# Changed\n")
+    (site / "src" / "guide" / "start.md").unlink()
+    result = _build(site)
+    assert result.built == ["about.md"]
+    assert result.removed == ["guide/start.md"]
+    assert not (site / "out" / "guide" / "start.html").exists()
+
+
+def test_parallel_build_matches_serial(site):
+    _build(site, jobs=2)
+    parallel = {path.name: path.read_text() for path in (site / "out").rglob("*.html")}
+    (site / "out" / cli.MANIFEST).unlink()
+    _build(site)
+    serial = {path.name: path.read_text() for path in (site / "out").rglob("*.html")}
+    assert parallel == serial
+
+
+def test_main_prints_summary_and_timings(site, capsys):
+    args = ["build", str(site / "src"), str(site / "out"), "--config", str(site / "config.py")]
+    assert cli.main([*args, "--partials", str(site / "partials"), "--jobs", "1"]) == 0
+    output = capsys.readouterr().out
+    assert "built 3, skipped 0, removed 0, failed 0" in output
+    assert "parse" in output and "wall" in output
+
+
+def test_main_reports_failures(site, capsys):
+    (site / "src" / "bad.md").write_bytes(b"\xff\xfe")
+    args = ["build", str(site / "src"), str(site / "out"), "--jobs", "1"]
+    assert cli.main(args) == 1
+    assert "bad.md" in capsys.readouterr().err
+
+
+def test_module_entry_point():
+    assert Path(cli.__file__).with_name("__main__.py").exists()
+
+
+def _watcher(site):
+    watcher = cli.Watcher(
+        site / "src",
+        site / "out",
+        config_path=site / "config.py",
+        partials_dir=site / "partials",
+    )
+    assert len(watcher.start().built) == 3
+    return watcher
+
+
+def test_watch_rebuilds_changed_document(site):
+    watcher = _watcher(site)
+    assert watcher.poll().built == []
+    (site / "src" / "about.md").write_text("# About us\n")
+    assert watcher.poll().built == ["about.md"]
+    assert (site / "out" / "about.html").read_text() == "<article><h1>About us</h1></article>"
+    assert _build(site).built == []
+
+
+def test_watch_rebuilds_partial_dependents(site):
+    watcher = _watcher(site)
+    (site / "partials" / "footer.md").write_text("Changed footer\n")
+    assert watcher.poll().built == ["index.md"]
+    assert "Changed footer" in (site / "out" / "index.html").read_text()
+
+
+def test_watch_tracks_new_and_removed_files(site):
+    watcher = _watcher(site)
+    (site / "src" / "new.md").write_text("{% partial file=\"footer.md\" /%}\n")
+    (site / "src" / "about.md").unlink()
+    result = watcher.poll()
+    assert result.built == ["new.md"]
+    assert result.removed == ["about.md"]
+    (site / "partials" / "footer.md").write_text("Again\n")
+    assert watcher.poll().built == ["index.md", "new.md"]
+
+
+def test_watch_reloads_config(site):
+    watcher = _watcher(site)
+    (site / "config.py").write_text(CONFIG.replace("2024", "2030"))
+    assert watcher.poll().built == ["guide/start.md"]
+    assert "2030" in (site / "out" / "guide" / "start.html").read_text()
+
+
+def test_watch_reloads_transform_code_once(site, monkeypatch):
+    (site / "config.py").write_text(TRANSFORM_CONFIG)
+    watcher = _watcher(site)
+    loads = []
+    load_config = cli.load_config
+    monkeypatch.setattr(cli, "load_config", lambda *args: loads.append(args) or load_config(*args))
+    (site / "config.py").write_text(TRANSFORM_CONFIG.replace('"plain"', '"fancy"'))
+    assert len(watcher.poll().built) == 3
+    assert len(loads) == 1
+    assert 'class="fancy"' in (site / "out" / "about.html").read_text()
+
+
+def _remove_after_scan(watcher, path):
+    scan = watcher._scan
+
+    def racing_scan():
+        stamps = scan()
+        path.unlink()
+        return stamps
+
+    watcher._scan = racing_scan
+
+
+def test_watch_handles_source_removed_after_scan(site):
+    watcher = _watcher(site)
+    (site / "src" / "about.md").write_text("# Gone soon\n")
+    _remove_after_scan(watcher, site / "src" / "about.md")
+    assert watcher.poll().removed == ["about.md"]
+    assert not (site / "out" / "about.html").exists()
+
+
+def test_watch_handles_partial_removed_after_scan(site):
+    watcher = _watcher(site)
+    (site / "partials" / "footer.md").write_text("Gone soon\n")
+    _remove_after_scan(watcher, site / "partials" / "footer.md")
+    watcher.poll()
+    assert "Gone soon" not in (site / "out" / "index.html").read_text()
@@ -0,0 +1,42 @@
+import json
+from pathlib import Path
+
+import markdocpy as Markdoc
+from markdocpy.ast.tag import Markup
+from markdocpy.renderer.codegen import compile_renderer
+from tests.fixtures.utils import fixture_configs
+from tests.test_spec_parity import spec_configs
+
+TESTS_DIR = Path(__file__).parent
+
+
+def _corpus():
+    for directory, configs in (("spec", spec_configs()), ("fixtures", fixture_configs())):
+        for entry in json.loads((TESTS_DIR / directory / "manifest.json").read_text()):
+            source = (TESTS_DIR / directory / f"{entry['name']}.md").read_text()
+            yield entry["name"], source, configs.get(entry.get("config")) or {}
+
+
+def test_generated_renderer_matches_html_renderer_on_corpus():
+    for name, source, config in _corpus():
+        content = Markdoc.transform(Markdoc.parse(source), config)
+        assert compile_renderer(config)(content) == Markdoc.renderers.html(content), name
+
+
+def test_generated_renderer_matches_on_edge_cases():
+    render = compile_renderer({"tags": {"note": {"render": "note", "attributes": {"kind": {}}}}})
+    content = [
+        Markdoc.Tag("note", {"kind": "<x>", "Data-Flag": True, "hidden": False, "n": None}),
+        Markdoc.Tag("custom", {"ID": 3}, ["a", 1, 2.5, True, None, ["nested", Markup("<b>")]]),
+        Markdoc.Tag(None, {}, ["bare & text"]),
+        Markdoc.Tag("br", {}, ["ignored"]),
+        Markdoc.Tag("p", {}, ("tuple",)),
+        "x" * 3,
+        object(),
+    ]
+    assert render(content) == Markdoc.renderers.html(content)
+
+
+def test_renderers_are_cached_per_plan():
+    assert compile_renderer() is compile_renderer({"variables": {"a": 1}})
+    assert compile_renderer() is not compile_renderer({"tags": {"note": {"render": "note"}}})
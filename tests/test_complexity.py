@@ -0,0 +1,122 @@
+"""Check that every phase scales close to linearly on pathological inputs.
+
+Each shape is built at doubling sizes and the time of every phase is fitted on a
+log-log scale. O(n log n) fits a slope of about 1.1 over these sizes and O(n^2) a
+slope of 2, so a slope above `MAX_SLOPE` means a superlinear path crept in.
+
+The checks take several seconds of wall-clock timing and are sensitive to a busy
+machine, so they only run on request, as `make test-complexity` and CI do:
+``MARKDOCPY_COMPLEXITY=1 python -m pytest tests/test_complexity.py``.
+"""
+
+import gc
+import math
+import os
+import time
+
+import pytest
+
+import markdocpy as Markdoc
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("MARKDOCPY_COMPLEXITY"),
+    reason="timing-based; set MARKDOCPY_COMPLEXITY=1 to run",
+)
+
+MAX_SLOPE = 1.4
+SIZES = (300, 600, 1200, 2400)
+
+SHAPES = {
+    "unterminated-tags": lambda n: "text {% " * n,
+    "unterminated-tag-lines": lambda n: "\n".join("a {% b" for _ in range(n)),
+    "deep-nesting": lambda n: "".join(f"{{% tag{i % 3} %}}\n" for i in range(n // 2))
+    + "- item\n" * n
+    + "".join(f"{{% /tag{i % 3} %}}\n" for i in reversed(range(n // 2))),
+    "softbreaks": lambda n: "word\n" * n,
+    "attribute-list": lambda n: "{% tag " + " ".join(f"a{i}={i}" for i in range(n)) + " /%}",
+    "annotations": lambda n: "\n".join(f"item {i} {{% #id{i} .class{i % 7} %}}" for i in range(n)),
+    "heading-annotations": lambda n: "# Title " + " ".join(f"{{% .c{i} %}}" for i in range(n)),
+    "interpolations": lambda n: " ".join(f"{{% $items[{i % 5}].name %}}" for i in range(n)),
+}
+
+# Transform and render recurse once per level, so nesting deeper than the recursion
+# limit allows cannot be timed for them.
+PHASES = {"deep-nesting": ("parse", "validate")}
+CONFIG = {"variables": {"items": [{"name": str(i)} for i in range(5)]}}
+
+
+def _seconds(function) -> float:
+    """Best time per call, looping calls until each sample takes a few milliseconds.
+
+    The garbage collector is paused so its full collections, whose cost grows with
+    every object alive, do not add their own superlinear term.
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        return _best(function)
+    finally:
+        gc.enable()
+
+
+def _best(function) -> float:
+    function()
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= 0.003:
+            break
+        loops *= 4
+    best = elapsed
+    for _ in range(2):
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        best = min(best, time.perf_counter() - start)
+    return best / loops
+
+
+def _slope(sizes, seconds) -> float:
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(value, 1e-9)) for value in seconds]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    return covariance / sum((x - mean_x) ** 2 for x in xs)
+
+
+def _phases(shape: str, size: int):
+    source = SHAPES[shape](size)
+    ast = Markdoc.parse(source)
+    phases = {
+        "parse": lambda: Markdoc.parse(source),
+        "validate": lambda: Markdoc.validate(ast, CONFIG),
+        "transform": lambda: Markdoc.transform(ast, CONFIG),
+        "render": lambda: Markdoc.renderers.html(Markdoc.transform(ast, CONFIG)),
+    }
+    if shape in PHASES:
+        return {phase: phases[phase] for phase in PHASES[shape]}
+    tree = Markdoc.transform(ast, CONFIG)
+    phases["render"] = lambda: Markdoc.renderers.html(tree)
+    return phases
+
+
+@pytest.mark.parametrize("shape", sorted(SHAPES))
+def test_phases_scale_linearly(shape):
+    timings = {}
+    for size in SIZES:
+        for phase, function in _phases(shape, size).items():
+            timings.setdefault(phase, []).append(_seconds(function))
+    slow = [phase for phase, seconds in timings.items() if _slope(SIZES, seconds) > MAX_SLOPE]
+    # Measure again before failing, so one noisy sample does not fail the run.
+    for phase in slow:
+        timings[phase] = [_seconds(_phases(shape, size)[phase]) for size in SIZES]
+    details = {
+        phase: f"slope {_slope(SIZES, timings[phase]):.2f} "
+        + ", ".join(f"{seconds * 1000:.2f}ms" for seconds in timings[phase])
+        for phase in slow
+        if _slope(SIZES, timings[phase]) > MAX_SLOPE
+    }
+    assert not details, f"superlinear growth for {shape}: {details}"
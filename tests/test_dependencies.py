@@ -0,0 +1,71 @@
+import markdocpy as Markdoc
+from markdocpy.dependencies import _partial_uses
+
+SOURCE = """# {% $page.title %}
+
+{% if equals($user.role, "admin") %}
+{% partial file="admin.md" variables={name: $user.name} /%}
+{% /if %}
+
+{% callout items=[1, {a: $flags[0]}] %}
+{% upper($greeting) %}
+{% /callout %}
+"""
+
+PARTIALS = {
+    "admin.md": Markdoc.parse(
+        'Hello {% $name %} from {% $site %}\n\n{% partial file="footer.md" /%}'
+    ),
+    "footer.md": Markdoc.parse("Footer {% $year %} {% $name %}"),
+    "loop.md": Markdoc.parse('{% partial file="loop.md" /%}{% $depth %}'),
+}
+
+
+def test_dependencies_cover_document_and_partials():
+    result = Markdoc.dependencies(Markdoc.parse(SOURCE), {"partials": PARTIALS})
+    assert result.variables == {
+        ("page", "title"),
+        ("user", "role"),
+        ("user", "name"),
+        ("flags", 0),
+        ("greeting",),
+        ("site",),
+        ("year",),
+    }
+    assert result.functions == {"equals", "upper"}
+    assert result.partials == {"admin.md", "footer.md"}
+
+
+def test_partial_cycles_terminate():
+    ast = Markdoc.parse('{% partial file="loop.md" /%}')
+    result = Markdoc.dependencies(ast, {"partials": PARTIALS})
+    assert result.partials == {"loop.md"}
+    assert result.variables == {("depth",)}
+
+
+def test_dynamic_partial_files_reach_every_partial():
+    ast = Markdoc.parse("{% partial file=$which /%}")
+    result = Markdoc.dependencies(ast, {"partials": PARTIALS})
+    assert result.partials == set(PARTIALS)
+    assert ("which",) in result.variables and ("year",) in result.variables
+
+
+def test_partial_uses_are_cached_by_digest():
+    _partial_uses.clear()
+    ast = Markdoc.parse('{% partial file="footer.md" /%}')
+    Markdoc.dependencies(ast, {"partials": PARTIALS})
+    copy = Markdoc.parse("Footer {% $year %} {% $name %}")
+    Markdoc.dependencies(ast, {"partials": {"footer.md": copy}})
+    assert len(_partial_uses) == 1
+
+
+def test_rendering_does_not_change_partials():
+    ast = Markdoc.parse(SOURCE)
+    config = {
+        "partials": PARTIALS,
+        "variables": {"user": {"role": "admin", "name": "Ada"}},
+        "functions": {"upper": lambda value: str(value).upper()},
+    }
+    before = Markdoc.dependencies(ast, config)
+    Markdoc.transform(Markdoc.parse(SOURCE), config)
+    assert Markdoc.dependencies(ast, config) == before
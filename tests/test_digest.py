@@ -0,0 +1,111 @@
+import copy
+import pickle
+
+import markdocpy as Markdoc
+from markdocpy.ast.node import StaticNode
+
+SOURCE = """# Title {% #intro .lead %}
+
+Hello {% $user.name %} and *friends*.
+
+{% callout type="note" items=[1, {a: $b}] %}
+- one
+- two
+{% /callout %}
+"""
+
+
+def test_equal_trees_have_equal_digests():
+    first, second = Markdoc.parse(SOURCE), Markdoc.parse(SOURCE)
+    assert first.digest == second.digest
+    assert hash(first) == hash(second)
+    assert Markdoc.parse(SOURCE + "\nMore").digest != first.digest
+    assert len({first, second, Markdoc.parse("Other")}) == 2
+
+
+def test_digest_ignores_lines_and_attribute_order():
+    ast = Markdoc.parse(SOURCE)
+    shifted = Markdoc.parse("\n\n" + SOURCE)
+    assert shifted.children[0].lines != ast.children[0].lines
+    assert shifted.digest == ast.digest
+    a = Markdoc.Node("tag", attributes={"x": 1, "y": 2}, tag="t")
+    b = Markdoc.Node("tag", attributes={"y": 2, "x": 1}, tag="t")
+    assert a == b and a.digest == b.digest
+
+
+def test_same_subtrees_share_digests():
+    ast = Markdoc.parse("- same\n- same\n- other\n")
+    items = ast.children[0].children
+    assert items[0].digest == items[1].digest != items[2].digest
+
+
+def test_assignment_invalidates_ancestors():
+    ast = Markdoc.parse(SOURCE)
+    before = ast.digest
+    text = ast.children[1].children[0]
+    text.content = "Bye "
+    assert ast.digest != before
+    text.content = "Hello "
+    assert ast.digest == before
+
+
+def test_changes_only_invalidate_ancestors():
+    ast, other = Markdoc.parse(SOURCE), Markdoc.parse(SOURCE)
+    ast.digest, other.digest
+    heading, paragraph = ast.children[0], ast.children[1]
+    paragraph.children[0].content = "Bye "
+    assert "_digest" not in ast.__dict__ and "_digest" not in paragraph.__dict__
+    assert "_digest" in heading.__dict__ and "_digest" in other.__dict__
+    assert ast.digest != other.digest
+
+
+def test_shared_nodes_invalidate_every_parent():
+    shared = Markdoc.Node("text", content="x")
+    first = Markdoc.Node("paragraph", [shared])
+    second = Markdoc.Node("paragraph", [Markdoc.Node("em"), shared])
+    before = first.digest, second.digest
+    shared.content = "y"
+    assert first.digest != before[0] and second.digest != before[1]
+
+
+def test_resolve_changes_digest():
+    ast = Markdoc.parse(SOURCE)
+    before = ast.digest
+    ast.resolve({"variables": {"user": {"name": "Ada"}}})
+    assert ast.digest != before
+
+
+def test_invalidate_after_in_place_changes():
+    ast = Markdoc.parse(SOURCE)
+    before = ast.digest
+    ast.children[1].children.append(Markdoc.Node("text", content="!"))
+    ast.invalidate()
+    assert ast.digest != before
+    ast.children[1].children.pop()
+    ast.children[1].invalidate()
+    assert ast.digest == before
+
+
+def test_static_nodes_hash_differently():
+    node = Markdoc.Node("paragraph")
+    static = StaticNode("paragraph", html="<p></p>")
+    assert static.digest != node.digest
+    assert hash(static) == hash(StaticNode("paragraph", html="<p></p>"))
+    assert len({static, StaticNode("paragraph", html="<p>x</p>"), node}) == 3
+
+
+def test_digested_trees_pickle_and_copy():
+    ast = Markdoc.parse(SOURCE)
+    before = ast.digest
+    assert pickle.loads(pickle.dumps(ast)).digest == before
+    clone = copy.deepcopy(ast)
+    clone.children[1].children[0].content = "Bye "
+    assert clone != ast
+    assert clone.digest != before
+    assert ast.digest == before and "_digest" in ast.__dict__
+
+
+def test_digest_tells_value_types_apart():
+    ints = Markdoc.Node("tag", attributes={"a": 1}, tag="t")
+    floats = Markdoc.Node("tag", attributes={"a": 1.0}, tag="t")
+    assert ints.digest != floats.digest
@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import markdocpy as Markdoc
+
+ROOT = Path(__file__).resolve().parent.parent
+# Cold `import markdocpy`, in milliseconds; override for slow machines.
+BUDGET_MS = float(os.environ.get("MARKDOCPY_IMPORT_BUDGET_MS", "100"))
+LAZY_MODULES = ("markdown_it", "sqlite3", "tracemalloc", "markdocpy.cache", "markdocpy.partials")
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": str(ROOT), "PYTHONDONTWRITEBYTECODE": "1"}
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, env=env, cwd=ROOT, check=True
+    )
+
+
+def _import_time_ms() -> float:
+    stderr = _python("-X", "importtime", "-c", "import markdocpy").stderr
+    for line in stderr.splitlines():
+        _, _, cumulative, name = (part.strip() for part in line.replace(":", "|", 1).split("|"))
+        if name == "markdocpy":
+            return int(cumulative) / 1000
+    raise AssertionError(f"no import time reported for markdocpy:\n{stderr}")
+
+
+def test_import_does_not_load_optional_modules():
+    code = "import sys, markdocpy; print(' '.join(sorted(sys.modules)))"
+    loaded = set(_python("-c", code).stdout.split())
+    assert sorted(loaded & set(LAZY_MODULES)) == []
+
+
+def test_lazy_names_resolve():
+    from markdocpy.cache import ParseCache
+
+    assert Markdoc.ParseCache is ParseCache
+    assert callable(Markdoc.profile_memory) and callable(Markdoc.dependencies)
+    assert set(Markdoc.__all__) <= set(dir(Markdoc))
+    assert all(getattr(Markdoc, name) is not None for name in Markdoc.__all__)
+    try:
+        Markdoc.missing_name
+    except AttributeError as error:
+        assert "missing_name" in str(error)
+    else:
+        raise AssertionError("expected AttributeError")
+
+
+def test_cold_import_time_within_budget():
+    # The best of a few runs, to keep a busy machine from failing the test.
+    best = min(_import_time_ms() for _ in range(3))
+    assert best <= BUDGET_MS, f"import markdocpy took {best:.1f}ms, budget {BUDGET_MS:.0f}ms"
@@ -0,0 +1,51 @@
+import tracemalloc
+
+import markdocpy as Markdoc
+from markdocpy.memory import PHASES, object_sizes
+
+SOURCE = "\n\n".join(
+    f'# Heading {index}\n\n{{% callout type="note" %}}\n'
+    f"Hello {{% $name %}}, *item* {index}\n{{% /callout %}}"
+    for index in range(40)
+)
+CONFIG = {
+    "tags": {"callout": {"render": "aside", "attributes": {"type": {"type": str}}}},
+    "variables": {"name": "Ada"},
+}
+
+
+def test_profile_memory_reports_every_phase():
+    profile = Markdoc.profile_memory(SOURCE, CONFIG)
+    assert [entry.phase for entry in profile.phases] == list(PHASES)
+    assert profile.source_bytes == len(SOURCE.encode("utf-8"))
+    parse = profile.phase("parse")
+    assert parse.retained > 0 and parse.peak >= parse.retained
+    assert parse.objects["Node"] > 0 and parse.objects["Tag"] == 0
+    assert profile.phase("tokenize").objects["Token"] > 0
+    transform = profile.phase("transform")
+    assert transform.objects["Tag"] > 0 and transform.objects["Node"] == 0
+    assert profile.phase("render").objects["str"] > len(SOURCE) // 2
+    assert profile.per_source_byte("parse") == parse.peak / profile.source_bytes
+    data = profile.as_dict()
+    assert data["phases"]["transform"]["retained"] == transform.retained
+    assert "peak KiB" in profile.format()
+
+
+def test_profile_memory_restores_tracing():
+    tracemalloc.start()
+    try:
+        Markdoc.profile_memory("Hello", {})
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    Markdoc.profile_memory("Hello", {})
+    assert not tracemalloc.is_tracing()
+
+
+def test_object_sizes_counts_shared_objects_once():
+    text = "x" * 1000
+    single = object_sizes([text])
+    assert object_sizes([text, text, [text]])["str"] == single["str"]
+    tag = Markdoc.Tag("p", {"class": "a"}, [text])
+    sizes = object_sizes(tag)
+    assert sizes["Tag"] > 0 and sizes["dict"] > 0 and sizes["list"] > 0
@@ -0,0 +1,88 @@
+import io
+import tracemalloc
+from pathlib import Path
+
+import markdocpy as Markdoc
+
+TESTS_DIR = Path(__file__).parent
+CORPUS = sorted(
+    path.read_text()
+    for path in [*(TESTS_DIR / "fixtures").glob("*.md"), *(TESTS_DIR / "spec").glob("*.md")]
+)
+
+TRICKY = """Intro
+
+{% note %}
+
+Inside a note
+
+{% /note %}
+
+```js
+
+const x = 1;
+
+```
+
+- one
+
+- two
+
+  continued
+
+<!-- comment
+
+still a comment -->
+
+{% if $flag %}
+
+Yes
+
+{% else /%}
+
+No
+
+{% /if %}
+
+Tail\r\nwith CRLF\r\n\r\nEnd
+"""
+
+HTML_BLOCKS = [
+    "<div>\n```\n\n```\n\n```",
+    "<div>\n~~~\n\n~~~\n\nSetext",
+    "</div>\n<!--\n{% if $f %}\n-->\n\n---",
+    "Para\n<span>\n```\n\nText\n\n```\n\nEnd",
+    '<custom a="1">\n```\n\n```\n\nEnd',
+    "<?php\n\n```\n?>\n\nEnd",
+]
+
+
+def test_parse_iter_matches_parse():
+    for source in [*CORPUS, TRICKY, *HTML_BLOCKS, "\n\n".join(CORPUS)]:
+        expected = Markdoc.parse(source).children
+        for chunk_size in (1, 64, 1 << 16):
+            nodes = list(Markdoc.parse_iter(io.StringIO(source), chunk_size=chunk_size))
+            assert nodes == expected
+
+
+def test_parse_iter_reads_binary_files():
+    source = "# Título\n\nÜber {% $name %}\n\nEnd\n"
+    nodes = list(Markdoc.parse_iter(io.BytesIO(source.encode("utf-8")), chunk_size=3))
+    assert nodes == Markdoc.parse(source).children
+
+
+def test_parse_iter_memory_does_not_grow_with_document():
+    block = "## Section\n\nSome *text* with {% $var %} and a [link](https://example.com).\n\n"
+
+    def peak(repeat):
+        tracemalloc.start()
+        try:
+            for _ in Markdoc.parse_iter(io.StringIO(block * repeat), chunk_size=4096):
+                pass
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    small = peak(200) - len(block) * 200 * 2
+    large = peak(1600) - len(block) * 1600 * 2
+    assert large < small * 2
@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+import markdocpy as Markdoc
+from markdocpy import DirectoryPartialLoader, PartialCycleError, PartialLoader
+
+
+@pytest.fixture
+def loader(tmp_path):
+    (tmp_path / "footer.md").write_text("Footer for {% $site %}\n")
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "card.md").write_text('Card {% partial file="footer.md" /%}\n')
+    (tmp_path / "a.md").write_text('A {% partial file="b.md" /%}\n')
+    (tmp_path / "b.md").write_text('B {% partial file="a.md" /%}\n')
+    (tmp_path / "self.md").write_text('{% partial file="self.md" /%}\n')
+    return DirectoryPartialLoader(tmp_path, max_entries=2)
+
+
+def _render(source, config):
+    ast = Markdoc.parse(source)
+    return Markdoc.renderers.html(Markdoc.transform(ast, config))
+
+
+def test_loader_renders_like_a_dict(loader):
+    source = '{% partial file="nested/card.md" /%}'
+    expected = _render(
+        source,
+        {
+            "variables": {"site": "Docs"},
+            "partials": {
+                "nested/card.md": loader.load("nested/card.md"),
+                "footer.md": loader.load("footer.md"),
+            },
+        },
+    )
+    assert isinstance(loader, PartialLoader)
+    assert _render(source, {"variables": {"site": "Docs"}, "partials": loader}) == expected
+    assert "Footer for Docs" in expected
+
+
+def test_loader_parses_on_first_use_and_reloads_changed_files(loader, tmp_path):
+    assert loader.misses == 0
+    first = loader.load("footer.md")
+    assert loader.load("footer.md") is first
+    assert (loader.hits, loader.misses) == (1, 1)
+    (tmp_path / "footer.md").write_text("Changed\n")
+    stat = (tmp_path / "footer.md").stat()
+    os.utime(tmp_path / "footer.md", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert loader.load("footer.md") is not first
+
+
+def test_loader_is_bounded(loader):
+    footer = loader.load("footer.md")
+    loader.load("a.md")
+    loader.load("b.md")
+    assert loader.load("footer.md") is not footer
+    assert len(loader._entries) == 2
+
+
+def test_loader_rejects_missing_and_outside_names(loader, tmp_path):
+    (tmp_path.parent / "secret.md").write_text("secret")
+    assert loader.load("missing.md") is None
+    assert loader.load("../secret.md") is None
+    assert "nested/card.md" in loader.names()
+    ast = Markdoc.parse('{% partial file="missing.md" /%}')
+    errors = Markdoc.validate(ast, {"partials": loader})
+    assert [error["id"] for error in errors] == ["attribute-value-invalid"]
+
+
+@pytest.mark.parametrize("file, chain", [("a.md", "a.md -> b.md -> a.md"), ("self.md", None)])
+def test_include_cycles_are_reported(loader, file, chain):
+    ast = Markdoc.parse(f'{{% partial file="{file}" /%}}')
+    with pytest.raises(PartialCycleError) as info:
+        Markdoc.transform(ast, {"partials": loader})
+    assert info.value.chain[-1] == file
+    if chain:
+        assert str(info.value).endswith(chain)
+
+
+def test_dependencies_follow_loader(loader):
+    ast = Markdoc.parse('{% partial file="nested/card.md" /%}')
+    found = Markdoc.dependencies(ast, {"partials": loader})
+    assert found.partials == {"nested/card.md", "footer.md"}
+    assert found.variables == {("site",)}
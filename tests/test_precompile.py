@@ -0,0 +1,104 @@
+import json
+import pickle
+from pathlib import Path
+
+import markdocpy as Markdoc
+from markdocpy.ast.node import StaticNode
+from tests.fixtures.utils import fixture_configs
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+PAGE = """# Welcome {% $user.name %}
+
+Static intro paragraph with *emphasis* and `code`.
+
+- First item
+- Hello {% $user.name %}
+- Third item
+
+{% if $user.admin %}
+Admin panel for {% upper($user.name) %}.
+{% else /%}
+Nothing to see.
+{% /if %}
+
+{% if true %}
+Always shown.
+{% /if %}
+
+| Static | Table |
+| ------ | ----- |
+| a      | b     |
+"""
+
+CONFIG = {"functions": {"upper": {"transform": lambda parameters: str(parameters[0]).upper()}}}
+
+
+def _render(source, config):
+    return Markdoc.renderers.html(Markdoc.transform(Markdoc.parse(source), config))
+
+
+def test_precompiled_render_matches_full_render():
+    compiled = Markdoc.precompile(Markdoc.parse(PAGE), CONFIG)
+    for variables in (
+        {"user": {"name": "Ada", "admin": True}},
+        {"user": {"name": "<b>", "admin": False}},
+        {},
+    ):
+        config = {**CONFIG, "variables": variables}
+        assert compiled.render(config) == _render(PAGE, config)
+
+
+def test_static_parts_are_prerendered():
+    compiled = Markdoc.precompile(Markdoc.parse(PAGE), CONFIG)
+    holes = [segment for segment in compiled.segments if not isinstance(segment, str)]
+    assert [hole.type for hole in holes] == ["variable", "variable", "tag"]
+    assert any(isinstance(child, StaticNode) for child in holes[2].children)
+    assert compiled.segments[0] == "<article><h1>Welcome "
+    static = "".join(segment for segment in compiled.segments if isinstance(segment, str))
+    assert "Static intro paragraph" in static
+    assert "Always shown." in static
+
+
+def test_fixtures_match_full_render():
+    configs = fixture_configs()
+    for entry in json.loads((FIXTURES_DIR / "manifest.json").read_text()):
+        config = configs.get(entry.get("config")) or {}
+        source = (FIXTURES_DIR / f"{entry['name']}.md").read_text()
+        compiled = Markdoc.precompile(Markdoc.parse(source), config)
+        assert compiled.render(config) == _render(source, config), entry["name"]
+
+
+def test_render_does_not_modify_compiled_document():
+    compiled = Markdoc.precompile(Markdoc.parse(PAGE), CONFIG)
+    config = {**CONFIG, "variables": {"user": {"name": "Ada", "admin": True}}}
+    first = compiled.render(config)
+    compiled.render({**CONFIG, "variables": {"user": {"name": "Bob"}}})
+    assert compiled.render(config) == first
+
+
+def test_compiled_document_pickles():
+    compiled = Markdoc.precompile(Markdoc.parse(PAGE), CONFIG)
+    loaded = pickle.loads(pickle.dumps(compiled))
+    config = {**CONFIG, "variables": {"user": {"name": "Ada"}}}
+    assert loaded.render(config) == compiled.render(config)
+
+
+def test_render_variants_matches_individual_renders():
+    ast = Markdoc.parse(PAGE)
+    variable_sets = [
+        {"user": {"name": name, "admin": admin}}
+        for name in ("Ada", "Bob", "<i>")
+        for admin in (True, False)
+    ]
+    expected = [_render(PAGE, {**CONFIG, "variables": variables}) for variables in variable_sets]
+    assert Markdoc.render_variants(ast, CONFIG, variable_sets) == expected
+    compiled = Markdoc.precompile(ast, CONFIG)
+    assert list(Markdoc.iter_variants(compiled, CONFIG, iter(variable_sets))) == expected
+
+
+def test_variants_merge_over_config_variables():
+    config = {**CONFIG, "variables": {"user": {"name": "Base"}, "page": {"title": "T"}}}
+    [html] = Markdoc.render_variants(Markdoc.parse(PAGE), config, [{"user": {"name": "Ada"}}])
+    merged = {**config, "variables": {"user": {"name": "Ada"}, "page": {"title": "T"}}}
+    assert html == _render(PAGE, merged)
@@ -0,0 +1,34 @@
+import copy
+
+import markdocpy as Markdoc
+from tests.test_codegen import _corpus
+from tests.test_precompile import CONFIG, PAGE
+
+
+def test_render_html_matches_transform_and_render_on_corpus():
+    for name, source, config in _corpus():
+        for slots in (False, True):
+            ast = Markdoc.parse(source, slots=slots)
+            expected = Markdoc.renderers.html(Markdoc.transform(copy.deepcopy(ast), config))
+            assert Markdoc.render_html(ast, config) == expected, name
+
+
+def test_render_html_matches_with_variables_and_custom_transforms():
+    config = {
+        **CONFIG,
+        "variables": {"user": {"name": "<Ada>", "admin": True}},
+        "tags": {
+            "badge": {
+                "transform": lambda node, cfg: Markdoc.Tag("span", {"class": "badge"}, ["new"]),
+            },
+        },
+    }
+    source = PAGE + "\n{% badge /%}\n\n```py\nx < 1\n```\n"
+    expected = Markdoc.renderers.html(Markdoc.transform(Markdoc.parse(source), config))
+    assert Markdoc.render_html(Markdoc.parse(source), config) == expected
+
+
+def test_render_html_accepts_node_lists():
+    nodes = Markdoc.parse("# Title\n\nBody").children
+    expected = Markdoc.renderers.html(Markdoc.transform(copy.deepcopy(nodes)))
+    assert Markdoc.render_html(nodes) == expected
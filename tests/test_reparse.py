@@ -0,0 +1,73 @@
+import random
+from pathlib import Path
+
+import markdocpy as Markdoc
+
+TESTS_DIR = Path(__file__).parent
+CORPUS = sorted(
+    path.read_text()
+    for path in [*(TESTS_DIR / "fixtures").glob("*.md"), *(TESTS_DIR / "spec").glob("*.md")]
+)
+
+SNIPPETS = [
+    "",
+    "Plain text",
+    "- item",
+    "  indented continuation",
+    "```",
+    "# Heading",
+    "> quote",
+    "{% note %}",
+    "{% /note %}",
+    "{% if $flag %}",
+    "{% /if %}",
+    "{% badge /%}",
+    "| a | b |",
+    "| - | - |",
+    "Text {% $name %} more",
+]
+
+
+def _edit(source, rng):
+    lines = source.split("\n")
+    index = rng.randrange(len(lines) + 1)
+    choice = rng.randrange(4)
+    if choice == 0 and index < len(lines):
+        lines[index] = lines[index][: rng.randrange(len(lines[index]) + 1)]
+    elif choice == 1:
+        lines[index:index] = rng.sample(SNIPPETS, rng.randrange(1, 3))
+    elif choice == 2 and index < len(lines):
+        del lines[index : index + rng.randrange(1, 3)]
+    else:
+        lines[index:index + 1] = [rng.choice(SNIPPETS)]
+    return "\n".join(lines)
+
+
+def test_reparse_matches_full_parse_on_random_edits():
+    rng = random.Random(27)
+    for source in CORPUS:
+        for _ in range(12):
+            ast = Markdoc.parse(source)
+            old = source
+            for _ in range(3):
+                new = _edit(old, rng)
+                ast = Markdoc.reparse(ast, old, new)
+                assert ast == Markdoc.parse(new), (old, new)
+                old = new
+
+
+def test_reparse_shares_untouched_prefix():
+    old = "# Title\n\nFirst\n\nSecond\n\nThird\n"
+    new = "# Title\n\nFirst\n\nSecond, edited\n\nThird\n"
+    previous = Markdoc.parse(old)
+    ast = Markdoc.reparse(previous, old, new)
+    assert ast == Markdoc.parse(new)
+    assert ast.children[0] is previous.children[0]
+
+
+def test_reparse_handles_edit_that_opens_a_tag():
+    old = "Intro\n\nBody\n\n{% /note %}\n\nAfter\n"
+    new = "Intro\n\n{% note %}\n\nBody\n\n{% /note %}\n\nAfter\n"
+    ast = Markdoc.reparse(Markdoc.parse(old), old, new)
+    assert ast == Markdoc.parse(new)
+    assert ast.children[1].tag == "note"
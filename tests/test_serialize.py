@@ -0,0 +1,66 @@
+import io
+import pickle
+from pathlib import Path
+
+import pytest
+
+import markdocpy as Markdoc
+from markdocpy import serialize
+from markdocpy.ast.variable import MISSING
+
+TESTS_DIR = Path(__file__).parent
+SOURCES = sorted([*(TESTS_DIR / "fixtures").glob("*.md"), *(TESTS_DIR / "spec").glob("*.md")])
+
+
+def test_round_trip_covers_fixtures_and_spec():
+    for path in SOURCES:
+        ast = Markdoc.parse(path.read_text(), slots=True)
+        assert Markdoc.loads(Markdoc.dumps(ast)) == ast, path.name
+
+
+def test_round_trip_keeps_variables_functions_and_slots():
+    source = """{% card title=$user.name count=add(1, $n, x=[1, {a: $b}]) %}
+{% slot "header" %}
+Hello {% $name %}
+{% /slot %}
+{% /card %}"""
+    ast = Markdoc.parse(source, slots=True)
+    loaded = Markdoc.loads(Markdoc.dumps(ast))
+    assert loaded == ast
+    card = loaded.children[0]
+    assert isinstance(card.attributes["title"], Markdoc.Variable)
+    assert isinstance(card.attributes["count"], Markdoc.Function)
+    assert "header" in card.slots
+
+
+def test_round_trip_keeps_resolved_values():
+    ast = Markdoc.parse("Hi {% $missing %} {% $data %}")
+    Markdoc.resolve(ast, {"variables": {"data": (1, "two")}})
+    loaded = Markdoc.loads(Markdoc.dumps(ast))
+    values = [child.attributes["value"] for child in loaded.children[0].children[1::2]]
+    assert values == [MISSING, (1, "two")]
+
+
+def test_loads_accepts_buffers_and_files():
+    ast = Markdoc.parse("# Title\n\nBody")
+    data = Markdoc.dumps(ast)
+    assert Markdoc.loads(memoryview(data)) == ast
+    buffer = io.BytesIO()
+    serialize.dump(ast, buffer)
+    buffer.seek(0)
+    assert serialize.load(buffer) == ast
+
+
+def test_loads_rejects_other_versions():
+    data = bytearray(Markdoc.dumps(Markdoc.parse("Body")))
+    data[len(serialize.MAGIC)] = serialize.FORMAT_VERSION + 1
+    with pytest.raises(ValueError):
+        Markdoc.loads(bytes(data))
+    with pytest.raises(ValueError):
+        Markdoc.loads(b"not an ast")
+
+
+def test_serialized_ast_is_smaller_than_pickle():
+    source = "\n\n".join(path.read_text() for path in SOURCES)
+    ast = Markdoc.parse(source)
+    assert len(Markdoc.dumps(ast)) < len(pickle.dumps(ast))
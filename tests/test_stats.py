@@ -0,0 +1,92 @@
+import markdocpy as Markdoc
+from markdocpy import ParseCache, Stats, TransformMemo, collect_stats
+from markdocpy.stats import count_nodes, current_stats
+
+SOURCE = """# {% $title %}
+
+{% if $show %}
+Hello {% upper($name) %}
+{% /if %}
+
+{% partial file="footer.md" /%}
+"""
+
+CONFIG = {
+    "variables": {"title": "Stats", "show": True, "name": "ada"},
+    "functions": {"upper": {"transform": lambda parameters: parameters[0].upper()}},
+    "partials": {"footer.md": Markdoc.parse("Footer {% $title %}")},
+}
+
+
+class MemoryParseCache(ParseCache):
+    def __init__(self):
+        super().__init__()
+        self.data = {}
+
+    def _read(self, key):
+        return self.data.get(key)
+
+    def _write(self, key, data):
+        self.data[key] = data
+
+
+def test_collect_stats_records_phases_and_counts():
+    with collect_stats() as stats:
+        ast = Markdoc.parse(SOURCE)
+        Markdoc.validate(ast, CONFIG)
+        html = Markdoc.renderers.html(Markdoc.transform(ast, CONFIG))
+    assert "Hello ADA" in html
+    assert {"tokenize", "parse", "validate", "resolve", "transform", "render"} <= set(stats.timings)
+    assert {"tag:if", "tag:partial"} <= set(stats.timings)
+    assert stats.calls["parse"] == 1
+    assert stats.nodes == count_nodes(ast) > 5
+    assert stats.tags >= 4
+    # $title, $show and $name in the document, $title again in the partial.
+    assert stats.variables == 4
+    assert stats.functions == 1
+    assert current_stats() is None
+
+
+def test_stats_are_not_collected_outside_a_block():
+    with collect_stats() as stats:
+        pass
+    Markdoc.transform(Markdoc.parse(SOURCE), CONFIG)
+    assert stats == Stats()
+
+
+def test_callback_receives_every_phase():
+    events = []
+    with collect_stats(callback=lambda phase, seconds: events.append((phase, seconds))):
+        Markdoc.parse("Hello")
+    assert [phase for phase, _ in events] == ["tokenize", "parse"]
+    assert all(seconds >= 0 for _, seconds in events)
+
+
+def test_cache_hit_rates():
+    cache = MemoryParseCache()
+    memo = TransformMemo()
+    with collect_stats() as stats:
+        for _ in range(3):
+            ast = Markdoc.parse("# Title\n\nBody text", cache=cache)
+            Markdoc.transform(ast, memo=memo)
+    assert stats.caches["parse_cache"] == [2, 1]
+    assert stats.hit_rate("parse_cache") == 2 / 3
+    assert stats.caches["transform_memo"][0] == 2
+    assert stats.hit_rate("unused") == 0.0
+    assert stats.as_dict()["caches"]["parse_cache"]["hits"] == 2
+
+
+def test_markdoc_instance_stats():
+    markdoc = Markdoc.Markdoc(CONFIG, stats=True)
+    html = markdoc.render(markdoc.transform(markdoc.parse(SOURCE)))
+    assert "Footer Stats" in html
+    assert markdoc.stats.calls["render"] == 1
+    assert Markdoc.Markdoc(CONFIG).stats is None
+
+
+def test_render_html_reports_resolve_and_render():
+    with collect_stats() as stats:
+        Markdoc.render_html(Markdoc.parse(SOURCE), CONFIG)
+    assert stats.calls["resolve"] == 1
+    assert stats.calls["render"] == 1
+    assert stats.variables == 4
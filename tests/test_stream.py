@@ -0,0 +1,68 @@
+import random
+
+import markdocpy as Markdoc
+
+SOURCE = """# Streaming {% .title %}
+
+Hello {% $name %}, this answer arrives
+in pieces.
+
+{% note %}
+
+Inside the note.
+
+- one
+- two
+
+{% /note %}
+
+```py
+print("hi")
+
+print("bye")
+```
+
+{% if $flag %}
+Shown
+{% else /%}
+Hidden
+{% /if %}
+
+Done.
+"""
+
+CONFIG = {"variables": {"name": "Ada", "flag": True}, "tags": {"note": {"render": "aside"}}}
+
+
+def _render_children(source):
+    ast = Markdoc.parse(source)
+    return "".join(
+        Markdoc.renderers.html(Markdoc.transform(child, CONFIG)) for child in ast.children
+    )
+
+
+def test_stream_output_matches_full_render():
+    rng = random.Random(29)
+    for _ in range(20):
+        stream = Markdoc.MarkdocStream(CONFIG)
+        output = []
+        received = ""
+        position = 0
+        while position < len(SOURCE):
+            size = rng.randrange(1, 12)
+            chunk = SOURCE[position : position + size]
+            position += size
+            received += chunk
+            output.append(stream.feed(chunk))
+            assert "".join(output) + stream.tail() == _render_children(received)
+        output.append(stream.close())
+        assert "".join(output) == _render_children(SOURCE)
+        assert stream.nodes == Markdoc.resolve(Markdoc.parse(SOURCE), CONFIG).children
+
+
+def test_stream_keeps_unclosed_tag_unstable():
+    stream = Markdoc.MarkdocStream({"tags": {"note": {"render": "aside"}}})
+    assert stream.feed("Intro\n\n{% note %}\n\nBody\n\n") == "<p>Intro</p>"
+    assert stream.tail() == "<aside><p>Body</p></aside>"
+    assert stream.feed("{% /note %}\n\nAfter\n") == "<aside><p>Body</p></aside>"
+    assert stream.close() == "<p>After</p>"
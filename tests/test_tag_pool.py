@@ -0,0 +1,93 @@
+import copy
+import tracemalloc
+
+import pytest
+
+import markdocpy as Markdoc
+from markdocpy.ast.tag import Markup
+from tests.test_codegen import _corpus
+
+ROWS = "| Name | Value |\n| ---- | ----- |\n" + "| x |  |\n" * 200
+REPETITIVE = "\n\n".join(["---", ROWS, "- same\n- same\n- same"] * 5)
+
+
+def _html(tree):
+    return Markdoc.renderers.html(tree)
+
+
+def test_interned_trees_render_the_same():
+    pool = Markdoc.TagPool()
+    for name, source, config in _corpus():
+        tree = Markdoc.transform(Markdoc.parse(source), config)
+        interned = pool.intern(copy.deepcopy(tree))
+        assert _html(interned) == _html(tree), name
+        render = Markdoc.compile_renderer(config)
+        assert render(interned) == _html(tree), name
+
+
+def test_identical_subtrees_are_shared():
+    pool = Markdoc.TagPool()
+    article = Markdoc.transform(Markdoc.parse(REPETITIVE), pool=pool)
+    assert isinstance(article, Markdoc.FrozenTag)
+    hrs = [child for child in article.children if child.name == "hr"]
+    assert len(hrs) == 5 and all(hr is hrs[0] for hr in hrs)
+    other = Markdoc.transform(Markdoc.parse("---"), pool=pool)
+    assert other.children[0] is hrs[0]
+    assert len(pool) < 20
+
+
+def test_frozen_tags_are_immutable_and_hashable():
+    pool = Markdoc.TagPool()
+    tag = pool.intern(Markdoc.Tag("a", {"href": "/"}, ["x", ["y", Markdoc.Tag("b")]]))
+    assert tag.children == ("x", "y", pool.intern(Markdoc.Tag("b")))
+    flat = Markdoc.Tag("a", {"href": "/"}, ["x", "y", Markdoc.Tag("b")])
+    assert hash(tag) == hash(pool.intern(flat))
+    with pytest.raises(AttributeError):
+        tag.name = "b"
+    with pytest.raises(TypeError):
+        tag.attributes["href"] = "/other"
+    assert Markdoc.Tag.is_tag(tag)
+    assert tag.thaw() == flat
+
+
+def test_interning_keeps_value_types_and_attribute_order():
+    pool = Markdoc.TagPool()
+    tags = [
+        Markdoc.Tag("input", {"disabled": True}),
+        Markdoc.Tag("input", {"disabled": 1}),
+        Markdoc.Tag("td", {}, [1]),
+        Markdoc.Tag("td", {}, [1.0]),
+        Markdoc.Tag("td", {}, [True]),
+        Markdoc.Tag("p", {}, ["<b>"]),
+        Markdoc.Tag("p", {}, [Markup("<b>")]),
+        Markdoc.Tag("p", {}, [Markdoc.Tag("b"), Markdoc.Tag("i")]),
+        Markdoc.Tag("a", {"href": "/", "title": "x"}),
+        Markdoc.Tag("a", {"title": "x", "href": "/"}),
+        Markdoc.Tag("div", {}, [Markdoc.Tag("input", {"disabled": True})]),
+        Markdoc.Tag("div", {}, [Markdoc.Tag("input", {"disabled": 1})]),
+    ]
+    for tag in tags:
+        assert _html(pool.intern(copy.deepcopy(tag))) == _html(tag)
+    assert pool.intern(Markdoc.Tag("input", {"disabled": 1})) is pool.intern(tags[1])
+
+
+def test_tags_with_complex_attributes_stay_mutable():
+    pool = Markdoc.TagPool()
+    tag = pool.intern(Markdoc.Tag("div", {"data": [1, 2]}, [Markdoc.Tag("hr")]))
+    assert type(tag) is Markdoc.Tag
+    assert isinstance(tag.children[0], Markdoc.FrozenTag)
+    assert _html(tag) == _html(Markdoc.Tag("div", {"data": [1, 2]}, [Markdoc.Tag("hr")]))
+
+
+def test_interning_reduces_memory():
+    def measure(pool):
+        ast = Markdoc.parse(REPETITIVE)
+        tracemalloc.start()
+        tree = Markdoc.transform(ast, pool=pool)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return size, tree
+
+    plain, _ = measure(None)
+    interned, _ = measure(Markdoc.TagPool())
+    assert interned < plain / 2
@@ -0,0 +1,95 @@
+import json
+
+import markdocpy as Markdoc
+from markdocpy import Tag, trace
+from markdocpy import cli
+from markdocpy.tracing import current_tracer
+
+SOURCE = """# Title
+
+{% card %}
+Total {% total(1, 2) %}
+{% /card %}
+
+{% partial file="footer.md" /%}
+"""
+
+
+def _card(node, config):
+    children = [Markdoc.transform(child, config) for child in node.children]
+    return Tag("section", {"class": "card"}, children)
+
+
+CONFIG = {
+    "tags": {"card": {"transform": _card}},
+    "functions": {"total": {"transform": lambda parameters: parameters[0] + parameters[1]}},
+    "partials": {"footer.md": Markdoc.parse("Footer\n\n{% card %}{% total(3, 4) %}{% /card %}")},
+}
+
+
+def test_spans_cover_tags_partials_and_functions(tmp_path):
+    path = tmp_path / "trace.json"
+    with trace(path) as tracer:
+        html = Markdoc.renderers.html(Markdoc.transform(Markdoc.parse(SOURCE), CONFIG))
+    assert current_tracer() is None
+    assert "Total 3" in html and "7" in html
+    spans = {(event["cat"], event["name"]): event for event in tracer.events}
+    assert set(spans) == {
+        ("tag", "card"),
+        ("partial", "partial footer.md"),
+        ("function", "total"),
+    }
+    cards = [event for event in tracer.events if event["name"] == "card"]
+    assert [event["args"] for event in cards] == [
+        {"tag": "card", "line": 3},
+        {"tag": "card", "file": "footer.md", "line": 3},
+    ]
+    functions = [event["args"] for event in tracer.events if event["cat"] == "function"]
+    assert {"line": 4} in functions and {"file": "footer.md", "line": 3} in functions
+
+    chrome = json.loads(path.read_text())
+    assert len(chrome["traceEvents"]) == len(tracer.events)
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in chrome["traceEvents"])
+
+
+def test_summary_separates_self_time():
+    with trace() as tracer:
+        Markdoc.transform(Markdoc.parse(SOURCE), CONFIG)
+    summary = {(entry.category, entry.name): entry for entry in tracer.summary()}
+    partial = summary[("partial", "partial footer.md")]
+    assert summary[("tag", "card")].count == 2
+    assert summary[("function", "total")].count == 2
+    assert partial.self_time < partial.total
+    table = tracer.format_summary(top=2)
+    assert len(table.splitlines()) == 3
+    assert "self ms" in table.splitlines()[0]
+
+
+def test_locations_do_not_outlive_their_functions():
+    with trace() as tracer:
+        tracer.index(Markdoc.parse("{% total(1, 2) %}\n" * 50))
+        functions = [Markdoc.Function("total", [1, 2]) for _ in range(500)]
+    assert all(tracer.location(function) == {} for function in functions)
+
+
+def test_render_html_is_traced():
+    with trace() as tracer:
+        Markdoc.render_html(Markdoc.parse(SOURCE), CONFIG)
+    assert {event["cat"] for event in tracer.events} == {"tag", "partial", "function"}
+
+
+def test_build_trace_option(tmp_path, capsys):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "page.md").write_text("{% shout %}hi{% /shout %}\n")
+    config = tmp_path / "config.py"
+    config.write_text(
+        "from markdocpy import Tag\n"
+        "config = {'tags': {'shout': {'transform': lambda node, config: Tag('b', {}, ['HI'])}}}\n"
+    )
+    output = tmp_path / "trace.json"
+    argv = ["build", str(src), str(tmp_path / "out"), "--config", str(config)]
+    assert cli.main([*argv, "--trace", str(output), "--top", "3"]) == 0
+    assert capsys.readouterr().out.splitlines()[-1].startswith("tag        shout")
+    events = json.loads(output.read_text())["traceEvents"]
+    assert [event["name"] for event in events] == ["shout"]
@@ -0,0 +1,66 @@
+import copy
+
+import markdocpy as Markdoc
+from markdocpy.transform.transformer import merge_config
+from tests.test_codegen import _corpus
+
+CALLOUT = """{% callout %}
+Standard **warning** text.
+
+- option one
+- option two
+{% /callout %}
+"""
+
+
+def _config(calls, pure):
+    def transform(node, config):
+        calls.append(node.tag)
+        return Markdoc.Tag("aside", {}, Markdoc.transform(node.children, config))
+
+    return {"tags": {"callout": {"transform": transform, "pure": pure}}}
+
+
+def test_memoized_output_matches_on_corpus():
+    for name, source, config in _corpus():
+        ast = Markdoc.parse(source)
+        expected = Markdoc.renderers.html(Markdoc.transform(copy.deepcopy(ast), config))
+        assert Markdoc.renderers.html(Markdoc.transform(ast, config, memo=True)) == expected, name
+
+
+def test_identical_subtrees_share_output():
+    ast = Markdoc.parse(CALLOUT + "\n" + CALLOUT + "\nHi {% $name %}\n")
+    calls = []
+    config = {**_config(calls, True), "variables": {"name": "Ada"}}
+    article = Markdoc.transform(ast, config, memo=True)
+    first, second = article.children[:2]
+    assert first is second
+    assert calls == ["callout"]
+    assert Markdoc.renderers.html(article).endswith("<p>Hi Ada</p></article>")
+
+
+def test_impure_transforms_are_not_memoized():
+    calls = []
+    ast = Markdoc.parse(CALLOUT + "\n" + CALLOUT)
+    article = Markdoc.transform(ast, _config(calls, False), memo=True)
+    assert calls == ["callout", "callout"]
+    first, second = article.children
+    assert first is not second
+    assert first.children[1] is second.children[1]
+
+
+def test_memo_is_shared_across_transforms():
+    memo = Markdoc.TransformMemo(max_entries=100)
+    Markdoc.transform(Markdoc.parse(CALLOUT), memo=memo)
+    hits = memo.hits
+    Markdoc.transform(Markdoc.parse("# Other\n\n" + CALLOUT), memo=memo)
+    assert memo.hits == hits + 1
+    small = Markdoc.TransformMemo(max_entries=2)
+    Markdoc.transform(Markdoc.parse(CALLOUT), memo=small)
+    assert len(small) == 2
+
+
+def test_merge_config_is_idempotent():
+    merged = merge_config({"variables": {"a": 1}})
+    assert merge_config(merged) is merged
+    assert merge_config({**merged}) == merged
@@ -0,0 +1,134 @@
+import random
+
+import markdocpy as Markdoc
+
+SOURCE = """# Guide {% .intro %}
+
+Intro paragraph with {% $name %} and {% $missing %}.
+
+{% note title="A" %}
+First paragraph inside the note.
+
+{% badge /%}
+
+Second paragraph inside the note.
+{% /note %}
+
+- one
+- two {% $name %}
+- three
+
+| a | b |
+| - | - |
+| c | d |
+
+```js
+const x = 1;
+```
+
+{% panel %}
+Panel body
+{% /panel %}
+
+Closing words.
+"""
+
+CONFIG = {
+    "variables": {"name": "Ada"},
+    "tags": {
+        "note": {"render": "note", "children": ["paragraph"], "attributes": {"title": {}}},
+        "badge": {"render": "span", "inline": True},
+        "panel": {"render": "section", "parents": ["note"]},
+    },
+}
+
+
+OPENERS = [
+    "```",
+    "~~~",
+    "```js",
+    "{% note %}",
+    "{% note title=\"B\" %}",
+    "{% /note %}",
+    "{% panel %}",
+    "{% /panel %}",
+    "{% if $f %}",
+    "{% /if %}",
+]
+
+
+def _edit(source, rng):
+    lines = source.split("\n")
+    index = rng.randrange(len(lines))
+    choice = rng.randrange(6)
+    if choice == 0:
+        lines[index] = lines[index] + " more"
+    elif choice == 1:
+        lines.insert(index, rng.choice(["", "New text", "{% badge /%}", "- item", "# Head"]))
+    elif choice == 2:
+        del lines[index]
+    elif choice == 3:
+        lines[index] = rng.choice(["{% $other %}", "Plain", "{% pill %}x{% /pill %}", ""])
+    elif choice == 4:
+        lines.insert(index, rng.choice(OPENERS))
+    else:
+        openers = [i for i, line in enumerate(lines) if line.startswith(("```", "~~~", "{%"))]
+        if openers:
+            del lines[rng.choice(openers)]
+    return "\n".join(lines)
+
+
+def test_full_record_matches_validate_tree():
+    ast = Markdoc.parse(SOURCE)
+    assert Markdoc.validate_nodes(ast, CONFIG).subtree == Markdoc.validate(ast, CONFIG)
+
+
+def test_incremental_matches_full_validation_on_random_edits():
+    rng = random.Random(26)
+    for _ in range(100):
+        old = Markdoc.parse(SOURCE)
+        previous = Markdoc.validate_nodes(old, CONFIG)
+        source = SOURCE
+        for _ in range(6):
+            source = _edit(source, rng)
+            ast = Markdoc.parse(source)
+            result = Markdoc.validate_incremental(ast, old, previous, CONFIG)
+            assert result.subtree == Markdoc.validate(ast, CONFIG)
+            old, previous = ast, result
+
+
+def test_incremental_revalidates_after_fence_and_tag_openers():
+    fenced = SOURCE.replace("| - | - |", "```\n| - | - |")
+    for old, new in (
+        (SOURCE, SOURCE.replace("Intro paragraph", "~~~\nIntro paragraph")),
+        (SOURCE, SOURCE.replace("```js", "", 1)),
+        (SOURCE, SOURCE.replace("Second paragraph", "{% /note %}\nSecond paragraph")),
+        (SOURCE, SOURCE.replace("{% panel %}", "{% note %}\n{% panel %}")),
+        (fenced, fenced.replace("Intro paragraph", "```\nIntro paragraph")),
+    ):
+        previous_ast = Markdoc.parse(old)
+        previous = Markdoc.validate_nodes(previous_ast, CONFIG)
+        ast = Markdoc.parse(new)
+        result = Markdoc.validate_incremental(ast, previous_ast, previous, CONFIG)
+        assert result.subtree == Markdoc.validate(ast, CONFIG)
+
+
+def test_incremental_reuses_untouched_records():
+    old = Markdoc.parse(SOURCE)
+    previous = Markdoc.validate_nodes(old, CONFIG)
+    new = SOURCE.replace("Closing words.", "Closing words, edited.")
+    result = Markdoc.validate_incremental(Markdoc.parse(new), old, previous, CONFIG)
+    assert all(a is b for a, b in zip(result.children[:-1], previous.children[:-1]))
+    assert result.children[-1] is not previous.children[-1]
+
+
+def test_nested_edit_keeps_sibling_records():
+    old = Markdoc.parse(SOURCE)
+    previous = Markdoc.validate_nodes(old, CONFIG)
+    ast = Markdoc.parse(SOURCE.replace("Second paragraph", "Second {% $unknown %} paragraph"))
+    result = Markdoc.validate_incremental(ast, old, previous, CONFIG)
+    assert result.subtree == Markdoc.validate(ast, CONFIG)
+    note, previous_note = result.children[2], previous.children[2]
+    assert note is not previous_note
+    assert note.children[0] is previous_note.children[0]
+    assert any(err["id"] == "variable-undefined" for err in note.subtree)
@@ -33,3 +33,31 @@ def test_inline_error_level_override():
     config = {"tags": {"pill": {"inline": True, "errorLevel": "error"}}}
     errors = Markdoc.validate(ast, config)
     assert any(err["id"] == "tag-placement-invalid" and err["level"] == "error" for err in errors)
+
+
+def test_validate_callbacks_can_keep_parents():
+    source = "{% section id=\"a\" %}\n\n{% note /%}\n\n{% /section %}\n\n{% note /%}"
+    seen = []
+
+    def keep(node, config):
+        seen.append((node, config["validation"]["parents"]))
+        return []
+
+    def keep_attribute(value, config, key):
+        seen.append((value, config["validation"]["parents"]))
+        return []
+
+    config = {
+        "tags": {
+            "note": {"validate": keep},
+            "section": {"attributes": {"id": {"type": str, "validate": keep_attribute}}},
+        }
+    }
+    for validate in (Markdoc.validate, Markdoc.validate_nodes):
+        seen.clear()
+        validate(Markdoc.parse(source), config)
+        assert [[parent.type for parent in parents] for _, parents in seen] == [
+            ["document"],
+            ["document", "tag"],
+            ["document"],
+        ]